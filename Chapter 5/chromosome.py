@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import TypeVar, Tuple, Type
+from typing import TypeVar, Tuple, Type, Optional, Hashable, ClassVar
 from abc import ABC, abstractmethod
+from fitness_cache import FitnessCache
 
 T = TypeVar('T', bound = 'Chromosome') # for returning self
 # This means that anything that fills in a variable that is of
@@ -10,19 +11,99 @@ T = TypeVar('T', bound = 'Chromosome') # for returning self
 
 # Base class for all chromosomes; all methods must be overridden
 class Chromosome(ABC):
+    # the last fitness value computed for this chromosome, None until it is
+    # evaluated. It is a class attribute so subclasses don't need to call
+    # super().__init__() for it to exist
+    _fitness_cache: Optional[float] = None
+    # the genome_key() the cached fitness above belongs to, only used when
+    # the shared genome cache is enabled
+    _fitness_cache_key: Optional[Hashable] = None
+    # opt-in LRU cache shared by every instance of a subclass, see
+    # enable_fitness_cache()
+    _genome_cache: ClassVar[Optional[FitnessCache]] = None
+
     @abstractmethod
     def fitness(self) -> float:
         ...
-    
+
     @classmethod
     @abstractmethod
     def random_instance(cls: Type[T]) -> T:
         ...
-        
+
     @abstractmethod
     def crossover(self: T, other: T) -> Tuple[T, T]:
         ...
-        
+
     @abstractmethod
     def mutate(self) -> None:
-        ...
\ No newline at end of file
+        ...
+
+    # A hashable signature of the genes, e.g. tuple(self.letters). Two
+    # chromosomes with equal keys must have equal fitness. Optional: it is
+    # needed for the shared cache (enable_fitness_cache()) and lets the
+    # diversity metric compare genomes, see has_genome_key()
+    def genome_key(self) -> Hashable:
+        raise NotImplementedError("Should be implemented by subclass")
+
+    # whether this subclass overrides genome_key(); the features that need
+    # it check this instead of calling it and catching the error
+    @classmethod
+    def has_genome_key(cls) -> bool:
+        return cls.genome_key is not Chromosome.genome_key
+
+    # Share one bounded LRU fitness cache between all instances of this
+    # subclass, keyed by genome_key(). Returns the cache so its hits and
+    # misses can be inspected
+    @classmethod
+    def enable_fitness_cache(cls, maxsize: int = 100_000) -> FitnessCache:
+        if not cls.has_genome_key():
+            raise TypeError(f"{cls.__name__} needs a genome_key() to share a fitness cache")
+        cls._genome_cache = FitnessCache(maxsize)
+        return cls._genome_cache
+
+    @classmethod
+    def disable_fitness_cache(cls) -> None:
+        cls._genome_cache = None
+
+    # the fitness we already know for this chromosome, or None if it
+    # still needs to be evaluated
+    def known_fitness(self) -> Optional[float]:
+        cache: Optional[FitnessCache] = self._genome_cache
+        if cache is None:
+            return self._fitness_cache
+        # comparing keys means a mutate() done in place is always noticed,
+        # even if nobody called invalidate_fitness()
+        key: Hashable = self.genome_key()
+        if self._fitness_cache is not None and self._fitness_cache_key == key:
+            return self._fitness_cache
+        value: Optional[float] = cache.get(key)
+        if value is not None:
+            self._fitness_cache = value
+            self._fitness_cache_key = key
+        return value
+
+    # store a fitness value computed somewhere else (e.g. in a worker process)
+    def remember_fitness(self, value: float) -> None:
+        self._fitness_cache = value
+        cache: Optional[FitnessCache] = self._genome_cache
+        if cache is not None:
+            key: Hashable = self.genome_key()
+            self._fitness_cache_key = key
+            cache.put(key, value)
+
+    # fitness() is only called the first time; later calls reuse the result
+    # until invalidate_fitness() is called
+    def cached_fitness(self) -> float:
+        value: Optional[float] = self.known_fitness()
+        if value is None:
+            value = self.fitness()
+            self.remember_fitness(value)
+        return value
+
+    # must be called whenever the genes change, e.g. after mutate() or on
+    # the children returned by crossover() (they are often deepcopies of
+    # their parents and carry the parents' cached fitness with them)
+    def invalidate_fitness(self) -> None:
+        self._fitness_cache = None
+        self._fitness_cache_key = None
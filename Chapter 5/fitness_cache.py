@@ -0,0 +1,52 @@
+from __future__ import annotations
+from typing import Hashable, Optional
+from collections import OrderedDict
+
+
+# A bounded least-recently-used map from a chromosome's genome_key() to its
+# fitness. Identical genomes show up again and again across generations, so
+# looking them up here saves recomputing an expensive fitness function
+class FitnessCache:
+    def __init__(self, maxsize: int = 100_000) -> None:
+        if maxsize < 1:  # a cache must be able to hold at least one genome
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize: int = maxsize
+        # an OrderedDict remembers insertion order, the least recently used
+        # genome is always at the front
+        self._container: OrderedDict[Hashable, float] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    # return the fitness stored for key, or None if we haven't seen it
+    def get(self, key: Hashable) -> Optional[float]:
+        value: Optional[float] = self._container.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._container.move_to_end(key)  # most recently used
+        return value
+
+    def put(self, key: Hashable, value: float) -> None:
+        self._container[key] = value
+        self._container.move_to_end(key)
+        # evict the least recently used genome if we're over the limit
+        if len(self._container) > self.maxsize:
+            self._container.popitem(last = False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def clear(self) -> None:
+        self._container.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+    def __repr__(self) -> str:
+        return f'FitnessCache(size={len(self)}, maxsize={self.maxsize}, \
+hits={self.hits}, misses={self.misses})'
@@ -0,0 +1,83 @@
+import unittest
+
+# import our scripts
+from chromosome import Chromosome
+from fitness_cache import FitnessCache
+from genetic_algorithm_test import Number
+
+
+# counts how often its fitness is actually computed
+class Counted(Number):
+    evaluations: int = 0
+
+    def fitness(self) -> float:
+        Counted.evaluations += 1
+        return float(self.value)
+
+
+class FitnessCacheTestCase(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache: FitnessCache = FitnessCache(2)
+        cache.put("a", 1.0)
+        cache.put("b", 2.0)
+        self.assertEqual(cache.get("a"), 1.0)  # a is now more recent than b
+        cache.put("c", 3.0)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1.0)
+        self.assertEqual(cache.get("c"), 3.0)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.hit_rate, 0.75)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.hit_rate), (0, 0, 0.0))
+
+    def test_zero_fitness_is_cached(self):
+        cache: FitnessCache = FitnessCache()
+        cache.put("zero", 0.0)
+        self.assertEqual(cache.get("zero"), 0.0)
+        self.assertEqual(cache.hits, 1)
+
+
+class ChromosomeCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        Counted.evaluations = 0
+
+    def tearDown(self):
+        Counted.disable_fitness_cache()
+
+    def test_per_instance(self):
+        chromosome: Counted = Counted(5)
+        self.assertEqual(chromosome.cached_fitness(), 5.0)
+        self.assertEqual(chromosome.cached_fitness(), 5.0)
+        self.assertEqual(Counted.evaluations, 1)
+        chromosome.value = 7
+        chromosome.invalidate_fitness()
+        self.assertEqual(chromosome.cached_fitness(), 7.0)
+        self.assertEqual(Counted.evaluations, 2)
+
+    def test_shared_by_genome(self):
+        cache: FitnessCache = Counted.enable_fitness_cache(maxsize=10)
+        for _ in range(3):
+            self.assertEqual(Counted(4).cached_fitness(), 4.0)
+        self.assertEqual(Counted.evaluations, 1)
+        self.assertEqual(cache.hits, 2)
+        # a change in place is noticed without invalidate_fitness()
+        chromosome: Counted = Counted(4)
+        chromosome.cached_fitness()
+        chromosome.value = 9
+        self.assertEqual(chromosome.cached_fitness(), 9.0)
+        self.assertEqual(Counted.evaluations, 2)
+
+
+    def test_needs_genome_key(self):
+        class Keyless(Number):
+            genome_key = Chromosome.genome_key  # back to the base class's
+
+        self.assertTrue(Counted.has_genome_key())
+        self.assertFalse(Keyless.has_genome_key())
+        with self.assertRaises(TypeError):
+            Keyless.enable_fitness_cache()
+        self.assertIsNone(Keyless._genome_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
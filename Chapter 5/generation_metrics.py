@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import TextIO
+from dataclasses import dataclass, asdict
+import json
+
+
+# A summary of one generation of a GeneticAlgorithm run, handed to the
+# on_generation callback. All fitness figures come from cached values
+@dataclass
+class GenerationMetrics:
+    generation: int
+    best: float  # best fitness found so far in the run
+    mean: float  # mean fitness of the current population
+    diversity: float  # fraction of distinct genomes in the population, 0 to 1
+    seconds: float  # time taken to produce this generation
+
+
+# on_generation callback that appends every GenerationMetrics as one line of
+# JSON to a file, so long runs can be followed (or plotted) while they go
+class JsonlMetricsWriter:
+    def __init__(self, path: str, append: bool = True) -> None:
+        self._file: TextIO = open(path, 'a' if append else 'w')
+
+    def __call__(self, metrics: GenerationMetrics) -> None:
+        self._file.write(json.dumps(asdict(metrics)) + '\n')
+        self._file.flush()  # so a crash loses at most the current line
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> JsonlMetricsWriter:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
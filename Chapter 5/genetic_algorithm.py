@@ -1,29 +1,86 @@
 from __future__ import annotations
-from typing import TypeVar, Generic, List, Tuple, Callable
+from typing import TypeVar, Generic, List, Tuple, Callable, Optional, Set, Iterable, Iterator, \
+    Dict, Any, Hashable
 from enum import Enum
-from random import choices, random
-from heapq import nlargest
+from concurrent.futures import Executor
+from random import choices, random, shuffle, getstate, setstate
+from time import perf_counter
+import os
+import pickle
+from itertools import accumulate
+from heapq import nlargest, nsmallest
 from statistics import mean
 from chromosome import Chromosome
+from generation_metrics import GenerationMetrics
 
 C = TypeVar('C', bound = Chromosome) # type of the chromosome
 
+
+# module level so that a ProcessPoolExecutor can pickle it
+def _evaluate_fitness(individual: Chromosome) -> float:
+    return individual.fitness()
+
+
+# A tournament draws num_participants of n ranked individuals at random (with
+# replacement, like choices()) and keeps the best 2. Only the 2 lowest ranks of
+# the draw matter, so we sample them directly from their order statistics
+# instead of drawing all the participants: O(1) rather than O(num_participants)
+def _best_two_ranks(n: int, num_participants: int) -> Tuple[int, int]:
+    m: int = num_participants
+    # P(every participant has rank >= r) = ((n - r) / n) ** m, inverted
+    # 1 - random() is in (0, 1] so the root is always defined
+    first: int = min(n - 1, int(n * (1 - (1 - random()) ** (1 / m))))
+    # did exactly one participant land on the best rank? If not, an
+    # individual was drawn twice and it is both of the best 2
+    p_best: float = ((n - first) / n) ** m - ((n - first - 1) / n) ** m
+    p_single: float = m / n * ((n - first - 1) / n) ** (m - 1)
+    if p_best <= 0 or random() >= p_single / p_best:
+        return first, first
+    # the other m - 1 participants are spread uniformly over the worse ranks
+    remaining: int = n - first - 1
+    second: int = first + 1 + min(remaining - 1,
+                                  int(remaining * (1 - (1 - random()) ** (1 / (m - 1)))))
+    return first, second
+
+
 class GeneticAlgorithm(Generic[C]):
-    SelectionType = Enum('SelectionType', 'ROULETTE TOURNAMENT')
+    # qualname lets pickle find the enum, so a GeneticAlgorithm can be sent
+    # to another process
+    SelectionType = Enum('SelectionType', 'ROULETTE TOURNAMENT SUS RANK',
+                         module = __name__, qualname = 'GeneticAlgorithm.SelectionType')
     
     def __init__(self, initial_population: List[C], threshold: float,
                 max_generations: int = 100, mutation_chance: float = 0.01, 
-                crossover_chance: float = 0.7, selection_type = SelectionType.TOURNAMENT) -> None:
+                crossover_chance: float = 0.7, selection_type = SelectionType.TOURNAMENT,
+                executor: Optional[Executor] = None,
+                on_generation: Optional[Callable[[GenerationMetrics], None]] = None,
+                checkpoint_path: Optional[str] = None, checkpoint_interval: int = 10) -> None:
         self._population: List[C] = initial_population
         self._threshold: float = threshold
         self._max_generations: int = max_generations
         self._mutation_chance: float = mutation_chance
         self._crossover_chance: float = crossover_chance
         self._selection_type: GeneticAlgorithm.SelectionType = selection_type
+        # optional thread or process pool used to evaluate a whole generation's
+        # fitness in one batch; None evaluates serially in this process
+        self._executor: Optional[Executor] = executor
         # the fitness key will be some callable that 
-        # takes ._population[0] as argument with the fitness attribute
-        # the ._fitness_key will be different for each of our subclasses
-        self._fitness_key: Callable = type(self._population[0]).fitness
+        # takes ._population[0] as argument and returns its fitness
+        # we use the cached fitness so each individual is evaluated only once
+        # until mutate() or crossover() changes it
+        self._fitness_key: Callable[[C], float] = type(self._population[0]).cached_fitness
+        # called with the metrics of every generation, None prints a summary
+        # line instead (e.g. pass a JsonlMetricsWriter to log to a file)
+        self._on_generation: Optional[Callable[[GenerationMetrics], None]] = on_generation
+        # where run() saves its state every checkpoint_interval generations
+        self._checkpoint_path: Optional[str] = checkpoint_path
+        self._checkpoint_interval: int = checkpoint_interval
+        # progress of run(), restored by load_checkpoint()
+        self._generation: int = 0
+        self._best: Optional[C] = None
+        # the last generation handed to on_generation, so none is reported
+        # twice, even across a checkpoint
+        self._reported: Optional[int] = None
             
     # define the roulette method of selection
     # Use the probability distribution wheel to pick 2 parents
@@ -31,37 +88,99 @@ class GeneticAlgorithm(Generic[C]):
     # the choices function (from the Python module random) 
     ### takes a list of things we want to pick from, a weight list for those things, and no. of things to pick###
     # https://www.w3schools.com/python/ref_random_choices.asp
-    def _pick_roulette(self, wheel: List[float]) -> Tuple[C, C]:
-        return tuple(choices(self._population, weights = wheel, k = 2))
+    # The wheel is passed as cumulative weights, built once per generation;
+    # choices() then only has to bisect it, O(log n) per pick
+    def _pick_roulette(self, cum_wheel: List[float]) -> Tuple[C, C]:
+        return tuple(choices(self._population, cum_weights = cum_wheel, k = 2))
     
     # Choose num_participants at random and take the best 2
-    def _pick_tournament(self, num_participants: int) -> Tuple[C, C]:
-        participants: List[C] = choices(self._population, k = num_participants)
-        # use the nlargest method from heapq to pick the 2 most fitting chromosomes
-        return tuple(nlargest(2, participants, key = self._fitness_key))
-    
+    # Rather than drawing every participant, we draw the ranks of the best 2
+    # participants directly (see _best_two_ranks) and look them up in
+    # ranked, the population indices sorted best first. O(1) per pick
+    def _pick_tournament(self, ranked: List[int], num_participants: int) -> Tuple[C, C]:
+        first, second = _best_two_ranks(len(ranked), num_participants)
+        return self._population[ranked[first]], self._population[ranked[second]]
+
+    # Stochastic universal sampling: one spin of a wheel with count evenly
+    # spaced pointers picks count parents in a single O(n) pass, with less
+    # random spread than count separate roulette spins
+    def _pick_sus(self, cum_wheel: List[float], count: int) -> List[C]:
+        step: float = cum_wheel[-1] / count
+        pointer: float = random() * step
+        selected: List[C] = []
+        index: int = 0
+        # rounding can push the last pointers to the end of the wheel, and
+        # an all-zero wheel has nowhere to stop, so never run past the end
+        last: int = len(cum_wheel) - 1
+        for _ in range(count):
+            while index < last and cum_wheel[index] <= pointer:
+                index += 1
+            selected.append(self._population[index])
+            pointer += step
+        shuffle(selected)  # so that parents aren't paired with their neighbours
+        return selected
+
+    # Rank selection: roulette where the weight is the position in the sorted
+    # population (worst = 1, best = n) instead of the raw fitness. Works with
+    # negative fitness and keeps one outlier from dominating the wheel.
+    # worst_first and its cumulative rank weights are built once per
+    # generation, so a pick is a bisection, O(log n)
+    def _pick_rank(self, worst_first: List[int], cum_ranks: List[int]) -> Tuple[C, C]:
+        picks: List[int] = choices(worst_first, cum_weights = cum_ranks, k = 2)
+        return self._population[picks[0]], self._population[picks[1]]
+
+    # Yield pairs of parents until the caller has enough children. Everything
+    # that depends on the fitness of the current generation is computed once
+    # up front instead of for every pair
+    def _parent_pairs(self) -> Iterator[Tuple[C, C]]:
+        fitnesses: List[float] = [self._fitness_key(x) for x in self._population]
+        n: int = len(self._population)
+        if self._selection_type in (GeneticAlgorithm.SelectionType.ROULETTE,
+                                    GeneticAlgorithm.SelectionType.SUS):
+            # we are increasing the chance of more fit chromosomes so we use the fitnesses of 
+            # them as our wheel/weights
+            cum_wheel: List[float] = list(accumulate(fitnesses))
+            if self._selection_type == GeneticAlgorithm.SelectionType.ROULETTE:
+                while True:
+                    yield self._pick_roulette(cum_wheel)
+            # an even number of parents is enough to fill the generation
+            selected: List[C] = self._pick_sus(cum_wheel, n + n % 2)
+            for i in range(0, len(selected), 2):
+                yield selected[i], selected[i + 1]
+            return
+        # shuffle before the (stable) sort so that ties are broken at random
+        ranked: List[int] = list(range(n))
+        shuffle(ranked)
+        ranked.sort(key = fitnesses.__getitem__, reverse = True)  # best first
+        if self._selection_type == GeneticAlgorithm.SelectionType.RANK:
+            worst_first: List[int] = ranked[::-1]
+            # cumulative weights of 1, 2, ..., n from the worst up
+            cum_ranks: List[int] = [(i + 1) * (i + 2) // 2 for i in range(n)]
+            while True:
+                yield self._pick_rank(worst_first, cum_ranks)
+        # we will only take half if it is a tournament
+        num_participants: int = max(2, n // 2)
+        while True:
+            yield self._pick_tournament(ranked, num_participants)
+
     # Replace the population with a new generation of individuals
     def _reproduce_and_replace(self) -> None:
         new_population: List[C] = []
         
         # keep going until we've filled the new generation
-        while len(new_population) < len(self._population):
-            
-            # pick the 2 parents
-            if self._selection_type == GeneticAlgorithm.SelectionType.ROULETTE:
-                # we are increasing the chance of more fit chromosomes so we use the fitnesses of 
-                # them as our wheel/weights
-                parents: Tuple[C, C] = self._pick_roulette([x.fitness() for x in self._population])
-                    
-            else:
-                # we will only take half if it is a tournament
-                parents = self._pick_tournament(len(self._population) // 2)
+        for parents in self._parent_pairs():
             # potentially crossover the 2 parents
             if random() < self._crossover_chance:
-                new_population.extend(parents[0].crossover(parents[1]))
+                children: Tuple[C, C] = parents[0].crossover(parents[1])
+                # children are new genes, their fitness has to be recomputed
+                for child in children:
+                    child.invalidate_fitness()
+                new_population.extend(children)
             else:
                 # if there are no children, the parents are just added to the new population
                 new_population.extend(parents)
+            if len(new_population) >= len(self._population):
+                break
             
             # if we had an odd number, we'll have 1 extra , so we remove it
         if len(new_population) > len(self._population):
@@ -75,24 +194,124 @@ class GeneticAlgorithm(Generic[C]):
         for individual in self._population:
             if random() < self._mutation_chance:
                 individual.mutate()
+                individual.invalidate_fitness()
+
+    # Evaluate the fitness of every individual that doesn't have a cached
+    # value yet, in one batch. With an executor the batch is spread across
+    # its workers; the results are cached on the chromosomes in this process
+    def _evaluate_population(self) -> None:
+        pending: List[C] = []
+        seen: Set[int] = set()
+        for individual in self._population:
+            # the same object can appear more than once in a population
+            if individual.known_fitness() is None and id(individual) not in seen:
+                seen.add(id(individual))
+                pending.append(individual)
+        if len(pending) == 0:
+            return
+        if self._executor is None:
+            fitnesses: Iterable[float] = map(_evaluate_fitness, pending)
+        else:
+            # larger chunks cut down the pickling overhead of process pools
+            chunksize: int = max(1, len(pending) // 32)
+            fitnesses = self._executor.map(_evaluate_fitness, pending, chunksize = chunksize)
+        for individual, fitness in zip(pending, fitnesses):
+            individual.remember_fitness(fitness)
     
+    # Evolve the population by one generation: select, crossover, mutate and
+    # evaluate the new individuals
+    def next_generation(self) -> None:
+        self._reproduce_and_replace()
+        self._mutate()
+        self._evaluate_population()
+
+    # the k fittest individuals of the current population, best first
+    def top(self, k: int) -> List[C]:
+        self._evaluate_population()
+        return nlargest(k, self._population, key = self._fitness_key)
+
+    # Replace the least fit individuals with newcomers, e.g. migrants from
+    # another population, keeping the population size the same
+    def replace_worst(self, newcomers: List[C]) -> None:
+        self._evaluate_population()
+        worst: List[int] = nsmallest(len(newcomers), range(len(self._population)),
+                                     key = lambda i: self._fitness_key(self._population[i]))
+        for index, newcomer in zip(worst, newcomers):
+            self._population[index] = newcomer
+
+    # Build the metrics of the current generation from cached fitness values
+    # and hand them to the on_generation callback
+    def _report(self, best: C, seconds: float) -> None:
+        fitnesses: List[float] = [self._fitness_key(x) for x in self._population]
+        genomes: Set[Hashable]
+        if type(self._population[0]).has_genome_key():
+            genomes = {x.genome_key() for x in self._population}
+        else:  # fall back on telling genomes apart by fitness
+            genomes = set(fitnesses)
+        metrics: GenerationMetrics = GenerationMetrics(self._generation, best.cached_fitness(),
+                                                       mean(fitnesses),
+                                                       len(genomes) / len(self._population),
+                                                       seconds)
+        if self._on_generation is None:
+            print(f'Generation {metrics.generation} Best {metrics.best} Avg {metrics.mean}')
+        else:
+            self._on_generation(metrics)
+        self._reported = self._generation
+
+    # Save everything run() needs to carry on later: the population, the best
+    # individual so far, the generation count and the random number generator
+    # state. Written to a temporary file first so a crash mid-write never
+    # leaves a broken checkpoint behind
+    def save_checkpoint(self, path: str) -> None:
+        state: Dict[str, Any] = {'generation': self._generation,
+                                 'population': self._population,
+                                 'best': self._best,
+                                 'reported': self._reported,
+                                 'random_state': getstate()}
+        temp_path: str = path + '.tmp'
+        with open(temp_path, 'wb') as checkpoint_file:
+            pickle.dump(state, checkpoint_file)
+        os.replace(temp_path, path)
+
+    # Restore a state saved by save_checkpoint(); the next run() continues
+    # from the generation the checkpoint was taken at, without reporting it
+    # again if it already was
+    def load_checkpoint(self, path: str) -> None:
+        with open(path, 'rb') as checkpoint_file:
+            state: Dict[str, Any] = pickle.load(checkpoint_file)
+        self._generation = state['generation']
+        self._population = state['population']
+        self._best = state['best']
+        self._reported = state['reported']
+        setstate(state['random_state'])
+
     # The .run() method coordinates all the different steps and bring the population from one gen
     # to another. It also keeps track of the best chromosome found at any point in the search
     # Run the genetic algorithm for max_generations iterations
     # and return the best individual found
     
     def run(self) -> C:
-        best: C = max(self._population, key = self._fitness_key)
-        for generation in range(self._max_generations):
+        self._evaluate_population()
+        if self._best is None:
+            self._best = max(self._population, key = self._fitness_key)
+        best: C = self._best
+        # every generation is reported once, as soon as it exists; this one
+        # already has been if it came from a checkpoint
+        if self._reported != self._generation:
+            self._report(best, 0.0)
+        while self._generation < self._max_generations:
             # early exit if we hit threshold
-            if best.fitness() >= self._threshold:
+            if best.cached_fitness() >= self._threshold:
                 return best
-            print(f'Generation {generation} Best {best.fitness()} Avg \
-                  {mean(map(self._fitness_key, self._population))}')
-            self._reproduce_and_replace()
-            self._mutate()
+            started: float = perf_counter()
+            self.next_generation()
             highest: C = max(self._population, key = self._fitness_key)
-            if highest.fitness() > best.fitness():
+            if highest.cached_fitness() > best.cached_fitness():
                   best = highest # found a new best
+            self._best = best
+            self._generation += 1
+            self._report(best, perf_counter() - started)
+            if self._checkpoint_path is not None and \
+                    self._generation % self._checkpoint_interval == 0:
+                self.save_checkpoint(self._checkpoint_path)
         return best # best we found in _max_generations
-                  
\ No newline at end of file
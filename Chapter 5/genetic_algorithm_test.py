@@ -0,0 +1,174 @@
+import unittest
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter
+from random import randrange, seed
+from typing import List, Tuple
+
+# import our scripts
+from chromosome import Chromosome
+from genetic_algorithm import GeneticAlgorithm
+from generation_metrics import GenerationMetrics
+
+
+# A chromosome whose fitness is simply its one gene
+class Number(Chromosome):
+    def __init__(self, value: int) -> None:
+        self.value: int = value
+
+    def fitness(self) -> float:
+        return float(self.value)
+
+    @classmethod
+    def random_instance(cls) -> "Number":
+        return Number(randrange(100))
+
+    def crossover(self, other: "Number") -> Tuple["Number", "Number"]:
+        return Number(self.value), Number(other.value)
+
+    def mutate(self) -> None:
+        self.value = randrange(100)
+
+    def genome_key(self) -> int:
+        return self.value
+
+
+def algorithm(values: List[int], selection_type, **options) -> GeneticAlgorithm[Number]:
+    return GeneticAlgorithm(
+        [Number(value) for value in values], 1000.0, selection_type=selection_type, **options
+    )
+
+
+class SelectionTestCase(unittest.TestCase):
+    def setUp(self):
+        seed(1)
+
+    def test_rank_distribution(self):
+        # weights 1 to 4 from the worst up, whatever the fitness values are
+        ga = algorithm([-5, 0, 7, 1000], GeneticAlgorithm.SelectionType.RANK)
+        counts: Counter = Counter()
+        pairs = ga._parent_pairs()
+        for _ in range(20000):
+            for parent in next(pairs):
+                counts[parent.value] += 1
+        total: int = sum(counts.values())
+        for value, weight in ((-5, 1), (0, 2), (7, 3), (1000, 4)):
+            self.assertAlmostEqual(counts[value] / total, weight / 10, delta=0.01)
+
+    def test_sus_distribution(self):
+        ga = algorithm([1, 1, 2, 4] * 250, GeneticAlgorithm.SelectionType.SUS)
+        counts: Counter = Counter(
+            parent.value for pair in ga._parent_pairs() for parent in pair
+        )
+        # one spin of evenly spaced pointers: within one pick of the share
+        self.assertAlmostEqual(counts[4], 1000 * 4 * 250 / 2000, delta=1)
+        self.assertAlmostEqual(counts[2], 1000 * 2 * 250 / 2000, delta=1)
+
+    def test_sus_zero_fitness(self):
+        # an all-zero wheel has no width for the pointers to spread over
+        ga = algorithm([0] * 10, GeneticAlgorithm.SelectionType.SUS)
+        self.assertEqual(sum(1 for _ in ga._parent_pairs()), 5)
+
+    def test_run_every_selection_type(self):
+        for selection_type in GeneticAlgorithm.SelectionType:
+            ga = algorithm(
+                [randrange(100) for _ in range(20)],
+                selection_type,
+                max_generations=5,
+                on_generation=lambda metrics: None,
+            )
+            self.assertIsInstance(ga.run(), Number)
+
+
+# fitness can't tell 1 from -1, genome_key() can
+class Square(Number):
+    def fitness(self) -> float:
+        return float(self.value * self.value)
+
+
+class KeylessSquare(Square):
+    genome_key = Chromosome.genome_key  # as if it had never been written
+
+
+class ExecutorTestCase(unittest.TestCase):
+    def test_batch_evaluation_matches_serial(self):
+        seed(4)
+        values: List[int] = [randrange(100) for _ in range(200)]
+        serial = algorithm(values, GeneticAlgorithm.SelectionType.TOURNAMENT)
+        serial._evaluate_population()
+        expected: List[float] = [x.known_fitness() for x in serial._population]
+        with ThreadPoolExecutor(4) as threads, ProcessPoolExecutor(2) as processes:
+            for executor in (threads, processes):
+                ga = algorithm(values, GeneticAlgorithm.SelectionType.TOURNAMENT,
+                               executor=executor)
+                # the same object twice is only evaluated once
+                ga._population.append(ga._population[0])
+                ga._evaluate_population()
+                self.assertEqual([x.known_fitness() for x in ga._population],
+                                 expected + expected[:1])
+
+    def test_run_matches_serial(self):
+        values: List[int] = [randrange(100) for _ in range(50)]
+        results: List[List[float]] = []
+        with ProcessPoolExecutor(2) as processes:
+            for executor in (None, processes):
+                seed(5)
+                reported: List[GenerationMetrics] = []
+                algorithm(values, GeneticAlgorithm.SelectionType.ROULETTE,
+                          max_generations=5, executor=executor,
+                          on_generation=reported.append).run()
+                results.append([m.mean for m in reported])
+        self.assertEqual(results[0], results[1])
+
+
+class MetricsTestCase(unittest.TestCase):
+    def test_every_generation_reported(self):
+        seed(2)
+        reported: List[GenerationMetrics] = []
+        ga = algorithm(
+            [randrange(50) for _ in range(10)],
+            GeneticAlgorithm.SelectionType.TOURNAMENT,
+            max_generations=4,
+            on_generation=reported.append,
+        )
+        best: Number = ga.run()
+        self.assertEqual([m.generation for m in reported], [0, 1, 2, 3, 4])
+        self.assertEqual(reported[-1].best, best.cached_fitness())
+
+    def test_diversity(self):
+        for cls, diversity in ((Square, 0.75), (KeylessSquare, 0.5)):
+            reported: List[GenerationMetrics] = []
+            GeneticAlgorithm([cls(1), cls(-1), cls(2), cls(2)], 1000.0, max_generations=0,
+                             on_generation=reported.append).run()
+            self.assertEqual(reported[0].diversity, diversity)
+
+    def test_resume_continues_generations(self):
+        values: List[int] = [randrange(50) for _ in range(10)]
+        seed(3)
+        uninterrupted: List[GenerationMetrics] = []
+        algorithm(values, GeneticAlgorithm.SelectionType.TOURNAMENT,
+                  max_generations=6, on_generation=uninterrupted.append).run()
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "checkpoint")
+            seed(3)
+            reported: List[GenerationMetrics] = []
+            # stops after 3 generations, checkpointing each
+            algorithm(values, GeneticAlgorithm.SelectionType.TOURNAMENT,
+                      max_generations=3, on_generation=reported.append,
+                      checkpoint_path=path, checkpoint_interval=1).run()
+            resumed = algorithm([0], GeneticAlgorithm.SelectionType.TOURNAMENT,
+                                max_generations=6, on_generation=reported.append)
+            resumed.load_checkpoint(path)
+            resumed.run()
+            # a finished run resumed again has nothing new to report
+            again = algorithm([0], GeneticAlgorithm.SelectionType.TOURNAMENT,
+                              max_generations=3, on_generation=reported.append)
+            again.load_checkpoint(path)
+            again.run()
+        self.assertEqual([m.generation for m in reported], list(range(7)))
+        self.assertEqual([m.best for m in reported], [m.best for m in uninterrupted])
+
+
+if __name__ == "__main__":
+    unittest.main()
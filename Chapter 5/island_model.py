@@ -0,0 +1,167 @@
+from __future__ import annotations
+from typing import TypeVar, Generic, Dict, List, Optional, Set
+from enum import Enum
+from dataclasses import dataclass
+from queue import Empty
+from random import seed
+import multiprocessing
+from multiprocessing.synchronize import Event
+from chromosome import Chromosome
+from genetic_algorithm import GeneticAlgorithm
+
+C = TypeVar('C', bound = Chromosome) # type of the chromosome
+
+# how long IslandModel.run() waits for a result before checking on the islands
+_POLL_SECONDS: float = 1.0
+
+
+# What one island reports back when it stops
+@dataclass
+class IslandResult(Generic[C]):
+    island: int
+    best: C
+    fitness: float
+    generations: int
+
+
+# Runs in its own process: evolve one population, every migration_interval
+# generations send copies of its best individuals to the neighbouring islands
+# and swap in whatever migrants have arrived in its inbox
+def _run_island(island: int, ga: GeneticAlgorithm[C], threshold: float,
+                max_generations: int, migration_interval: int, migration_size: int,
+                inbox: multiprocessing.Queue, neighbours: List[multiprocessing.Queue],
+                stop: Event, results: multiprocessing.Queue,
+                island_seed: Optional[int]) -> None:
+    # forked processes inherit the same random state, give each island its own
+    seed(island_seed)
+    # neighbours may stop reading before we do, don't block on exit because of
+    # migrants nobody will collect
+    for neighbour in neighbours:
+        neighbour.cancel_join_thread()
+    best: C = ga.top(1)[0]
+    generation: int = 0
+    while generation < max_generations and not stop.is_set():
+        # early exit if we hit threshold, and tell every other island to stop
+        if best.cached_fitness() >= threshold:
+            stop.set()
+            break
+        ga.next_generation()
+        generation += 1
+        highest: C = ga.top(1)[0]
+        if highest.cached_fitness() > best.cached_fitness():
+            best = highest # found a new best
+        if generation % migration_interval == 0:
+            migrants: List[C] = ga.top(migration_size)
+            for neighbour in neighbours:
+                neighbour.put(migrants)  # pickled, so each neighbour gets copies
+            # migration is asynchronous, take whatever has arrived so far
+            while True:
+                try:
+                    ga.replace_worst(inbox.get_nowait())
+                except Empty:
+                    break
+    if best.cached_fitness() >= threshold:
+        stop.set()
+    results.put(IslandResult(island, best, best.cached_fitness(), generation))
+
+
+# The island model runs several GeneticAlgorithm populations side by side, one
+# process each, so every core is used. Occasionally the best individuals of an
+# island migrate to its neighbours, which spreads good genes while keeping the
+# populations different enough to avoid premature convergence
+class IslandModel(Generic[C]):
+    # RING sends migrants to the next island only; FULLY_CONNECTED to all
+    Topology = Enum('Topology', 'RING FULLY_CONNECTED',
+                    module = __name__, qualname = 'IslandModel.Topology')
+
+    def __init__(self, initial_populations: List[List[C]], threshold: float,
+                 max_generations: int = 100, mutation_chance: float = 0.01,
+                 crossover_chance: float = 0.7,
+                 selection_type = GeneticAlgorithm.SelectionType.TOURNAMENT,
+                 migration_interval: int = 10, migration_size: int = 2,
+                 topology = Topology.RING, random_seed: Optional[int] = None) -> None:
+        if len(initial_populations) < 1:
+            raise ValueError("Need at least one island")
+        if migration_interval < 1 or migration_size < 0:
+            raise ValueError("migration_interval must be positive and migration_size not negative")
+        self._islands: List[GeneticAlgorithm[C]] = [
+            GeneticAlgorithm(population, threshold, max_generations, mutation_chance,
+                             crossover_chance, selection_type)
+            for population in initial_populations]
+        self._threshold: float = threshold
+        self._max_generations: int = max_generations
+        self._migration_interval: int = migration_interval
+        self._migration_size: int = migration_size
+        self._topology: IslandModel.Topology = topology
+        # None seeds every island from the operating system
+        self._random_seed: Optional[int] = random_seed
+        # filled in by run(), sorted by island
+        self.results: List[IslandResult[C]] = []
+
+    # the islands that island sends its migrants to
+    def _neighbours(self, island: int) -> List[int]:
+        count: int = len(self._islands)
+        if count == 1:
+            return []
+        if self._topology == IslandModel.Topology.RING:
+            return [(island + 1) % count]
+        return [other for other in range(count) if other != island]
+
+    # Evolve every island in its own process and return the best individual
+    # found on any of them
+    def run(self) -> C:
+        inboxes: List[multiprocessing.Queue] = [multiprocessing.Queue() for _ in self._islands]
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        stop: Event = multiprocessing.Event()
+        processes: List[multiprocessing.Process] = []
+        for island, ga in enumerate(self._islands):
+            island_seed: Optional[int] = None
+            if self._random_seed is not None:
+                island_seed = self._random_seed + island
+            process = multiprocessing.Process(target = _run_island, args = (
+                island, ga, self._threshold, self._max_generations,
+                self._migration_interval, self._migration_size, inboxes[island],
+                [inboxes[n] for n in self._neighbours(island)], stop, results,
+                island_seed))
+            process.start()
+            processes.append(process)
+        try:
+            # collect before joining, a process can't exit until its result is read
+            self.results = sorted(self._collect(processes, results), key = lambda r: r.island)
+        except BaseException:
+            # don't leave the other islands evolving with nobody to report to
+            stop.set()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+        return max(self.results, key = lambda r: r.fitness).best
+
+    # One result per island. A process that dies (an exception, or killed)
+    # never sends one, so rather than wait forever the queue is polled, and
+    # between polls any island that has exited without reporting is an error
+    def _collect(self, processes: List[multiprocessing.Process],
+                 results: multiprocessing.Queue) -> List[IslandResult[C]]:
+        collected: Dict[int, IslandResult[C]] = {}
+        # islands that had exited cleanly at the last poll but not reported;
+        # their result may still have been on its way through the queue
+        finished: Set[int] = set()
+        while len(collected) < len(processes):
+            try:
+                result: IslandResult[C] = results.get(timeout = _POLL_SECONDS)
+                collected[result.island] = result
+                continue
+            except Empty:
+                pass
+            for island, process in enumerate(processes):
+                if island in collected or process.exitcode is None:
+                    continue
+                if process.exitcode != 0:
+                    raise RuntimeError(f"Island {island} failed with exit code {process.exitcode}")
+                if island in finished:
+                    raise RuntimeError(f"Island {island} exited without a result")
+                finished.add(island)
+        return list(collected.values())
@@ -0,0 +1,52 @@
+import unittest
+import os
+from random import randrange
+from typing import Tuple
+
+# import our scripts
+from island_model import IslandModel
+from genetic_algorithm_test import Number
+
+PARENT: int = os.getpid()
+
+
+# Kills the island process that evaluates it, the way a crash would
+class Crash(Number):
+    def fitness(self) -> float:
+        if os.getpid() != PARENT:
+            os._exit(3)
+        return float(self.value)
+
+    @classmethod
+    def random_instance(cls) -> "Crash":
+        return Crash(randrange(100))
+
+    def crossover(self, other: "Number") -> Tuple["Crash", "Crash"]:
+        return Crash(self.value), Crash(other.value)
+
+
+class IslandModelTestCase(unittest.TestCase):
+    def test_run(self):
+        model = IslandModel(
+            [[Number(randrange(100)) for _ in range(10)] for _ in range(3)],
+            1000.0,
+            max_generations=5,
+            random_seed=1,
+        )
+        best: Number = model.run()
+        self.assertEqual([r.island for r in model.results], [0, 1, 2])
+        self.assertEqual(best.value, max(r.best.value for r in model.results))
+
+    def test_failed_island(self):
+        model = IslandModel(
+            [[Number(randrange(100)) for _ in range(10)] for _ in range(2)]
+            + [[Crash(1) for _ in range(10)]],
+            1000.0,
+            max_generations=1_000_000,
+        )
+        with self.assertRaisesRegex(RuntimeError, "Island 2"):
+            model.run()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,421 @@
+from __future__ import annotations
+from typing import TypeVar, Generic, List, Tuple, Iterator, Optional, Union
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from copy import copy
+from dataclasses import dataclass
+from enum import Enum
+from math import fsum, sqrt, inf
+from random import Random, getrandbits
+from data_point import DataPoint
+from kmeans import KMeans
+from point_set import PointSet, dist
+
+Point = TypeVar("Point", bound=DataPoint)
+
+
+# inertia, iteration count and point to centroid distances computed by one
+# restart of ArrayKMeans.run_restarts()
+@dataclass
+class RestartReport:
+    restart: int
+    inertia: float
+    iterations: int
+    distance_evaluations: int
+
+
+# One restart of run_restarts(): seed new centroids from restart_seed, with
+# a Random of its own so the random module's state is left alone, cluster
+# and return only the result, not the whole model
+def _run_restart(
+    model: ArrayKMeans, restart_seed: int, max_iterations: int, tolerance: float
+) -> Tuple[array, array, float, int, int]:
+    model._reset(Random(restart_seed))
+    model._run(max_iterations, tolerance)
+    return (
+        model._centroids,
+        model._assignments,
+        model.inertia,
+        model.iterations,
+        model.distance_evaluations,
+    )
+
+
+# the model of the run_restarts(workers=...) call a worker process was
+# started for, sent once per process by the pool's initializer
+_worker_model: Optional[ArrayKMeans] = None
+
+
+def _install_worker_model(model: ArrayKMeans) -> None:
+    global _worker_model
+    _worker_model = model
+
+
+# Runs in a worker process of run_restarts(workers=...), whose tasks only
+# carry a seed
+def _run_worker_restart(
+    restart_seed: int, max_iterations: int, tolerance: float
+) -> Tuple[array, array, float, int, int]:
+    assert _worker_model is not None, "worker started without a model"
+    return _run_restart(_worker_model, restart_seed, max_iterations, tolerance)
+
+
+# The same algorithm as KMeans, but the points live in a PointSet, one
+# contiguous float64 array('d') per dimension, instead of a tuple on each
+# DataPoint, and cluster membership is a single array of cluster indices.
+# Assignment and centroid updates are passes over those buffers, with no
+# DataPoint objects, partial() calls or .index() lookups in the inner loops.
+# Points given as DataPoints are not modified (a PointSet is z-score
+# normalised in place); run() still returns KMeans.Cluster objects built from
+# them, or from PointViews of the PointSet, as a view of the result
+class ArrayKMeans(Generic[Point]):
+    # RANDOM picks every centroid coordinate uniformly within the data's
+    # bounds, like KMeans. KMEANS_PLUS_PLUS picks data points, each new one
+    # with probability proportional to its squared distance from the
+    # centroids chosen so far, which spreads them out: fewer empty clusters
+    # and fewer iterations
+    SeedingType = Enum(
+        "SeedingType",
+        "RANDOM KMEANS_PLUS_PLUS",
+        module=__name__,
+        qualname="ArrayKMeans.SeedingType",
+    )
+
+    # accelerated=True skips most distance computations with Hamerly's
+    # bounds (see _assign_clusters_bounded) and gives the same clustering
+    def __init__(
+        self,
+        k: int,
+        points: Union[List[Point], PointSet],
+        seeding=SeedingType.KMEANS_PLUS_PLUS,
+        accelerated: bool = False,
+    ) -> None:
+        if k < 1:  # k-means can't do negative or zero clusters
+            raise ValueError
+        self._k: int = k
+        if isinstance(points, PointSet):
+            self._points: Optional[List[Point]] = None  # views are made on demand
+            self._point_set: PointSet = points
+        else:
+            self._points = points
+            self._point_set = PointSet(point.dimensions for point in points)
+        self._num_points: int = len(self._point_set)
+        self._num_dimensions: int = self._point_set.num_dimensions
+        self._point_set.zscore_normalize()
+        self._seeding: ArrayKMeans.SeedingType = seeding
+        self._accelerated: bool = accelerated
+        # filled in by run_restarts()
+        self.restarts: List[RestartReport] = []
+        # drawn from the random module, so seeding it makes this repeatable
+        self._reset(Random(getrandbits(32)))
+
+    # pick new centroids with generator and forget the assignments
+    def _reset(self, generator: Random) -> None:
+        # centroid j is _centroids[j * D:(j + 1) * D]
+        if self._seeding == ArrayKMeans.SeedingType.KMEANS_PLUS_PLUS:
+            self._centroids: array = self._kmeans_plus_plus_centroids(generator)
+        else:
+            self._centroids = self._random_centroids(generator)
+        # index of the cluster each point is assigned to, -1 for none yet
+        self._assignments: array = array("l", [-1]) * self._num_points
+        self.iterations: int = 0  # iterations done by the last run()
+        # point to centroid distances computed by the last run(), or by all
+        # the restarts of the last run_restarts()
+        self.distance_evaluations: int = 0
+        # Hamerly's bounds for every point, None until the first accelerated
+        # pass: an upper bound on the distance to its own centroid and a
+        # lower bound on the distance to every other centroid
+        self._upper: Optional[array] = None
+        self._lower: Optional[array] = None
+
+    # the (z-scored) values of one dimension for every point
+    def _dimension_slice(self, dimension: int) -> array:
+        return self._point_set.column(dimension)
+
+    # k random centroids, each dimension within the bounds of the data
+    def _random_centroids(self, generator: Random) -> array:
+        bounds: List[Tuple[float, float]] = [
+            (min(column), max(column))
+            for column in map(self._dimension_slice, range(self._num_dimensions))
+        ]
+        centroids: array = array("d")
+        for _ in range(self._k):
+            centroids.extend(generator.uniform(low, high) for low, high in bounds)
+        return centroids
+
+    # k-means++ (Arthur and Vassilvitskii, 2007): the first centroid is a
+    # random point, every next one a point drawn with weight equal to its
+    # squared distance from the closest centroid chosen so far
+    def _kmeans_plus_plus_centroids(self, generator: Random) -> array:
+        rows: List[Tuple[float, ...]] = list(self._iter_rows())
+        chosen: Tuple[float, ...] = rows[generator.randrange(self._num_points)]
+        centroids: array = array("d", chosen)
+        # squared distance of every point to its closest centroid
+        closest: List[float] = [dist(row, chosen) ** 2 for row in rows]
+        for _ in range(1, self._k):
+            if sum(closest) == 0:  # fewer distinct points than clusters
+                chosen = rows[generator.randrange(self._num_points)]
+            else:
+                chosen = generator.choices(rows, weights=closest)[0]
+            centroids.extend(chosen)
+            closest = [min(c, dist(row, chosen) ** 2) for c, row in zip(closest, rows)]
+        return centroids
+
+    # A copy to send to the worker processes of run_restarts(): just the
+    # normalised columns and the settings, without the original points, the
+    # assignments or the bounds, which the workers don't need
+    def _restart_model(self) -> ArrayKMeans:
+        model: ArrayKMeans = copy(self)
+        model._points = None
+        model._point_set = PointSet.from_columns(
+            [self._point_set.column(t) for t in range(self._num_dimensions)]
+        )
+        model._assignments = array("l")
+        model._upper = model._lower = None
+        model.restarts = []
+        return model
+
+    # the centroid buffer as a list of count row tuples
+    def _rows(self, buffer: array, count: int) -> List[Tuple[float, ...]]:
+        d: int = self._num_dimensions
+        return [tuple(buffer[i * d : (i + 1) * d]) for i in range(count)]
+
+    # the points one row at a time, without copying the whole data set
+    def _iter_rows(self) -> Iterator[Tuple[float, ...]]:
+        return self._point_set.rows()
+
+    # Find the closest centroid to every point, returns how many points
+    # changed cluster
+    def _assign_clusters(self) -> int:
+        assignments: array = self._assignments
+        centroid_rows: List[Tuple[float, ...]] = self._rows(self._centroids, self._k)
+        changed: int = 0
+        for i, row in enumerate(self._iter_rows()):
+            distances: List[float] = [dist(row, centroid) for centroid in centroid_rows]
+            # .index() finds the first minimum, ties go to the lowest cluster
+            closest: int = distances.index(min(distances))
+            if assignments[i] != closest:
+                assignments[i] = closest
+                changed += 1
+        self.distance_evaluations += self._num_points * self._k
+        return changed
+
+    # Hamerly's algorithm (2010). If a point's upper bound is below both its
+    # lower bound and half the gap between its centroid and the nearest other
+    # centroid, no other centroid can be closer (triangle inequality) and the
+    # point is skipped. Otherwise the upper bound is tightened, and only if
+    # that doesn't settle it are all k distances computed. After the first
+    # iterations most points are skipped. The comparisons are strict, so a
+    # point is only skipped when the exact search would keep it where it is
+    def _assign_clusters_bounded(self) -> int:
+        k: int = self._k
+        assignments: array = self._assignments
+        centroid_rows: List[Tuple[float, ...]] = self._rows(self._centroids, k)
+        if self._upper is None or self._lower is None:
+            self._upper = array("d", [inf]) * self._num_points
+            self._lower = array("d", [0.0]) * self._num_points
+        upper: array = self._upper
+        lower: array = self._lower
+        # half the distance from every centroid to its nearest other centroid
+        half_gaps: List[float] = [inf] * k
+        for j in range(k):
+            for other in range(j + 1, k):
+                gap: float = dist(centroid_rows[j], centroid_rows[other]) / 2
+                half_gaps[j] = min(half_gaps[j], gap)
+                half_gaps[other] = min(half_gaps[other], gap)
+        changed: int = 0
+        evaluations: int = 0
+        for i, row in enumerate(self._iter_rows()):
+            current: int = assignments[i]
+            if current >= 0:
+                bound: float = max(half_gaps[current], lower[i])
+                if upper[i] < bound:
+                    continue
+                upper[i] = dist(row, centroid_rows[current])
+                evaluations += 1
+                if upper[i] < bound:
+                    continue
+            distances: List[float] = [dist(row, centroid) for centroid in centroid_rows]
+            evaluations += k
+            # .index() finds the first minimum, ties go to the lowest cluster
+            closest: int = distances.index(min(distances))
+            upper[i] = distances[closest]
+            distances[closest] = inf
+            lower[i] = min(distances)  # the second closest, inf if k == 1
+            if current != closest:
+                assignments[i] = closest
+                changed += 1
+        self.distance_evaluations += evaluations
+        return changed
+
+    # how far every centroid moved since old_centroids
+    def _centroid_shifts(self, old_centroids: array) -> List[float]:
+        return [
+            dist(old, new)
+            for old, new in zip(
+                self._rows(old_centroids, self._k), self._rows(self._centroids, self._k)
+            )
+        ]
+
+    # Centroids moved: a point's own centroid can be at most its shift
+    # further away, and any other centroid at most the largest shift closer
+    def _update_bounds(self, shifts: List[float]) -> None:
+        if self._upper is None or self._lower is None:
+            return
+        # the largest shift, and the largest of the others for its own points
+        largest: int = shifts.index(max(shifts))
+        second: float = max(shifts[:largest] + shifts[largest + 1 :], default=0.0)
+        upper: array = self._upper
+        lower: array = self._lower
+        for i, j in enumerate(self._assignments):
+            upper[i] += shifts[j]
+            lower[i] -= second if j == largest else shifts[largest]
+
+    # each centroid becomes the mean of its points, computed as grouped sums
+    # over the buffer; a cluster without points keeps its centroid
+    def _generate_centroids(self) -> None:
+        d: int = self._num_dimensions
+        sums: List[List[float]] = [[0.0] * d for _ in range(self._k)]
+        counts: List[int] = [0] * self._k
+        for row, j in zip(self._iter_rows(), self._assignments):
+            counts[j] += 1
+            total: List[float] = sums[j]
+            for t, value in enumerate(row):
+                total[t] += value
+        for j, count in enumerate(counts):
+            if count == 0:
+                continue
+            self._centroids[j * d : (j + 1) * d] = array("d", [x / count for x in sums[j]])
+
+    # the current clustering as KMeans.Cluster objects holding the original
+    # points; centroids are in z-score space like KMeans
+    @property
+    def clusters(self) -> List[KMeans.Cluster]:
+        clusters: List[KMeans.Cluster] = [
+            KMeans.Cluster([], DataPoint(row))
+            for row in self._rows(self._centroids, self._k)
+        ]
+        points: Iterator = iter(self._point_set) if self._points is None else iter(self._points)
+        for point, j in zip(points, self._assignments):
+            if j >= 0:
+                clusters[j].points.append(point)
+        return clusters
+
+    # sum of squared distances from every point to its centroid, the
+    # quantity k-means minimises; lower is a better clustering
+    @property
+    def inertia(self) -> float:
+        centroid_rows: List[Tuple[float, ...]] = self._rows(self._centroids, self._k)
+        return fsum(
+            dist(row, centroid_rows[j]) ** 2
+            for row, j in zip(self._iter_rows(), self._assignments)
+            if j >= 0
+        )
+
+    # the clustering loop; returns True if it converged. With a tolerance it
+    # also stops once no centroid moves further than tolerance
+    def _run(self, max_iterations: int, tolerance: float = 0.0) -> bool:
+        self.distance_evaluations = 0
+        for iteration in range(max_iterations):
+            self.iterations = iteration + 1
+            # find cluster each point is closest to
+            # no point moving cluster means the centroids won't move either
+            if self._assign() == 0:
+                return True
+            old_centroids: array = array("d", self._centroids)
+            self._generate_centroids()  # find new centroids
+            shifts: List[float] = self._centroid_shifts(old_centroids)
+            self._update_bounds(shifts)
+            if tolerance > 0 and max(shifts) <= tolerance:
+                self._assign()
+                return True
+        # make the assignments match the final centroids
+        self._assign()
+        return False
+
+    def _assign(self) -> int:
+        if self._accelerated:
+            return self._assign_clusters_bounded()
+        return self._assign_clusters()
+
+    def run(
+        self, max_iterations: int = 100, tolerance: float = 0.0
+    ) -> List[KMeans.Cluster]:
+        if self._run(max_iterations, tolerance):
+            print(f"Converged after {self.iterations - 1} iterations")
+        return self.clusters
+
+    # Cluster n_init times from different seeds and keep the result with the
+    # lowest inertia; self.restarts records every restart. The restarts run
+    # in parallel either on a pool of that many worker processes made for
+    # this call, each sent the model once as it starts, or on an executor of
+    # the caller's, which is sent a copy of the model (only the normalised
+    # columns and settings) with every restart
+    def run_restarts(
+        self,
+        n_init: int = 10,
+        max_iterations: int = 100,
+        executor: Optional[Executor] = None,
+        tolerance: float = 0.0,
+        workers: Optional[int] = None,
+    ) -> List[KMeans.Cluster]:
+        if n_init < 1:
+            raise ValueError("n_init must be at least 1")
+        if executor is not None and workers is not None:
+            raise ValueError("Give an executor or a number of workers, not both")
+        # drawn here so that seeding this process makes the run repeatable
+        seeds: List[int] = [getrandbits(32) for _ in range(n_init)]
+        results: Iterator[Tuple[array, array, float, int, int]]
+        if workers is not None:
+            with ProcessPoolExecutor(
+                workers, initializer=_install_worker_model, initargs=(self._restart_model(),)
+            ) as pool:
+                results = iter(
+                    list(
+                        pool.map(
+                            _run_worker_restart,
+                            seeds,
+                            [max_iterations] * n_init,
+                            [tolerance] * n_init,
+                        )
+                    )
+                )
+        elif executor is not None:
+            model: ArrayKMeans = self._restart_model()
+            # a copy each, restarts on threads would share one otherwise
+            results = executor.map(
+                _run_restart,
+                [copy(model) for _ in seeds],
+                seeds,
+                [max_iterations] * n_init,
+                [tolerance] * n_init,
+            )
+        else:
+            results = (
+                _run_restart(self, restart_seed, max_iterations, tolerance)
+                for restart_seed in seeds
+            )
+        self.restarts = []
+        best: Optional[Tuple[array, array, float, int]] = None
+        for restart, result in enumerate(results):
+            centroids, assignments, inertia, iterations, evaluations = result
+            self.restarts.append(RestartReport(restart, inertia, iterations, evaluations))
+            if best is None or inertia < best[2]:
+                # copies, the serial path reuses this model's buffers
+                best = (array("d", centroids), array("l", assignments), inertia, iterations)
+        self._centroids, self._assignments, _, self.iterations = best
+        self.distance_evaluations = sum(r.distance_evaluations for r in self.restarts)
+        # the bounds left over are the last restart's (in the serial path),
+        # not the best one's; the next accelerated pass starts them afresh
+        self._upper = self._lower = None
+        return self.clusters
+
+
+if __name__ == "__main__":
+    point1: DataPoint = DataPoint([2.0, 1.0, 1.0])
+    point2: DataPoint = DataPoint([2.0, 2.0, 5.0])
+    point3: DataPoint = DataPoint([3.0, 1.5, 2.5])
+    kmeans_test: ArrayKMeans[DataPoint] = ArrayKMeans(2, [point1, point2, point3])
+    test_clusters: List[KMeans.Cluster] = kmeans_test.run()
+    for index, cluster in enumerate(test_clusters):
+        print(f"Cluster {index}: {cluster.points}")
@@ -0,0 +1,85 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from random import Random, seed
+from typing import List
+
+# import our scripts
+from array_kmeans import ArrayKMeans
+from data_point import DataPoint
+
+
+def blobs(generator: Random, per_blob: int = 200) -> List[DataPoint]:
+    return [
+        DataPoint([generator.gauss(centre, 1.0) for _ in range(3)])
+        for centre in (0.0, 4.0, 8.0)
+        for _ in range(per_blob)
+    ]
+
+
+class ArrayKMeansTestCase(unittest.TestCase):
+    def test_hamerly_matches_plain(self):
+        for trial in range(10):
+            points: List[DataPoint] = blobs(Random(trial))
+            for seeding in ArrayKMeans.SeedingType:
+                seed(trial)
+                plain: ArrayKMeans[DataPoint] = ArrayKMeans(4, points, seeding)
+                seed(trial)
+                bounded: ArrayKMeans[DataPoint] = ArrayKMeans(
+                    4, points, seeding, accelerated=True
+                )
+                plain._run(100)
+                bounded._run(100)
+                self.assertEqual(plain._assignments, bounded._assignments)
+                self.assertEqual(plain.iterations, bounded.iterations)
+                self.assertLessEqual(
+                    bounded.distance_evaluations, plain.distance_evaluations
+                )
+
+    def test_distance_evaluations_per_run(self):
+        seed(0)
+        model: ArrayKMeans[DataPoint] = ArrayKMeans(3, blobs(Random(0)))
+        model._run(100)
+        first: int = model.distance_evaluations
+        # already converged: one assignment pass, not added to the first run's
+        model._run(100)
+        self.assertEqual(model.distance_evaluations, 3 * 600)
+        self.assertGreater(first, model.distance_evaluations)
+
+    def test_restarts_drop_bounds(self):
+        seed(1)
+        model: ArrayKMeans[DataPoint] = ArrayKMeans(3, blobs(Random(1)), accelerated=True)
+        model.run_restarts(4)
+        self.assertIsNone(model._upper)
+        self.assertEqual(
+            model.distance_evaluations,
+            sum(r.distance_evaluations for r in model.restarts),
+        )
+        assignments = model._assignments
+        model._run(100)
+        self.assertEqual(model._assignments, assignments)
+
+    def test_parallel_restarts_match_serial(self):
+        points: List[DataPoint] = blobs(Random(2))
+        seed(2)
+        serial: ArrayKMeans[DataPoint] = ArrayKMeans(3, points, accelerated=True)
+        serial.run_restarts(4)
+        runs = [{}, {"workers": 2}]
+        with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as processes:
+            runs += [{"executor": threads}, {"executor": processes}]
+            for options in runs:
+                seed(2)
+                parallel: ArrayKMeans[DataPoint] = ArrayKMeans(3, points, accelerated=True)
+                parallel.run_restarts(4, **options)
+                self.assertEqual(parallel.restarts, serial.restarts)
+                self.assertEqual(parallel._assignments, serial._assignments)
+                self.assertEqual(parallel._centroids, serial._centroids)
+
+    def test_restarts_executor_or_workers(self):
+        model: ArrayKMeans[DataPoint] = ArrayKMeans(2, blobs(Random(3), 10))
+        with ThreadPoolExecutor(1) as threads:
+            with self.assertRaises(ValueError):
+                model.run_restarts(2, executor=threads, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,15 @@ from math import sqrt
 
 
 class DataPoint:
+    # no per-instance __dict__ (subclasses that don't declare __slots__ still
+    # get one for their own attributes)
+    __slots__ = ("_originals", "dimensions")
+
     def __init__(self, initial: Iterable[float]) -> None:
         self._originals: Tuple[float, ...] = tuple(initial)
-        self.dimensions: Tuple[float, ...] = tuple(initial)
+        # the same tuple until normalisation replaces it; this also works when
+        # initial is an iterator that can only be read once
+        self.dimensions: Tuple[float, ...] = self._originals
 
     @property
     def num_dimensions(self) -> int:
@@ -1,6 +1,5 @@
 from __future__ import annotations
-from typing import TypeVar, Generic, List, Sequence
-from copy import deepcopy
+from typing import TypeVar, Generic, List, Sequence, Tuple
 from functools import partial
 from random import uniform
 from statistics import mean, pstdev
@@ -30,10 +29,12 @@ class KMeans(Generic[Point]):
             raise ValueError
         self._points: List[Point] = points
         self._zscore_normalize()  # defined below
+        # the (min, max) of every dimension, computed once for all clusters
+        bounds: List[Tuple[float, float]] = self._dimension_bounds()  # defined below
         # initialise empty clusters with random centroids
         self._clusters: List[KMeans.Cluster] = []
         for _ in range(k):
-            rand_point: DataPoint = self._random_point()  # defined below
+            rand_point: DataPoint = self._random_point(bounds)  # defined below
             # assign centroid to a Cluster class variable
             cluster: KMeans.Cluster = KMeans.Cluster([], rand_point)
             # add to ._clusters list
@@ -64,16 +65,22 @@ class KMeans(Generic[Point]):
             # values in zscored
             self._points[i].dimensions = tuple(zscored[i])
 
-    def _random_point(self) -> DataPoint:
-        # empty list to hold the dimensions of the random point, which
-        # this method will return
-        rand_dimensions: List[float] = []
+    def _dimension_bounds(self) -> List[Tuple[float, float]]:
+        bounds: List[Tuple[float, float]] = []
         # .num_dimensions is a property of DataPoint class
         for dimension in range(self._points[0].num_dimensions):
             # get the list of values for the dimension
             values: List[float] = self._dimension_slice(dimension)
+            bounds.append((min(values), max(values)))
+        return bounds
+
+    def _random_point(self, bounds: List[Tuple[float, float]]) -> DataPoint:
+        # empty list to hold the dimensions of the random point, which
+        # this method will return
+        rand_dimensions: List[float] = []
+        for low, high in bounds:
             # calculate a random value that's within the bound of values
-            rand_value: float = uniform(min(values), max(values))
+            rand_value: float = uniform(low, high)
             rand_dimensions.append(rand_value)
         return DataPoint(rand_dimensions)
 
@@ -107,15 +114,27 @@ class KMeans(Generic[Point]):
             # the means list is now new centroid of the cluster
             cluster.centroid = DataPoint(means)
 
-    def run(self, max_iterations: int = 100) -> List(KMeans.Cluster):
+    # the furthest any centroid moved between old_centroids and now
+    def _centroid_shift(self, old_centroids: List[DataPoint]) -> float:
+        return max(
+            old.distance(new) for old, new in zip(old_centroids, self._centroids)
+        )
+
+    # tolerance is how far centroids may still move for the clustering to
+    # count as converged; 0.0 waits until they stop moving altogether
+    def run(
+        self, max_iterations: int = 100, tolerance: float = 0.0
+    ) -> List[KMeans.Cluster]:
         for iteration in range(max_iterations):
             for cluster in self._clusters:
                 # clear all clusters, KMeans.Cluster.points is a list - can use .clear()
                 cluster.points.clear()
             self._assign_clusters()  # find cluster each point is closest to
-            old_centroids: List[DataPoint] = deepcopy(self._centroids)  # record
+            # _generate_centroids() replaces centroids rather than changing
+            # them, so keeping references is enough, no deepcopy needed
+            old_centroids: List[DataPoint] = self._centroids  # record
             self._generate_centroids()  # find new centroids
-            if old_centroids == self._centroids:  # have centroids moved?
+            if self._centroid_shift(old_centroids) <= tolerance:  # have centroids moved?
                 print(f"Converged after {iteration} iterations")
                 return self._clusters
         return self._clusters
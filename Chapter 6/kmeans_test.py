@@ -0,0 +1,93 @@
+import unittest
+import io
+from contextlib import redirect_stdout
+from random import Random, seed
+from typing import List
+
+# import our scripts
+from data_point import DataPoint
+from kmeans import KMeans
+from point_set import PointSet, PointView
+
+
+def blobs(generator: Random, per_blob: int = 100) -> List[DataPoint]:
+    return [
+        DataPoint([generator.gauss(centre, 1.0) for _ in range(3)])
+        for centre in (0.0, 6.0)
+        for _ in range(per_blob)
+    ]
+
+
+# runs model, returns how many iterations it took
+def iterations(model: KMeans, max_iterations: int, tolerance: float) -> int:
+    count: List[int] = [0]
+    generate = model._generate_centroids
+
+    def counted() -> None:
+        count[0] += 1
+        generate()
+
+    model._generate_centroids = counted  # type: ignore
+    with redirect_stdout(io.StringIO()):
+        model.run(max_iterations, tolerance)
+    return count[0]
+
+
+class KMeansToleranceTestCase(unittest.TestCase):
+    def test_stops_once_centroids_settle(self):
+        seed(0)
+        points: List[DataPoint] = blobs(Random(0))
+        exact: int = iterations(KMeans(2, points), 100, 0.0)
+        self.assertLess(exact, 100)
+        # a tolerance bigger than any move stops after the first iteration
+        seed(0)
+        self.assertEqual(iterations(KMeans(2, blobs(Random(0))), 100, 1e9), 1)
+
+    def test_tolerance_never_needs_more_iterations(self):
+        for trial in range(5):
+            seed(trial)
+            exact: int = iterations(KMeans(3, blobs(Random(trial))), 100, 0.0)
+            seed(trial)
+            loose: int = iterations(KMeans(3, blobs(Random(trial))), 100, 0.05)
+            self.assertLessEqual(loose, exact)
+
+    def test_max_iterations(self):
+        seed(1)
+        self.assertEqual(iterations(KMeans(2, blobs(Random(1))), 1, 0.0), 1)
+
+
+class PointSetTestCase(unittest.TestCase):
+    def test_view_distances_match_data_points(self):
+        generator: Random = Random(4)
+        rows: List[List[float]] = [[generator.uniform(-5, 5) for _ in range(4)] for _ in range(20)]
+        point_set: PointSet = PointSet(rows)
+        points: List[DataPoint] = [DataPoint(row) for row in rows]
+        for i in range(20):
+            for j in range(20):
+                expected: float = points[i].distance(points[j])
+                self.assertAlmostEqual(point_set[i].distance(point_set[j]), expected)
+                self.assertAlmostEqual(point_set[i].distance(points[j]), expected)
+
+    def test_normalized_views_match_kmeans(self):
+        generator: Random = Random(5)
+        rows: List[List[float]] = [[generator.uniform(0, 100) for _ in range(3)] for _ in range(30)]
+        point_set: PointSet = PointSet(rows)
+        point_set.zscore_normalize()
+        # KMeans z-scores the DataPoints it is given in place
+        points: List[DataPoint] = [DataPoint(row) for row in rows]
+        KMeans(2, points)
+        for view, point in zip(point_set, points):
+            for a, b in zip(view.dimensions, point.dimensions):
+                self.assertAlmostEqual(a, b)
+            self.assertEqual(repr(view), repr(point))
+        self.assertAlmostEqual(point_set[0].distance(point_set[1]), points[0].distance(points[1]))
+
+    def test_slots(self):
+        point_set: PointSet = PointSet([[1.0, 2.0]])
+        self.assertFalse(hasattr(DataPoint([1.0]), "__dict__"))
+        self.assertFalse(hasattr(point_set[0], "__dict__"))
+        self.assertIsInstance(point_set[-1], PointView)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from math import sqrt
+from random import sample
+import csv
+from data_point import DataPoint
+from point_set import dist
+
+Row = Sequence[float]
+
+
+# Mean and population standard deviation of every dimension, updated one
+# row at a time with Welford's algorithm, so the data never has to be in
+# memory (or even seen) all at once
+class RunningStats:
+    def __init__(self, num_dimensions: int) -> None:
+        self.count: int = 0
+        self.means: List[float] = [0.0] * num_dimensions
+        # sum of squared differences from the current mean
+        self._m2: List[float] = [0.0] * num_dimensions
+
+    def update(self, row: Row) -> None:
+        self.count += 1
+        for dimension, x in enumerate(row):
+            delta: float = x - self.means[dimension]
+            self.means[dimension] += delta / self.count
+            self._m2[dimension] += delta * (x - self.means[dimension])
+
+    @property
+    def stds(self) -> List[float]:
+        if self.count == 0:
+            return [0.0] * len(self.means)
+        return [sqrt(m2 / self.count) for m2 in self._m2]
+
+
+# Group any iterable of rows into lists of at most batch_size rows
+def batched(rows: Iterable[Row], batch_size: int) -> Iterator[List[Row]]:
+    batch: List[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+# Read a CSV file of numbers in chunks of batch_size rows. columns picks
+# which fields to use (all of them if None)
+def csv_batches(path: str, batch_size: int, columns: Optional[Sequence[int]] = None,
+                skip_header: bool = False) -> Iterator[List[Row]]:
+    with open(path, mode="r", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        if skip_header:
+            next(reader, None)
+        rows: Iterator[Tuple[float, ...]]
+        if columns is None:
+            rows = (tuple(map(float, fields)) for fields in reader if fields)
+        else:
+            rows = (tuple(float(fields[c]) for c in columns) for fields in reader if fields)
+        yield from batched(rows, batch_size)
+
+
+# Mini-batch k-means (Sculley, 2010) for data that doesn't fit in memory.
+# Points arrive in batches from any iterator; only the k centroids and the
+# running z-score statistics are kept. Centroids are stored in the original
+# units and distances are measured in z-score space using the statistics seen
+# so far, so centroids don't drift when the statistics are refined. Each
+# cluster has its own learning rate, 1 / (points it has absorbed), so a
+# centroid is the running mean of its points
+class MiniBatchKMeans:
+    def __init__(self, k: int, num_dimensions: int) -> None:
+        if k < 1:  # k-means can't do negative or zero clusters
+            raise ValueError
+        self._k: int = k
+        self._num_dimensions: int = num_dimensions
+        self.stats: RunningStats = RunningStats(num_dimensions)
+        self._centroids: List[List[float]] = []  # empty until the first batch
+        self._counts: List[int] = [0] * k
+        self.points_seen: int = 0
+
+    # multipliers that turn original units into z-score units; a dimension
+    # without variation is ignored, like zscores() in kmeans.py
+    def _scales(self) -> List[float]:
+        return [1 / std if std > 0 else 0.0 for std in self.stats.stds]
+
+    # index of the closest centroid for each row of batch
+    def _assign(self, batch: Sequence[Row]) -> List[int]:
+        scales: List[float] = self._scales()
+        scaled_centroids: List[List[float]] = [
+            [x * s for x, s in zip(centroid, scales)] for centroid in self._centroids
+        ]
+        assignments: List[int] = []
+        for row in batch:
+            scaled: List[float] = [x * s for x, s in zip(row, scales)]
+            distances: List[float] = [dist(scaled, c) for c in scaled_centroids]
+            assignments.append(distances.index(min(distances)))
+        return assignments
+
+    # Update the statistics and centroids with one batch of points
+    def partial_fit(self, batch: Sequence[Row]) -> None:
+        for row in batch:
+            self.stats.update(row)
+        self.points_seen += len(batch)
+        if len(self._centroids) < self._k:
+            # seed the centroids with distinct random points of the first
+            # batches, until we have k of them; a point repeated within the
+            # batch is only a candidate once
+            seeded: Set[Tuple[float, ...]] = set(map(tuple, self._centroids))
+            candidates: List[Tuple[float, ...]] = [
+                row for row in dict.fromkeys(map(tuple, batch)) if row not in seeded
+            ]
+            needed: int = min(self._k - len(self._centroids), len(candidates))
+            self._centroids.extend(list(row) for row in sample(candidates, needed))
+            if len(self._centroids) < self._k:
+                return
+        # assign the whole batch first, then move the centroids
+        for row, j in zip(batch, self._assign(batch)):
+            self._counts[j] += 1
+            rate: float = 1 / self._counts[j]
+            centroid: List[float] = self._centroids[j]
+            for dimension, x in enumerate(row):
+                centroid[dimension] += rate * (x - centroid[dimension])
+
+    # Consume every batch of an iterator, e.g. csv_batches() or batched()
+    def fit(self, batches: Iterable[Sequence[Row]]) -> MiniBatchKMeans:
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    # the cluster a new point belongs to
+    def predict(self, row: Row) -> int:
+        return self._assign([row])[0]
+
+    # centroids in the original units of the data
+    @property
+    def centroids(self) -> List[DataPoint]:
+        return [DataPoint(centroid) for centroid in self._centroids]
+
+    # centroids in z-score units, comparable with KMeans's centroids
+    @property
+    def normalized_centroids(self) -> List[DataPoint]:
+        scales: List[float] = self._scales()
+        means: List[float] = self.stats.means
+        return [DataPoint([(x - m) * s for x, m, s in zip(centroid, means, scales)])
+                for centroid in self._centroids]
+
+
+if __name__ == "__main__":
+    points: List[List[float]] = [[2.0, 1.0, 1.0], [2.0, 2.0, 5.0], [3.0, 1.5, 2.5]]
+    minibatch_test: MiniBatchKMeans = MiniBatchKMeans(2, 3).fit(batched(points, 2))
+    for point in points:
+        print(f"{point} is in cluster {minibatch_test.predict(point)}")
@@ -0,0 +1,25 @@
+import unittest
+from random import seed
+
+# import our scripts
+from minibatch_kmeans import MiniBatchKMeans
+
+
+class MiniBatchKMeansTestCase(unittest.TestCase):
+    def test_seeds_distinct_centroids(self):
+        seed(0)
+        for _ in range(100):
+            model: MiniBatchKMeans = MiniBatchKMeans(3, 2)
+            # repeats within one batch must not become two centroids
+            model.partial_fit([[1.0, 1.0]] * 5 + [[2.0, 2.0]] * 5 + [[9.0, 9.0]])
+            self.assertEqual(len({tuple(c.dimensions) for c in model.centroids}), 3)
+
+    def test_seeding_across_batches(self):
+        model: MiniBatchKMeans = MiniBatchKMeans(2, 1)
+        model.partial_fit([[1.0], [1.0]])
+        model.partial_fit([[1.0], [5.0]])
+        self.assertEqual(sorted(c.dimensions for c in model.centroids), [(1.0,), (5.0,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union, overload
+from array import array
+from math import fsum, sqrt
+from operator import sub
+from data_point import DataPoint
+
+
+# Euclidean distance between two points, for every k-means in this chapter
+# (math.dist() is Python 3.8+). map(sub) and d * d are about a third faster
+# than zip() and ** 2, and the generator builds no list
+def dist(a: Sequence[float], b: Sequence[float]) -> float:
+    return sqrt(sum(d * d for d in map(sub, a, b)))
+
+
+# A whole data set stored as one float64 array('d') per dimension instead of
+# one DataPoint object (with two tuples) per point. The normalised columns
+# are the original columns until zscore_normalize() is called, so nothing is
+# duplicated until it has to be. Points are read through PointView objects
+# created on demand
+class PointSet:
+    def __init__(self, rows: Iterable[Iterable[float]]) -> None:
+        self._originals: List[array] = []
+        for row in rows:
+            values: Tuple[float, ...] = tuple(row)
+            if len(self._originals) == 0:
+                self._originals = [array("d") for _ in values]
+            elif len(values) != len(self._originals):
+                raise ValueError("Every point must have the same number of dimensions")
+            for column, value in zip(self._originals, values):
+                column.append(value)
+        if len(self._originals) == 0:
+            raise ValueError("A PointSet needs at least one point")
+        self._normalized: List[array] = list(self._originals)  # shared until normalised
+
+    # a PointSet of existing columns, which are used as they are, not copied
+    @classmethod
+    def from_columns(cls, columns: List[array]) -> PointSet:
+        if len(columns) == 0 or len(columns[0]) == 0:
+            raise ValueError("A PointSet needs at least one point")
+        if any(len(column) != len(columns[0]) for column in columns):
+            raise ValueError("Every point must have the same number of dimensions")
+        point_set: PointSet = cls.__new__(cls)
+        point_set._originals = list(columns)
+        point_set._normalized = list(columns)
+        return point_set
+
+    @property
+    def num_dimensions(self) -> int:
+        return len(self._originals)
+
+    def __len__(self) -> int:
+        return len(self._originals[0])
+
+    # the normalised values of one dimension for every point
+    def column(self, dimension: int) -> array:
+        return self._normalized[dimension]
+
+    def original_column(self, dimension: int) -> array:
+        return self._originals[dimension]
+
+    # the normalised points one row tuple at a time, zip() does the work in C
+    def rows(self) -> Iterator[Tuple[float, ...]]:
+        return zip(*self._normalized)
+
+    def original_row(self, index: int) -> Tuple[float, ...]:
+        return tuple(column[index] for column in self._originals)
+
+    def normalized_row(self, index: int) -> Tuple[float, ...]:
+        return tuple(column[index] for column in self._normalized)
+
+    # replace the normalised columns with the z-scores of the originals,
+    # like KMeans._zscore_normalize() but one column at a time
+    def zscore_normalize(self) -> None:
+        n: int = len(self)
+        normalized: List[array] = []
+        for column in self._originals:
+            avg: float = fsum(column) / n
+            std: float = sqrt(fsum((x - avg) ** 2 for x in column) / n)
+            if std == 0:  # all zeros if there is no variation
+                normalized.append(array("d", [0.0]) * n)
+            else:
+                normalized.append(array("d", [(x - avg) / std for x in column]))
+        self._normalized = normalized
+
+    @overload
+    def __getitem__(self, index: int) -> PointView:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PointView]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PointView, List[PointView]]:
+        if isinstance(index, slice):
+            return [PointView(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PointSet index out of range")
+        return PointView(self, index)
+
+    def __iter__(self) -> Iterator[PointView]:
+        return (PointView(self, i) for i in range(len(self)))
+
+
+# A lightweight stand-in for a DataPoint that reads its values from a
+# PointSet. __slots__ keeps it to two references, no __dict__
+class PointView:
+    __slots__ = ("_point_set", "_index")
+
+    def __init__(self, point_set: PointSet, index: int) -> None:
+        self._point_set: PointSet = point_set
+        self._index: int = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def dimensions(self) -> Tuple[float, ...]:
+        return self._point_set.normalized_row(self._index)
+
+    @property
+    def _originals(self) -> Tuple[float, ...]:
+        return self._point_set.original_row(self._index)
+
+    @property
+    def num_dimensions(self) -> int:
+        return self._point_set.num_dimensions
+
+    def distance(self, other: Union[PointView, DataPoint]) -> float:
+        return dist(self.dimensions, other.dimensions)
+
+    def __eq__(self, other: object) -> bool:
+        if not hasattr(other, "dimensions"):
+            return NotImplemented
+        return self.dimensions == other.dimensions
+
+    def __repr__(self) -> str:
+        return self._originals.__repr__()
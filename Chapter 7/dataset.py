@@ -0,0 +1,236 @@
+from __future__ import annotations
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from math import inf, sqrt
+from random import Random
+import csv
+
+T = TypeVar("T")  # type of the class labels
+
+
+# Minimum, maximum, mean and population standard deviation of every column,
+# updated one row at a time (the mean and deviation with Welford's
+# algorithm), so they come out of the same pass that reads the data
+class ColumnStatistics:
+    def __init__(self, num_columns: int) -> None:
+        self.count: int = 0
+        self.minimums: List[float] = [inf] * num_columns
+        self.maximums: List[float] = [-inf] * num_columns
+        self.means: List[float] = [0.0] * num_columns
+        # sum of squared differences from the current mean
+        self._m2: List[float] = [0.0] * num_columns
+
+    def update(self, row: Sequence[float]) -> None:
+        self.count += 1
+        for column, x in enumerate(row):
+            if x < self.minimums[column]:
+                self.minimums[column] = x
+            if x > self.maximums[column]:
+                self.maximums[column] = x
+            delta: float = x - self.means[column]
+            self.means[column] += delta / self.count
+            self._m2[column] += delta * (x - self.means[column])
+
+    @property
+    def stds(self) -> List[float]:
+        if self.count == 0:
+            return [0.0] * len(self.means)
+        return [sqrt(m2 / self.count) for m2 in self._m2]
+
+
+class Scaling(Enum):
+    NONE = "none"
+    MIN_MAX = "min_max"  # to between 0 and 1, like normalize_by_feature_scaling()
+    Z_SCORE = "z_score"  # to mean 0 and standard deviation 1
+
+
+# Inputs, one-hot expected outputs and class labels of some rows, ready for
+# Network.train() or MatrixNetwork.train() and validate()
+@dataclass
+class Batch(Generic[T]):
+    inputs: List[List[float]]
+    expecteds: List[List[float]]
+    labels: List[T]
+
+
+# A classification data set read from a CSV file: every feature column is a
+# float64 array('d'), with the class labels alongside. The file is read in
+# one pass that also gathers each column's statistics, so scaling needs no
+# more passes and never changes the stored values: rows are scaled as they
+# are handed out. A column with a single value scales to 0 instead of
+# dividing by zero. Shuffling permutes an array of row numbers, so the data
+# itself is never copied or reordered
+class Dataset(Generic[T]):
+    def __init__(
+        self,
+        columns: List[array],
+        labels: List[T],
+        statistics: ColumnStatistics,
+        scaling: Scaling = Scaling.MIN_MAX,
+    ) -> None:
+        if any(len(column) != len(labels) for column in columns):
+            raise ValueError("Every column needs one value per label")
+        self.columns: List[array] = columns
+        self.labels: List[T] = labels
+        self.statistics: ColumnStatistics = statistics
+        # the classes in order of first appearance, which is the order of
+        # the one-hot outputs
+        self.classes: List[T] = list(dict.fromkeys(labels))
+        self._class_indices: Dict[T, int] = {c: i for i, c in enumerate(self.classes)}
+        self.scaling: Scaling = scaling
+
+    # label_column is the column holding the class (the last if -1); every
+    # other column must be a number. parse_label turns the label's text into
+    # a label, e.g. int for wine.csv
+    @classmethod
+    def from_csv(
+        cls,
+        path: str,
+        label_column: int = -1,
+        parse_label: Callable[[str], T] = str,  # type: ignore
+        scaling: Scaling = Scaling.MIN_MAX,
+        skip_header: bool = False,
+    ) -> Dataset[T]:
+        columns: List[array] = []
+        labels: List[T] = []
+        statistics: Optional[ColumnStatistics] = None
+        with open(path, mode="r", newline="") as csv_file:
+            reader = csv.reader(csv_file)
+            if skip_header:
+                next(reader, None)
+            for fields in reader:
+                if not fields:
+                    continue
+                label: int = label_column % len(fields)
+                row: List[float] = [
+                    float(field) for i, field in enumerate(fields) if i != label
+                ]
+                if statistics is None:
+                    columns = [array("d") for _ in row]
+                    statistics = ColumnStatistics(len(row))
+                elif len(row) != len(columns):
+                    raise ValueError(f"{path}: rows have different numbers of fields")
+                for column, x in zip(columns, row):
+                    column.append(x)
+                statistics.update(row)
+                labels.append(parse_label(fields[label]))
+        if statistics is None:
+            raise ValueError(f"{path} has no rows")
+        return cls(columns, labels, statistics, scaling)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def scaling(self) -> Scaling:
+        return self._scaling
+
+    # x is scaled to (x - offset) * factor; a column with no spread gets a
+    # factor of 0
+    @scaling.setter
+    def scaling(self, scaling: Scaling) -> None:
+        self._scaling: Scaling = scaling
+        spreads: List[float]
+        if scaling == Scaling.MIN_MAX:
+            self._offsets: List[float] = list(self.statistics.minimums)
+            spreads = [
+                maximum - minimum
+                for minimum, maximum in zip(
+                    self.statistics.minimums, self.statistics.maximums
+                )
+            ]
+        elif scaling == Scaling.Z_SCORE:
+            self._offsets = list(self.statistics.means)
+            spreads = self.statistics.stds
+        else:
+            self._offsets = [0.0] * len(self.columns)
+            spreads = [1.0] * len(self.columns)
+        self._factors: List[float] = [
+            1.0 / spread if spread > 0 else 0.0 for spread in spreads
+        ]
+
+    # the scaled inputs of row number index
+    def row(self, index: int) -> List[float]:
+        return [
+            (column[index] - offset) * factor
+            for column, offset, factor in zip(self.columns, self._offsets, self._factors)
+        ]
+
+    def one_hot(self, index: int) -> List[float]:
+        expected: List[float] = [0.0] * len(self.classes)
+        expected[self._class_indices[self.labels[index]]] = 1.0
+        return expected
+
+    # every row number in a random order; pass a seeded Random to repeat it
+    def permutation(self, generator: Optional[Random] = None) -> array:
+        indices: array = array("L", range(len(self)))
+        (generator or Random()).shuffle(indices)
+        return indices
+
+    # The first fraction of a shuffled order for training and the rest for
+    # testing, like the notebook's slices of its shuffled lists
+    def split(
+        self, train_fraction: float, generator: Optional[Random] = None
+    ) -> Tuple[array, array]:
+        indices: array = self.permutation(generator)
+        cut: int = round(len(indices) * train_fraction)
+        return indices[:cut], indices[cut:]
+
+    # the rows with these numbers (all of them if None)
+    def batch(self, indices: Optional[Sequence[int]] = None) -> Batch[T]:
+        if indices is None:
+            indices = range(len(self))
+        return Batch(
+            [self.row(i) for i in indices],
+            [self.one_hot(i) for i in indices],
+            [self.labels[i] for i in indices],
+        )
+
+    # The scaled inputs of those rows back to back, for Network.predict_batch()
+    def flat_inputs(self, indices: Optional[Sequence[int]] = None) -> array:
+        if indices is None:
+            indices = range(len(self))
+        flat: array = array("d")
+        for i in indices:
+            flat.extend(self.row(i))
+        return flat
+
+    # Mini-batches of batch_size rows, from indices (every row if None) in a
+    # new random order if shuffle. Only one batch is built at a time
+    def batches(
+        self,
+        batch_size: int,
+        indices: Optional[Sequence[int]] = None,
+        shuffle: bool = True,
+        generator: Optional[Random] = None,
+    ) -> Iterator[Batch[T]]:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        order: Sequence[int]
+        if indices is None:
+            order = self.permutation(generator) if shuffle else range(len(self))
+        elif shuffle:
+            order = array("L", indices)
+            (generator or Random()).shuffle(order)
+        else:
+            order = indices
+        for start in range(0, len(order), batch_size):
+            yield self.batch(order[start : start + batch_size])
+
+
+if __name__ == "__main__":
+    from network import Network
+
+    iris: Dataset[str] = Dataset.from_csv("iris.csv")
+    train, test = iris.split(140 / 150, Random(0))
+    iris_network: Network = Network([4, 6, 3], 0.3)
+    for _ in range(50):
+        for batch in iris.batches(len(train), train):
+            iris_network.train(batch.inputs, batch.expecteds)
+    testers: Batch[str] = iris.batch(test)
+    correct, total, percentage = iris_network.validate(
+        testers.inputs, testers.labels, lambda output: iris.classes[output.index(max(output))]
+    )
+    print(f"{correct} correct of {total} = {percentage * 100}%")
@@ -0,0 +1,78 @@
+import unittest
+import os
+import tempfile
+from random import Random
+from statistics import mean, pstdev
+from typing import List
+
+# import our scripts
+from dataset import ColumnStatistics, Dataset, Scaling
+from util import normalize_by_feature_scaling
+
+
+class ColumnStatisticsTestCase(unittest.TestCase):
+    def test_matches_statistics_module(self):
+        generator: Random = Random(0)
+        rows: List[List[float]] = [
+            [generator.gauss(1e6, 3.0), generator.uniform(-1, 1)] for _ in range(1000)
+        ]
+        statistics: ColumnStatistics = ColumnStatistics(2)
+        for row in rows:
+            statistics.update(row)
+        for column in range(2):
+            values: List[float] = [row[column] for row in rows]
+            self.assertEqual(statistics.minimums[column], min(values))
+            self.assertEqual(statistics.maximums[column], max(values))
+            self.assertAlmostEqual(statistics.means[column], mean(values), places=6)
+            self.assertAlmostEqual(statistics.stds[column], pstdev(values), places=6)
+
+    def test_empty(self):
+        self.assertEqual(ColumnStatistics(3).stds, [0.0, 0.0, 0.0])
+
+
+class DatasetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.iris: Dataset[str] = Dataset.from_csv("iris.csv")
+
+    def test_min_max_matches_util(self):
+        rows: List[List[float]] = [
+            [column[i] for column in self.iris.columns] for i in range(len(self.iris))
+        ]
+        normalize_by_feature_scaling(rows)
+        for i, row in enumerate(rows):
+            for scaled, expected in zip(self.iris.row(i), row):
+                self.assertAlmostEqual(scaled, expected)
+
+    def test_z_score(self):
+        self.iris.scaling = Scaling.Z_SCORE
+        scaled: List[List[float]] = [self.iris.row(i) for i in range(len(self.iris))]
+        for column in zip(*scaled):
+            self.assertAlmostEqual(mean(column), 0.0)
+            self.assertAlmostEqual(pstdev(column), 1.0)
+
+    def test_constant_column(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "constant.csv")
+            with open(path, "w") as csv_file:
+                csv_file.write("x,y,label\n1,5,a\n2,5,b\n3,5,a\n")
+            dataset: Dataset[str] = Dataset.from_csv(path, skip_header=True)
+        # no spread to divide by: scaled to 0 rather than a ZeroDivisionError
+        dataset.scaling = Scaling.Z_SCORE
+        self.assertEqual([dataset.row(i)[1] for i in range(3)], [0.0, 0.0, 0.0])
+        dataset.scaling = Scaling.MIN_MAX
+        self.assertEqual([dataset.row(i) for i in range(3)], [[0.0, 0.0], [0.5, 0.0], [1.0, 0.0]])
+        self.assertEqual(dataset.classes, ["a", "b"])
+        self.assertEqual(dataset.one_hot(1), [0.0, 1.0])
+
+    def test_split_and_batches(self):
+        train, test = self.iris.split(140 / 150, Random(0))
+        self.assertEqual((len(train), len(test)), (140, 10))
+        self.assertEqual(sorted(list(train) + list(test)), list(range(150)))
+        sizes: List[int] = [
+            len(batch.inputs) for batch in self.iris.batches(32, train, generator=Random(1))
+        ]
+        self.assertEqual(sizes, [32, 32, 32, 32, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import List, Callable, Optional
 from random import random
 from neuron import Neuron
-from util import dot_product
+from util import dot_product, Activation, ActivationLike, resolve_activation
 
 
 class Layer:
@@ -11,23 +11,33 @@ class Layer:
         previous_layer: Optional[Layer],
         num_neurons: int,
         learning_rate: float,
-        activation_function: Callable[[float], float],
-        derivative_activation_function: Callable[[float], float],
+        activation_function: ActivationLike,
+        derivative_activation_function: Optional[Callable[[float], float]] = None,
+        weights: Optional[List[List[float]]] = None,
     ) -> None:
         self.previous_layer: Optional[Layer] = previous_layer
+        # the activation of the whole layer, see util.resolve_activation()
+        self.activation: Activation = resolve_activation(
+            activation_function, derivative_activation_function
+        )
         self.neurons: List[Neuron] = []
+        if weights is not None and len(weights) != num_neurons:
+            raise ValueError("weights needs one row per neuron")
         # the following could all be one large list comprehension
         for i in range(num_neurons):
             if previous_layer is None:
                 random_weights: List[float] = []
+            elif weights is not None:
+                # known weights, e.g. a saved model, skip the random ones
+                random_weights = weights[i]
             else:
                 # initialise one weight for each input, based on num_neurons
                 random_weights = [random() for _ in range(len(previous_layer.neurons))]
             neuron: Neuron = Neuron(
                 random_weights,
                 learning_rate,
-                activation_function,
-                derivative_activation_function,
+                self.activation.function,
+                self.activation.derivative,
             )
             self.neurons.append(neuron)
         self.output_cache: List[float] = [0.0 for _ in range(num_neurons)]
@@ -37,28 +47,35 @@ class Layer:
         if self.previous_layer is None:
             self.output_cache = inputs
         else:
-            # get pass inputs through each neuron
-            self.output_cache = [n.output(inputs) for n in self.neurons]
+            # each neuron's weighted sum, kept in its output_cache, then the
+            # activation over the whole layer at once (softmax needs all of it)
+            for neuron in self.neurons:
+                neuron.output_cache = dot_product(inputs, neuron.weights)
+            self.output_cache = self.activation.forward(
+                [n.output_cache for n in self.neurons]
+            )
         return self.output_cache
 
+    # set each neuron's delta, derivative * output error, from the errors at
+    # this layer's outputs
+    def _set_deltas(self, errors: List[float]) -> None:
+        deltas: List[float] = self.activation.backward(
+            [n.output_cache for n in self.neurons], self.output_cache, errors
+        )
+        for neuron, delta in zip(self.neurons, deltas):
+            neuron.delta = delta
+
     # should only be called on output layer
     def calculate_deltas_for_output_layer(self, expected: List[float]) -> None:
-        for n in range(len(self.neurons)):
-            # manipulate the delta inside the neuron
-            # derivative * output error
-            self.neurons[n].delta = self.neurons[n].derivative_activation_function(
-                self.neurons[n].output_cache
-            ) * (expected[n] - self.output_cache[n])
+        self._set_deltas(
+            [expected[n] - self.output_cache[n] for n in range(len(self.neurons))]
+        )
 
     # should not be called on output layer
     def calculate_deltas_for_hidden_layer(self, next_layer: Layer) -> None:
-        for index, neuron in enumerate(self.neurons):
-            # manipulate the delta inside the neuron
-            # derivative * output error
+        next_deltas: List[float] = [n.delta for n in next_layer.neurons]
+        errors: List[float] = []
+        for index in range(len(self.neurons)):
             next_weights: List[float] = [n.weights[index] for n in next_layer.neurons]
-            next_deltas: List[float] = [n.delta for n in next_layer.neurons]
-            sum_weights_and_deltas: float = dot_product(next_weights, next_deltas)
-            neuron.delta = (
-                neuron.derivative_activation_function(neuron.output_cache)
-                * sum_weights_and_deltas
-            )
+            errors.append(dot_product(next_weights, next_deltas))
+        self._set_deltas(errors)
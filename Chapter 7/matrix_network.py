@@ -0,0 +1,222 @@
+from __future__ import annotations
+from typing import List, Callable, TypeVar, Tuple, Sequence, Optional
+from array import array
+from operator import mul, add
+from random import random
+from network import Network
+from util import sigmoid, derivatie_sigmoid, Activation, ActivationLike, resolve_activation
+
+T = TypeVar("T")  # output type of interpretation of neural network
+
+Row = memoryview  # one neuron's weights, a view into its layer's matrix
+
+
+# The same network as Network (fully connected, no biases, one activation
+# function for every layer) stored as one dense row-major float64 matrix per
+# layer instead of Layer and Neuron objects. Training runs forward and
+# backpropagation for a whole mini-batch at a time and applies the averaged
+# update once per batch; with batch_size=1 it gives exactly the same weights
+# as Network.train(). Dot products are done with map() over whole rows and
+# columns so the arithmetic stays in C rather than in Python loops
+class MatrixNetwork:
+    def __init__(
+        self,
+        layer_structure: List[int],
+        learning_rate: float,
+        activation_function: ActivationLike = sigmoid,
+        derivative_activation_function: Optional[
+            Callable[[float], float]
+        ] = derivatie_sigmoid,
+        weights: Optional[List[array]] = None,
+        output_activation: Optional[ActivationLike] = None,
+    ) -> None:
+        if len(layer_structure) < 3:
+            raise ValueError(
+                "Error: Should be at least 3 layers (1 input, 1 hidden, 1 output)"
+            )
+        self.layer_structure: List[int] = list(layer_structure)
+        self.learning_rate: float = learning_rate
+        self.activation: Activation = resolve_activation(
+            activation_function, derivative_activation_function
+        )
+        # like Network, the output layer can have its own, e.g. softmax
+        self.output_activation: Activation = (
+            self.activation
+            if output_activation is None
+            else resolve_activation(output_activation)
+        )
+        # weights[l] is the (layer_structure[l + 1] x layer_structure[l])
+        # matrix feeding layer l + 1, random like Layer's initial weights
+        # unless given
+        shapes: List[int] = [
+            inputs * outputs
+            for inputs, outputs in zip(layer_structure, layer_structure[1:])
+        ]
+        if weights is None:
+            self.weights: List[array] = [
+                array("d", [random() for _ in range(size)]) for size in shapes
+            ]
+        elif [len(matrix) for matrix in weights] != shapes:
+            raise ValueError("weights don't match the layer structure")
+        else:
+            self.weights = list(weights)
+
+    # the activation of the layer weights[layer] feeds
+    def _activation(self, layer: int) -> Activation:
+        if layer == len(self.weights) - 1:
+            return self.output_activation
+        return self.activation
+
+    # weights[l] split into one row view per neuron; writing to a row writes
+    # to the matrix
+    def _rows(self, layer: int) -> List[Row]:
+        width: int = self.layer_structure[layer]
+        matrix: memoryview = memoryview(self.weights[layer])
+        return [
+            matrix[j * width : (j + 1) * width]
+            for j in range(self.layer_structure[layer + 1])
+        ]
+
+    # Copy the weights out of an existing Network
+    @classmethod
+    def from_network(cls, network: Network) -> MatrixNetwork:
+        return cls(
+            [len(layer.neurons) for layer in network.layers],
+            network.layers[1].neurons[0].learning_rate,
+            network.layers[1].activation,
+            None,
+            [
+                array("d", [w for neuron in layer.neurons for w in neuron.weights])
+                for layer in network.layers[1:]
+            ],
+            network.layers[-1].activation,
+        )
+
+    # Write the weights back into the Layer.neurons[].weights lists of a
+    # Network with the same layer structure
+    def export_to(self, network: Network) -> None:
+        if [len(layer.neurons) for layer in network.layers] != self.layer_structure:
+            raise ValueError("Network has a different layer structure")
+        for l, layer in enumerate(network.layers[1:]):
+            for neuron, row in zip(layer.neurons, self._rows(l)):
+                neuron.weights = list(row)
+
+    # a new Network with these weights
+    def to_network(self) -> Network:
+        return Network(
+            self.layer_structure,
+            self.learning_rate,
+            self.activation,
+            None,
+            [[list(row) for row in self._rows(l)] for l in range(len(self.weights))],
+            self.output_activation,
+        )
+
+    # Forward pass for a batch. Returns, for every layer after the input, the
+    # pre-activation sums and the activations of each sample
+    def _forward(
+        self, batch: Sequence[Sequence[float]]
+    ) -> Tuple[List[List[List[float]]], List[List[List[float]]]]:
+        sums: List[List[List[float]]] = []
+        activations: List[List[List[float]]] = [[list(xs) for xs in batch]]
+        for l in range(len(self.weights)):
+            rows: List[Row] = self._rows(l)
+            layer_sums: List[List[float]] = [
+                [sum(map(mul, row, xs)) for row in rows] for xs in activations[-1]
+            ]
+            sums.append(layer_sums)
+            activation: Activation = self._activation(l)
+            activations.append([activation.forward(zs) for zs in layer_sums])
+        return sums, activations
+
+    def outputs(self, input: Sequence[float]) -> List[float]:
+        return self._forward([input])[1][-1][0]
+
+    # Compute the averaged weight change for one batch, without applying it.
+    # Returned as one flat matrix per layer, the same shape as weights
+    def _gradients(
+        self, batch: Sequence[Sequence[float]], expecteds: Sequence[Sequence[float]]
+    ) -> List[array]:
+        sums, activations = self._forward(batch)
+        last: int = len(self.weights) - 1
+        # output layer: derivative * output error, like
+        # Layer.calculate_deltas_for_output_layer()
+        deltas: List[List[List[float]]] = [[] for _ in self.weights]
+        deltas[last] = [
+            self.output_activation.backward(zs, outs, [y - a for y, a in zip(ys, outs)])
+            for zs, ys, outs in zip(sums[last], expecteds, activations[-1])
+        ]
+        # hidden layers in reverse order: derivative * (next weights^T . next deltas)
+        for l in range(last - 1, -1, -1):
+            next_columns: List[Tuple[float, ...]] = list(zip(*self._rows(l + 1)))
+            deltas[l] = [
+                self._activation(l).backward(
+                    zs,
+                    outs,
+                    [sum(map(mul, column, next_deltas)) for column in next_columns],
+                )
+                for zs, outs, next_deltas in zip(
+                    sums[l], activations[l + 1], deltas[l + 1]
+                )
+            ]
+        # change for weight (j, k) = rate * mean over the batch of
+        # delta_j * previous output_k, i.e. rate / B * (deltas^T . previous outputs)
+        scale: float = self.learning_rate / len(batch)
+        gradients: List[array] = []
+        for l in range(len(self.weights)):
+            delta_columns: List[Tuple[float, ...]] = list(zip(*deltas[l]))
+            input_columns: List[Tuple[float, ...]] = list(zip(*activations[l]))
+            gradients.append(
+                array(
+                    "d",
+                    [
+                        scale * sum(map(mul, delta_column, input_column))
+                        for delta_column in delta_columns
+                        for input_column in input_columns
+                    ],
+                )
+            )
+        return gradients
+
+    # add gradients (from _gradients()) to the weights
+    def _apply(self, gradients: List[array]) -> None:
+        for l, gradient in enumerate(gradients):
+            weights: array = self.weights[l]
+            weights[:] = array("d", map(add, weights, gradient))
+
+    # Like Network.train(), one pass over the data, but in mini-batches of
+    # batch_size samples
+    def train(
+        self,
+        inputs: Sequence[Sequence[float]],
+        expecteds: Sequence[Sequence[float]],
+        batch_size: int = 32,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        for start in range(0, len(inputs), batch_size):
+            self._apply(
+                self._gradients(
+                    inputs[start : start + batch_size],
+                    expecteds[start : start + batch_size],
+                )
+            )
+
+    def validate(
+        self,
+        inputs: Sequence[Sequence[float]],
+        expecteds: List[T],
+        interpret_output: Callable[[List[float]], T],
+        batch_size: Optional[int] = None,
+    ) -> Tuple[int, int, float]:
+        outputs: List[List[float]] = []
+        step: int = batch_size or max(1, len(inputs))
+        for start in range(0, len(inputs), step):
+            outputs.extend(self._forward(inputs[start : start + step])[1][-1])
+        correct: int = sum(
+            1
+            for output, expected in zip(outputs, expecteds)
+            if interpret_output(output) == expected
+        )
+        percentage: float = correct / len(inputs)
+        return correct, len(inputs), percentage
@@ -0,0 +1,62 @@
+import unittest
+from random import Random, seed
+from typing import List
+
+# import our scripts
+from dataset import Dataset
+from matrix_network import MatrixNetwork
+from network import Network
+
+
+def flat_weights(network: Network) -> List[float]:
+    return [w for layer in network.layers[1:] for n in layer.neurons for w in n.weights]
+
+
+class MatrixNetworkTestCase(unittest.TestCase):
+    def setUp(self):
+        iris: Dataset[str] = Dataset.from_csv("iris.csv")
+        indices = iris.permutation(Random(0))[:60]
+        batch = iris.batch(indices)
+        self.inputs: List[List[float]] = batch.inputs
+        self.expecteds: List[List[float]] = batch.expecteds
+
+    def assertWeightsAlmostEqual(self, first: List[float], second: List[float]):
+        self.assertEqual(len(first), len(second))
+        for a, b in zip(first, second):
+            self.assertAlmostEqual(a, b, places=12)
+
+    def test_batch_size_one_matches_network(self):
+        for activation, output_activation in (("sigmoid", None), ("tanh", "softmax")):
+            seed(0)
+            network: Network = Network(
+                [4, 6, 3], 0.3, activation, output_activation=output_activation
+            )
+            matrix: MatrixNetwork = MatrixNetwork.from_network(network)
+            for _ in range(3):
+                network.train(self.inputs, self.expecteds)
+                matrix.train(self.inputs, self.expecteds, batch_size=1)
+            self.assertWeightsAlmostEqual(
+                [w for weights in matrix.weights for w in weights], flat_weights(network)
+            )
+
+    def test_network_round_trip(self):
+        seed(1)
+        network: Network = Network([4, 5, 2, 3], 0.1, "relu", output_activation="softmax")
+        matrix: MatrixNetwork = MatrixNetwork.from_network(network)
+        back: Network = matrix.to_network()
+        self.assertEqual(flat_weights(back), flat_weights(network))
+        self.assertEqual(back.layers[1].activation, network.layers[1].activation)
+        self.assertEqual(back.layers[-1].activation, network.layers[-1].activation)
+        self.assertEqual(matrix.outputs([0.5, 0.1, 0.2, 0.3]), network.outputs([0.5, 0.1, 0.2, 0.3]))
+        # training the matrix and exporting the result
+        matrix.train(self.inputs, self.expecteds, batch_size=8)
+        matrix.export_to(network)
+        self.assertEqual(
+            flat_weights(network), [w for weights in matrix.weights for w in weights]
+        )
+        with self.assertRaises(ValueError):
+            matrix.export_to(Network([4, 5, 3], 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
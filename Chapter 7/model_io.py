@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import List, Tuple, Union
+from array import array
+import mmap
+import os
+import struct
+import sys
+from network import Network
+from matrix_network import MatrixNetwork
+from util import Activation, get_activation
+
+# A trained network in one small binary file, little-endian throughout:
+#   header   magic b"CSNN", format version (uint16), number of layers
+#            (uint16), learning rate (float64)
+#   sizes    neurons in each layer, one uint32 each
+#   names    the registry names (see util.get_activation()) of the hidden
+#            layers' activation then the output layer's, each a uint16 byte
+#            count followed by UTF-8
+#   padding  zero bytes up to a multiple of 8, so the weights are aligned
+#   weights  every layer's weight matrix as raw float64, row-major (one row
+#            per neuron), in layer order; the layout of MatrixNetwork.weights
+# Loading is one mmap and one copy per layer, no parsing of the numbers: each
+# layer's bytes are read through a memoryview of the mapping, not a slice of
+# it, which would be a copy of its own
+
+MAGIC: bytes = b"CSNN"
+VERSION: int = 1
+_HEADER = struct.Struct("<4sHHd")
+_NAME_LENGTH = struct.Struct("<H")
+
+Model = Union[Network, MatrixNetwork]
+
+
+# learning rate, layer structure, hidden and output activations and flat
+# weight matrices of either kind of network
+Parts = Tuple[float, List[int], Activation, Activation, List[array]]
+
+
+# The header only has the layer sizes, so every neuron must have one weight
+# per neuron of the layer before, or the file couldn't be read back
+def _parts(network: Model) -> Parts:
+    parts: Parts
+    if isinstance(network, MatrixNetwork):
+        parts = (
+            network.learning_rate,
+            network.layer_structure,
+            network.activation,
+            network.output_activation,
+            network.weights,
+        )
+    else:
+        sizes: List[int] = [len(layer.neurons) for layer in network.layers]
+        for layer, inputs in zip(network.layers[1:], sizes):
+            for neuron in layer.neurons:
+                if len(neuron.weights) != inputs:
+                    raise ValueError(
+                        f"A neuron has {len(neuron.weights)} weights, "
+                        f"its layer's inputs need {inputs}"
+                    )
+        parts = (
+            network.layers[1].neurons[0].learning_rate,
+            sizes,
+            network.layers[1].activation,
+            network.layers[-1].activation,
+            [
+                array("d", [w for neuron in layer.neurons for w in neuron.weights])
+                for layer in network.layers[1:]
+            ],
+        )
+    sizes = parts[1]
+    for layer, (matrix, inputs, outputs) in enumerate(zip(parts[4], sizes, sizes[1:])):
+        if len(matrix) != inputs * outputs:
+            raise ValueError(
+                f"Layer {layer + 1} has {len(matrix)} weights, "
+                f"its {outputs} rows of {inputs} need {inputs * outputs}"
+            )
+    return parts
+
+
+def save_network(network: Model, path: str) -> None:
+    learning_rate, sizes, activation, output_activation, weights = _parts(network)
+    header: bytearray = bytearray(
+        _HEADER.pack(MAGIC, VERSION, len(sizes), learning_rate)
+    )
+    header += struct.pack(f"<{len(sizes)}I", *sizes)
+    for saved in (activation, output_activation):
+        # it has to be found again at load time, so only registered
+        # activations can be saved
+        if saved.name is None:
+            raise ValueError(f"{saved} is not a registered activation, it can't be saved")
+        name: bytes = saved.name.encode("utf-8")
+        header += _NAME_LENGTH.pack(len(name)) + name
+    header += bytes(-len(header) % 8)
+    # write to a temporary file first so a crash never leaves half a model
+    temporary: str = path + ".tmp"
+    with open(temporary, "wb") as model_file:
+        model_file.write(header)
+        for matrix in weights:
+            if sys.byteorder == "big":
+                matrix = array("d", matrix)
+                matrix.byteswap()
+            model_file.write(matrix.tobytes())
+    os.replace(temporary, path)
+
+
+# a file cut off before end is truncated; checked before every read, so a
+# damaged file is a ValueError rather than a struct.error
+def _check_length(mapped: mmap.mmap, end: int, path: str) -> None:
+    if len(mapped) < end:
+        raise ValueError(f"{path} is truncated")
+
+
+# everything in a model file; the weights come back as one array per layer
+def _read(path: str) -> Parts:
+    with open(path, "rb") as model_file:
+        # an empty file can't even be mapped
+        if os.fstat(model_file.fileno()).st_size < _HEADER.size:
+            raise ValueError(f"{path} is too short to be a model")
+        with mmap.mmap(model_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _read_mapped(mapped, path)
+
+
+# the contents of the mapped file at path, checked as they are read
+def _read_mapped(mapped: mmap.mmap, path: str) -> Parts:
+    magic, version, num_layers, learning_rate = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a model file")
+    if version != VERSION:
+        raise ValueError(f"{path} has unsupported model version {version}")
+    offset: int = _HEADER.size
+    _check_length(mapped, offset + 4 * num_layers, path)
+    sizes: List[int] = list(struct.unpack_from(f"<{num_layers}I", mapped, offset))
+    offset += 4 * num_layers
+    activations: List[Activation] = []
+    for _ in range(2):
+        _check_length(mapped, offset + _NAME_LENGTH.size, path)
+        (length,) = _NAME_LENGTH.unpack_from(mapped, offset)
+        offset += _NAME_LENGTH.size
+        _check_length(mapped, offset + length, path)
+        activations.append(
+            get_activation(mapped[offset : offset + length].decode("utf-8"))
+        )
+        offset += length
+    offset += -offset % 8
+    # the rows' widths come from the sizes, so the weights must fill the
+    # rest of the file exactly
+    expected: int = offset + 8 * sum(
+        inputs * outputs for inputs, outputs in zip(sizes, sizes[1:])
+    )
+    _check_length(mapped, expected, path)
+    if len(mapped) > expected:
+        raise ValueError(f"{path} has more weights than its layer sizes allow")
+    weights: List[array] = []
+    # released before the mapping is closed, which can't happen while a
+    # view of it exists
+    with memoryview(mapped) as view:
+        for inputs, outputs in zip(sizes, sizes[1:]):
+            end: int = offset + 8 * inputs * outputs
+            matrix: array = array("d")
+            matrix.frombytes(view[offset:end])
+            if sys.byteorder == "big":
+                matrix.byteswap()
+            weights.append(matrix)
+            offset = end
+    return learning_rate, sizes, activations[0], activations[1], weights
+
+
+# A MatrixNetwork straight from the file's weight buffers
+def load_matrix_network(path: str) -> MatrixNetwork:
+    learning_rate, sizes, activation, output_activation, weights = _read(path)
+    return MatrixNetwork(
+        sizes, learning_rate, activation, None, weights, output_activation
+    )
+
+
+# A Network with the saved weights, ready for outputs() or predict_batch()
+# (or more training) without the random weights of a new Network
+def load_network(path: str) -> Network:
+    learning_rate, sizes, activation, output_activation, weights = _read(path)
+    return Network(
+        sizes,
+        learning_rate,
+        activation,
+        None,
+        [
+            [matrix[j * inputs : (j + 1) * inputs].tolist() for j in range(outputs)]
+            for matrix, inputs, outputs in zip(weights, sizes, sizes[1:])
+        ],
+        output_activation,
+    )
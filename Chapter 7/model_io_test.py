@@ -0,0 +1,77 @@
+import unittest
+import os
+import tempfile
+from random import seed
+
+# import our scripts
+from matrix_network import MatrixNetwork
+from model_io import load_matrix_network, load_network, save_network
+from network import Network
+
+
+class ModelIOTestCase(unittest.TestCase):
+    def setUp(self):
+        seed(0)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.directory.name, "model.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_network_round_trip(self):
+        network: Network = Network([3, 5, 4, 2], 0.25, "tanh", output_activation="softmax")
+        save_network(network, self.path)
+        loaded: Network = load_network(self.path)
+        self.assertEqual(
+            [[n.weights for n in layer.neurons] for layer in loaded.layers[1:]],
+            [[n.weights for n in layer.neurons] for layer in network.layers[1:]],
+        )
+        self.assertEqual(loaded.layers[1].activation.name, "tanh")
+        self.assertEqual(loaded.layers[-1].activation.name, "softmax")
+        self.assertEqual(loaded.outputs([0.1, 0.2, 0.3]), network.outputs([0.1, 0.2, 0.3]))
+
+    def test_matrix_network_round_trip(self):
+        network: MatrixNetwork = MatrixNetwork([4, 6, 3], 0.3, "relu")
+        save_network(network, self.path)
+        loaded: MatrixNetwork = load_matrix_network(self.path)
+        self.assertEqual(loaded.layer_structure, [4, 6, 3])
+        self.assertEqual(loaded.learning_rate, 0.3)
+        self.assertEqual(loaded.weights, network.weights)
+        # and across the two kinds of network
+        self.assertEqual(
+            load_network(self.path).outputs([1.0, 0.5, 0.0, 0.25]),
+            network.outputs([1.0, 0.5, 0.0, 0.25]),
+        )
+
+    def test_wrong_row_width(self):
+        network: Network = Network([3, 4, 2], 0.5)
+        network.layers[2].neurons[1].weights.append(0.0)
+        with self.assertRaises(ValueError):
+            save_network(network, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_wrong_file_length(self):
+        save_network(MatrixNetwork([2, 3, 1], 0.5), self.path)
+        with open(self.path, "rb") as model_file:
+            data: bytes = model_file.read()
+        for damaged in (data[:-8], data + bytes(8)):
+            with open(self.path, "wb") as model_file:
+                model_file.write(damaged)
+            with self.assertRaises(ValueError):
+                load_matrix_network(self.path)
+
+    def test_truncated_anywhere(self):
+        # cut off in the header, the sizes, the names, the padding or the
+        # weights: always a ValueError, never a struct.error
+        save_network(Network([2, 3, 1], 0.5, "tanh", output_activation="softmax"), self.path)
+        with open(self.path, "rb") as model_file:
+            data: bytes = model_file.read()
+        for length in range(len(data)):
+            with open(self.path, "wb") as model_file:
+                model_file.write(data[:length])
+            with self.assertRaises(ValueError, msg=f"{length} bytes"):
+                load_network(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,25 +1,42 @@
 from __future__ import annotations
-from typing import List, Callable, TypeVar, Tuple
+from typing import List, Callable, TypeVar, Tuple, Sequence, Optional, Dict
+from array import array
 from functools import reduce
+from operator import mul
+import threading
 from layer import Layer
-from util import sigmoid, derivatie_sigmoid
+from util import sigmoid, derivatie_sigmoid, Activation, ActivationLike
 
 T = TypeVar("T")  # output type of interpretation of neural network
 
+# per-thread scratch buffers for predict_batch(), one array per layer, keyed
+# by layer structure so networks of the same shape share them
+_scratch: threading.local = threading.local()
+
 
 class Network:
     def __init__(
         self,
         layer_structure: List[int],
         learning_rate: float,
-        activation_function: Callable[[float], float] = sigmoid,
-        derivative_activation_function: Callable[[float], float] = derivatie_sigmoid,
+        activation_function: ActivationLike = sigmoid,
+        derivative_activation_function: Optional[
+            Callable[[float], float]
+        ] = derivatie_sigmoid,
+        weights: Optional[List[List[List[float]]]] = None,
+        output_activation: Optional[ActivationLike] = None,
     ) -> None:
         if len(layer_structure) < 3:
             raise ValueError(
                 "Error: Should be at least 3 layers (1 input, \
                 1 hidden, 1 output"
             )
+        # output_activation, e.g. "softmax", replaces activation_function for
+        # the output layer only.
+        # weights, if given, has one matrix (a row per neuron) for every
+        # layer after the input layer, used instead of random weights
+        if weights is not None and len(weights) != len(layer_structure) - 1:
+            raise ValueError("weights needs one matrix per non-input layer")
         # create a list to add layers
         self.layers: List[Layer] = []
         # input layer
@@ -36,12 +53,16 @@ class Network:
         # hidden layers and output layer
         # we use enumerate to get the index of the previous layer
         for previous, num_neurons in enumerate(layer_structure[1::]):
+            is_output: bool = previous == len(layer_structure) - 2
             next_layer = Layer(
                 self.layers[previous],
                 num_neurons,
                 learning_rate,
-                activation_function,
+                output_activation
+                if is_output and output_activation is not None
+                else activation_function,
                 derivative_activation_function,
+                None if weights is None else weights[previous],
             )
             self.layers.append(next_layer)
 
@@ -50,6 +71,58 @@ class Network:
     def outputs(self, input: List[float]) -> List[float]:
         return reduce(lambda inputs, layer: layer.outputs(inputs), self.layers, input)
 
+    # Run a whole batch through the network without touching any neuron or
+    # layer caches, so several threads can call it at once on the same
+    # network (as long as nobody trains it at the same time). inputs is an
+    # N x D buffer, the rows back to back; the N x outputs results are
+    # written to out, allocated if not given. Every layer works in a buffer
+    # allocated once per thread, so a call allocates nothing per sample
+    def predict_batch(
+        self, inputs: Sequence[float], out: Optional[array] = None
+    ) -> array:
+        sizes: Tuple[int, ...] = tuple(len(layer.neurons) for layer in self.layers)
+        width: int = sizes[0]
+        num_outputs: int = sizes[-1]
+        if len(inputs) % width != 0:
+            raise ValueError(f"inputs must hold rows of {width} values")
+        num_rows: int = len(inputs) // width
+        if out is None:
+            out = array("d", [0.0]) * (num_rows * num_outputs)
+        elif len(out) < num_rows * num_outputs:
+            raise ValueError("out is too small for the results")
+        buffers_by_shape: Dict[Tuple[int, ...], List[array]] = _scratch.__dict__.setdefault(
+            "buffers", {}
+        )
+        if sizes not in buffers_by_shape:
+            buffers_by_shape[sizes] = [array("d", [0.0]) * size for size in sizes[1:]]
+        buffers: List[array] = buffers_by_shape[sizes]
+        # slices of a memoryview are views, slices of a list are copies
+        source: Sequence[float]
+        try:
+            source = memoryview(inputs)
+        except TypeError:
+            source = inputs
+        # the weights and activations of every layer after the input
+        layers: List[Tuple[List[List[float]], Activation]] = [
+            ([neuron.weights for neuron in layer.neurons], layer.activation)
+            for layer in self.layers[1:]
+        ]
+        for row in range(num_rows):
+            previous: Sequence[float] = source[row * width : (row + 1) * width]
+            for l, (weights, activation) in enumerate(layers):
+                current: array = buffers[l]
+                if not activation.elementwise:  # needs all the sums first
+                    for j, neuron_weights in enumerate(weights):
+                        current[j] = sum(map(mul, neuron_weights, previous))
+                    current[:] = array("d", activation.forward(current))
+                else:
+                    function: Callable[[float], float] = activation.function
+                    for j, neuron_weights in enumerate(weights):
+                        current[j] = function(sum(map(mul, neuron_weights, previous)))
+                previous = current
+            out[row * num_outputs : (row + 1) * num_outputs] = buffers[-1]
+        return out
+
     # The backpropagate() method is responsible for computing deltas for every neuron.
     # Figure out each neuron's changes based on the errors of the output
     # versus the expected outcome
@@ -103,8 +176,14 @@ class Network:
     ) -> Tuple[int, int, float]:
         # count of corrects, initialised to 0
         correct: int = 0
-        for input, expected in zip(inputs, expecteds):
-            result: T = interpret_output(self.outputs(input))
+        # one batch through predict_batch(), which leaves the caches alone
+        num_outputs: int = len(self.layers[-1].neurons)
+        outputs: array = self.predict_batch(
+            array("d", [x for input in inputs for x in input])
+        )
+        for i, expected in enumerate(expecteds):
+            output: List[float] = outputs[i * num_outputs : (i + 1) * num_outputs].tolist()
+            result: T = interpret_output(output)
             if result == expected:
                 correct += 1
         percentage: float = correct / len(inputs)
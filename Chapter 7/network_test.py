@@ -0,0 +1,98 @@
+import unittest
+import sys
+from array import array
+from random import Random, seed
+from threading import Thread
+from typing import Dict, List, Tuple
+
+# import our scripts
+from network import Network
+
+
+# every cache backpropagation relies on: layer outputs, neuron sums and deltas
+def caches(network: Network) -> List[Tuple]:
+    return [
+        (list(layer.output_cache), [(n.output_cache, n.delta) for n in layer.neurons])
+        for layer in network.layers
+    ]
+
+
+class PredictBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        generator: Random = Random(0)
+        self.rows: List[List[float]] = [
+            [generator.uniform(-2, 2) for _ in range(4)] for _ in range(50)
+        ]
+        self.flat: array = array("d", [x for row in self.rows for x in row])
+
+    def test_matches_outputs(self):
+        for activation, output_activation in (
+            ("sigmoid", None),
+            ("tanh", "softmax"),
+            ("relu", "sigmoid"),
+        ):
+            seed(1)
+            network: Network = Network(
+                [4, 6, 5, 3], 0.3, activation, output_activation=output_activation
+            )
+            batch: array = network.predict_batch(self.flat)
+            self.assertEqual(len(batch), 3 * len(self.rows))
+            for i, row in enumerate(self.rows):
+                for a, b in zip(batch[3 * i : 3 * i + 3], network.outputs(row)):
+                    self.assertAlmostEqual(a, b, places=12)
+            # a list works too, and so does an out buffer
+            out: array = array("d", [0.0]) * len(batch)
+            self.assertIs(network.predict_batch(list(self.flat), out), out)
+            self.assertEqual(out, batch)
+
+    def test_leaves_caches_alone(self):
+        seed(2)
+        network: Network = Network([4, 6, 3], 0.3)
+        # give the caches something to lose
+        network.train(self.rows[:1], [[1.0, 0.0, 0.0]])
+        network.outputs(self.rows[1])
+        before: List[Tuple] = caches(network)
+        network.predict_batch(self.flat)
+        self.assertEqual(caches(network), before)
+
+    def test_threads(self):
+        seed(3)
+        network: Network = Network([4, 6, 3], 0.3, "tanh", output_activation="softmax")
+        network.outputs(self.rows[0])
+        before: List[Tuple] = caches(network)
+        expected: List[float] = list(network.predict_batch(self.flat))
+        results: Dict[int, List[float]] = {}
+
+        def predict(thread: int) -> None:
+            # each thread its own order of rows, so any shared buffer shows
+            rows: List[List[float]] = self.rows[thread:] + self.rows[:thread]
+            flat: array = array("d", [x for row in rows for x in row])
+            for _ in range(20):
+                output: List[float] = list(network.predict_batch(flat))
+            results[thread] = output[-3 * thread :] + output[: -3 * thread] if thread else output
+
+        threads: List[Thread] = [Thread(target=predict, args=(i,)) for i in range(8)]
+        # switch threads as often as possible, so they interleave mid-batch
+        interval: float = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        for thread in range(8):
+            self.assertEqual(results[thread], expected)
+        self.assertEqual(caches(network), before)
+
+    def test_bad_shapes(self):
+        network: Network = Network([4, 6, 3], 0.3)
+        with self.assertRaises(ValueError):
+            network.predict_batch(array("d", [0.0]) * 5)
+        with self.assertRaises(ValueError):
+            network.predict_batch(self.flat, array("d", [0.0]) * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
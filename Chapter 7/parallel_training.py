@@ -0,0 +1,268 @@
+from __future__ import annotations
+from typing import Any, List, Optional, Sequence, Tuple
+from enum import Enum
+from array import array
+from operator import add
+import multiprocessing
+from multiprocessing.connection import wait
+from multiprocessing.synchronize import Barrier
+from threading import BrokenBarrierError
+from matrix_network import MatrixNetwork
+
+Rows = Sequence[Sequence[float]]
+# one mini-batch given to a worker: its inputs, their expected outputs and how
+# many samples the whole step (all workers together) covers
+Chunk = Tuple[Rows, Rows, int]
+SharedBuffer = Any  # a multiprocessing RawArray("d"), shared between processes
+
+# exit code of a SYNCHRONOUS worker that stopped because another worker
+# failed, or took longer than the barrier timeout, rather than failing itself
+BROKEN_BARRIER_EXIT: int = 3
+
+
+# a RawArray("d") as a memoryview of doubles; ctypes reports its own format
+# string, which memoryview can only slice after a cast through bytes
+def _flat(shared: SharedBuffer) -> memoryview:
+    return memoryview(shared).cast("B").cast("d")
+
+
+# weights[l] of a MatrixNetwork as views into one flat shared buffer holding
+# every layer back to back
+def _layer_views(shared: SharedBuffer, layer_structure: List[int]) -> List[memoryview]:
+    flat: memoryview = _flat(shared)
+    views: List[memoryview] = []
+    offset: int = 0
+    for inputs, outputs in zip(layer_structure, layer_structure[1:]):
+        views.append(flat[offset : offset + inputs * outputs])
+        offset += inputs * outputs
+    return views
+
+
+# A MatrixNetwork in a worker process whose weights live in shared memory, so
+# every worker (and the parent) sees the same numbers
+def _shared_network(template: MatrixNetwork, shared: SharedBuffer) -> MatrixNetwork:
+    return MatrixNetwork(
+        template.layer_structure,
+        template.learning_rate,
+        template.activation,
+        None,
+        _layer_views(shared, template.layer_structure),  # type: ignore
+        template.output_activation,
+    )
+
+
+# Runs in its own process for SYNCHRONOUS training. Every step each worker
+# writes its share of the batch's gradient to its own slot of gradients,
+# then, after all have written, adds the sum of every slot over its own
+# segment of the weights. The two barriers keep anyone from reading weights
+# that are half updated, so the result is the same as one process training
+# with batches of all the workers' samples together. A worker that is killed
+# can't break the barrier itself, so the others give up after timeout seconds
+# (None to wait forever) at a barrier
+def _synchronous_worker(
+    worker: int,
+    num_workers: int,
+    template: MatrixNetwork,
+    weights: SharedBuffer,
+    gradients: SharedBuffer,
+    chunks: List[Chunk],
+    epochs: int,
+    barrier: Barrier,
+    timeout: Optional[float],
+) -> None:
+    try:
+        network: MatrixNetwork = _shared_network(template, weights)
+        flat_weights: memoryview = _flat(weights)
+        all_gradients: memoryview = _flat(gradients)
+        size: int = len(flat_weights)
+        mine: memoryview = all_gradients[worker * size : (worker + 1) * size]
+        segment_start: int = size * worker // num_workers
+        segment_end: int = size * (worker + 1) // num_workers
+        for _ in range(epochs):
+            for inputs, expecteds, step_size in chunks:
+                if len(inputs) == 0:  # the last step may not reach every worker
+                    mine[:] = array("d", [0.0]) * size
+                else:
+                    # _gradients() averages over this chunk, weight it by the
+                    # chunk's share of the step so the slots add up to the mean
+                    share: float = len(inputs) / step_size
+                    mine[:] = array(
+                        "d",
+                        [
+                            share * g
+                            for gradient in network._gradients(inputs, expecteds)
+                            for g in gradient
+                        ],
+                    )
+                barrier.wait(timeout)
+                for start in range(segment_start, segment_end, 1024):
+                    end: int = min(start + 1024, segment_end)
+                    total: List[float] = list(flat_weights[start:end])
+                    for other in range(num_workers):
+                        offset: int = other * size
+                        total = list(
+                            map(add, total, all_gradients[offset + start : offset + end])
+                        )
+                    flat_weights[start:end] = array("d", total)
+                barrier.wait(timeout)
+    except BrokenBarrierError:
+        # another worker failed, and has already reported why, or timed out
+        raise SystemExit(BROKEN_BARRIER_EXIT)
+    except BaseException:
+        barrier.abort()  # don't leave the other workers waiting forever
+        raise
+
+
+# Runs in its own process for HOGWILD training: plain mini-batch SGD on its
+# own shard, reading and updating the shared weights without any locking.
+# Updates from different workers can overwrite each other, which Hogwild
+# (Niu et al., 2011) shows costs little when each update is small
+def _hogwild_worker(
+    template: MatrixNetwork,
+    weights: SharedBuffer,
+    inputs: Rows,
+    expecteds: Rows,
+    batch_size: int,
+    epochs: int,
+) -> None:
+    network: MatrixNetwork = _shared_network(template, weights)
+    for _ in range(epochs):
+        network.train(inputs, expecteds, batch_size)
+
+
+# Wait for every worker to exit. As soon as one fails the rest are stopped
+# too: in SYNCHRONOUS mode by breaking the barrier, which a worker that was
+# killed never gets to do, and in HOGWILD mode by terminating them, since the
+# weights are thrown away either way
+def _join_workers(
+    processes: List[multiprocessing.process.BaseProcess], barrier: Optional[Barrier]
+) -> None:
+    running: List[multiprocessing.process.BaseProcess] = list(processes)
+    stopping: bool = False
+    while running:
+        wait([process.sentinel for process in running])
+        for process in [process for process in running if not process.is_alive()]:
+            process.join()
+            running.remove(process)
+            if process.exitcode != 0 and not stopping:
+                stopping = True
+                if barrier is not None:
+                    barrier.abort()
+                else:
+                    for other in running:
+                        other.terminate()
+
+
+# Data-parallel training of a MatrixNetwork (use MatrixNetwork.from_network()
+# and export_to() for a Network) with one process per worker, so every core
+# does backpropagation at once instead of the single thread of
+# Network.train(). The weights are copied into shared memory for the length
+# of a train() call, and written back at the end.
+# SYNCHRONOUS: every step each of the num_workers workers takes batch_size
+# samples, and the update applied is the average over all of them.
+# Deterministic, and equivalent to MatrixNetwork.train() with batches of
+# num_workers * batch_size samples.
+# HOGWILD: the data is split into one shard per worker and each worker runs
+# mini-batch SGD on its shard, applying updates to the shared weights as soon
+# as it has them. No waiting for each other, but not reproducible run to run.
+# barrier_timeout is how long a SYNCHRONOUS worker waits for the others at
+# each step before giving up (None for ever)
+class ParallelTrainer:
+    UpdateMode = Enum(
+        "UpdateMode",
+        "SYNCHRONOUS HOGWILD",
+        module=__name__,
+        qualname="ParallelTrainer.UpdateMode",
+    )
+
+    def __init__(
+        self,
+        network: MatrixNetwork,
+        num_workers: Optional[int] = None,
+        update_mode: ParallelTrainer.UpdateMode = UpdateMode.SYNCHRONOUS,  # type: ignore
+        batch_size: int = 32,
+        barrier_timeout: Optional[float] = 300.0,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.network: MatrixNetwork = network
+        self.num_workers: int = num_workers or multiprocessing.cpu_count()
+        if self.num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        self.update_mode: ParallelTrainer.UpdateMode = update_mode
+        self.batch_size: int = batch_size
+        self.barrier_timeout: Optional[float] = barrier_timeout
+
+    # the mini-batches each worker handles in SYNCHRONOUS mode; step s covers
+    # samples s * num_workers * batch_size onwards, in worker order
+    def _chunks(self, inputs: Rows, expecteds: Rows) -> List[List[Chunk]]:
+        step_size: int = self.num_workers * self.batch_size
+        chunks: List[List[Chunk]] = [[] for _ in range(self.num_workers)]
+        for step_start in range(0, len(inputs), step_size):
+            samples: int = min(step_size, len(inputs) - step_start)
+            for worker in range(self.num_workers):
+                start: int = step_start + worker * self.batch_size
+                end: int = min(start + self.batch_size, step_start + samples)
+                chunks[worker].append(
+                    (inputs[start:end], expecteds[start:end], samples)
+                )
+        return chunks
+
+    # epochs passes over the data, split across the workers
+    def train(self, inputs: Rows, expecteds: Rows, epochs: int = 1) -> None:
+        if len(inputs) != len(expecteds):
+            raise ValueError("inputs and expecteds must be the same length")
+        context = multiprocessing.get_context()
+        size: int = sum(len(weights) for weights in self.network.weights)
+        shared = context.RawArray("d", size)
+        _flat(shared)[:] = array("d", [w for weights in self.network.weights for w in weights])
+        processes: List[multiprocessing.process.BaseProcess] = []
+        barrier: Optional[Barrier] = None
+        if self.update_mode == ParallelTrainer.UpdateMode.SYNCHRONOUS:
+            gradients = context.RawArray("d", size * self.num_workers)
+            barrier = context.Barrier(self.num_workers)
+            for worker, chunks in enumerate(self._chunks(inputs, expecteds)):
+                processes.append(
+                    context.Process(
+                        target=_synchronous_worker,
+                        args=(worker, self.num_workers, self.network, shared,
+                              gradients, chunks, epochs, barrier, self.barrier_timeout),
+                    )
+                )
+        else:
+            # contiguous shards, so each worker still sees its samples in order
+            for worker in range(self.num_workers):
+                start: int = len(inputs) * worker // self.num_workers
+                end: int = len(inputs) * (worker + 1) // self.num_workers
+                processes.append(
+                    context.Process(
+                        target=_hogwild_worker,
+                        args=(self.network, shared, inputs[start:end],
+                              expecteds[start:end], self.batch_size, epochs),
+                    )
+                )
+        for process in processes:
+            process.start()
+        _join_workers(processes, barrier)
+        failed: List[int] = [
+            worker for worker, process in enumerate(processes) if process.exitcode != 0
+        ]
+        if failed:
+            # the workers that failed themselves, not the ones they stopped
+            causes: List[int] = [
+                worker for worker in failed
+                if processes[worker].exitcode != BROKEN_BARRIER_EXIT
+            ]
+            if causes:
+                codes: str = ", ".join(
+                    f"{worker} (exit code {processes[worker].exitcode})" for worker in causes
+                )
+                raise RuntimeError(f"Training workers failed: {codes}; weights left unchanged")
+            raise RuntimeError(
+                f"Training workers timed out after {self.barrier_timeout} seconds "
+                "at a barrier; weights left unchanged"
+            )
+        for weights, view in zip(
+            self.network.weights, _layer_views(shared, self.network.layer_structure)
+        ):
+            weights[:] = array("d", view)
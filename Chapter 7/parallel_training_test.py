@@ -0,0 +1,79 @@
+import unittest
+from array import array
+from random import Random, seed
+from typing import List, Sequence
+
+# import our scripts
+from dataset import Dataset
+from matrix_network import MatrixNetwork
+from parallel_training import ParallelTrainer
+
+
+def copy(network: MatrixNetwork) -> MatrixNetwork:
+    return MatrixNetwork(
+        network.layer_structure,
+        network.learning_rate,
+        network.activation,
+        None,
+        [array("d", weights) for weights in network.weights],
+        network.output_activation,
+    )
+
+
+def mean_squared_error(
+    network: MatrixNetwork,
+    inputs: Sequence[Sequence[float]],
+    expecteds: Sequence[Sequence[float]],
+) -> float:
+    total: float = 0.0
+    for input, expected in zip(inputs, expecteds):
+        total += sum((y - a) ** 2 for y, a in zip(expected, network.outputs(input)))
+    return total / len(inputs)
+
+
+class ParallelTrainerTestCase(unittest.TestCase):
+    def setUp(self):
+        iris: Dataset[str] = Dataset.from_csv("iris.csv")
+        batch = iris.batch(iris.permutation(Random(0))[:60])
+        self.inputs: List[List[float]] = batch.inputs
+        self.expecteds: List[List[float]] = batch.expecteds
+
+    def test_synchronous_matches_serial(self):
+        # 3 * 4 divides the 60 samples evenly, 3 * 7 leaves a short last step
+        # that doesn't reach the last worker
+        for batch_size in (4, 7):
+            seed(0)
+            serial: MatrixNetwork = MatrixNetwork(
+                [4, 6, 3], 0.3, "tanh", None, None, "softmax"
+            )
+            parallel: MatrixNetwork = copy(serial)
+            for _ in range(2):
+                serial.train(self.inputs, self.expecteds, batch_size=3 * batch_size)
+            ParallelTrainer(parallel, 3, batch_size=batch_size).train(
+                self.inputs, self.expecteds, epochs=2
+            )
+            for expected, actual in zip(serial.weights, parallel.weights):
+                self.assertEqual(len(expected), len(actual))
+                for a, b in zip(expected, actual):
+                    self.assertAlmostEqual(a, b, places=12)
+
+    def test_hogwild_learns(self):
+        seed(1)
+        network: MatrixNetwork = MatrixNetwork([4, 6, 3], 0.3)
+        before: float = mean_squared_error(network, self.inputs, self.expecteds)
+        ParallelTrainer(
+            network, 2, ParallelTrainer.UpdateMode.HOGWILD, batch_size=4
+        ).train(self.inputs, self.expecteds, epochs=20)
+        after: float = mean_squared_error(network, self.inputs, self.expecteds)
+        self.assertLess(after, before)
+
+    def test_bad_arguments(self):
+        network: MatrixNetwork = MatrixNetwork([4, 6, 3], 0.3)
+        with self.assertRaises(ValueError):
+            ParallelTrainer(network, 2, batch_size=0)
+        with self.assertRaises(ValueError):
+            ParallelTrainer(network, 2).train(self.inputs, self.expecteds[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
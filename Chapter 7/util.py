@@ -1,28 +1,196 @@
-from typing import List
-from math import exp
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from math import exp, tanh
+from operator import mul
 
 # dot product of two vectors
 def dot_product(xs: List[float], ys: List[float]) -> float:
     return sum(x * y for x, y in zip(xs, ys))
 
 
+# exp() is only ever called on a negative number, so it can't overflow
+# however large x gets in either direction
 def sigmoid(x: float) -> float:
-    return 1.0 / (1.0 + exp(-x))
+    if x >= 0:
+        return 1.0 / (1.0 + exp(-x))
+    z: float = exp(x)
+    return z / (1.0 + z)
 
 
+# derivative of the sigmoid at the weighted sum x; recomputes the sigmoid,
+# sigmoid_derivative_from_output() doesn't need to
 def derivatie_sigmoid(x: float) -> float:
     sig: float = sigmoid(x)
     return sig * (1 - sig)
 
 
+# Derivatives written in terms of the activation's output y instead of its
+# input, so backpropagation can use the outputs cached by the forward pass
+# instead of calling exp() or tanh() again
+def sigmoid_derivative_from_output(y: float) -> float:
+    return y * (1 - y)
+
+
+def derivative_tanh(x: float) -> float:
+    return 1 - tanh(x) ** 2
+
+
+def tanh_derivative_from_output(y: float) -> float:
+    return 1 - y * y
+
+
+def relu(x: float) -> float:
+    return x if x > 0 else 0.0
+
+
+def derivative_relu(x: float) -> float:
+    return 1.0 if x > 0 else 0.0
+
+
+def relu_derivative_from_output(y: float) -> float:
+    return 1.0 if y > 0 else 0.0
+
+
+# softmax of a whole layer; subtracting the largest value first keeps exp()
+# from overflowing without changing the result
+def softmax(xs: Sequence[float]) -> List[float]:
+    largest: float = max(xs)
+    exps: List[float] = [exp(x - largest) for x in xs]
+    total: float = sum(exps)
+    return [e / total for e in exps]
+
+
+# for the neurons of a softmax layer, whose outputs depend on the whole layer
+def whole_layer_only(x: float) -> float:
+    raise TypeError("softmax needs the whole layer, use Layer.outputs()")
+
+
+# An activation function as a layer sees it: forward() turns the weighted
+# sums of a layer into its outputs, backward() turns the errors at those
+# outputs into deltas. function and derivative are the one-neuron versions
+# for Neuron (derivative takes the weighted sum, like derivatie_sigmoid());
+# derivative_from_output takes the neuron's output instead
+class Activation:
+    # False if each output depends on the whole layer, like softmax
+    elementwise: bool = True
+
+    def __init__(
+        self,
+        name: Optional[str],
+        function: Callable[[float], float],
+        derivative: Callable[[float], float],
+        derivative_from_output: Optional[Callable[[float], float]] = None,
+    ) -> None:
+        self.name: Optional[str] = name  # None if not in the registry
+        self.function: Callable[[float], float] = function
+        self.derivative: Callable[[float], float] = derivative
+        self.derivative_from_output: Optional[
+            Callable[[float], float]
+        ] = derivative_from_output
+
+    def forward(self, sums: Sequence[float]) -> List[float]:
+        return list(map(self.function, sums))
+
+    # derivative * error for each neuron; from the cached outputs if
+    # possible, from the weighted sums otherwise
+    def backward(
+        self, sums: Sequence[float], outputs: Sequence[float], errors: Sequence[float]
+    ) -> List[float]:
+        if self.derivative_from_output is not None:
+            return list(map(mul, map(self.derivative_from_output, outputs), errors))
+        return list(map(mul, map(self.derivative, sums), errors))
+
+    # registered activations unpickle as the registry's own instance
+    def __reduce__(self):  # type: ignore
+        if self.name is not None and _ACTIVATIONS.get(self.name) is self:
+            return get_activation, (self.name,)
+        return super().__reduce__()
+
+    def __repr__(self) -> str:
+        return f"Activation({self.name or self.function.__name__})"
+
+
+# Softmax isn't elementwise, so neither is its derivative: backward()
+# multiplies the errors by the Jacobian, y_i * (error_i - sum_j y_j * error_j)
+class SoftmaxActivation(Activation):
+    elementwise: bool = False
+
+    def __init__(self) -> None:
+        super().__init__("softmax", whole_layer_only, whole_layer_only)
+
+    def forward(self, sums: Sequence[float]) -> List[float]:
+        return softmax(sums)
+
+    def backward(
+        self, sums: Sequence[float], outputs: Sequence[float], errors: Sequence[float]
+    ) -> List[float]:
+        weighted: float = sum(map(mul, outputs, errors))
+        return [y * (error - weighted) for y, error in zip(outputs, errors)]
+
+
+_ACTIVATIONS: Dict[str, Activation] = {}
+
+
+# make an activation available by name, e.g. to Network("relu") or to
+# saved models
+def register_activation(activation: Activation) -> Activation:
+    if activation.name is None:
+        raise ValueError("Only named activations can be registered")
+    _ACTIVATIONS[activation.name] = activation
+    return activation
+
+
+def get_activation(name: str) -> Activation:
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unknown activation {name}")
+    return _ACTIVATIONS[name]
+
+
+register_activation(
+    Activation("sigmoid", sigmoid, derivatie_sigmoid, sigmoid_derivative_from_output)
+)
+register_activation(Activation("tanh", tanh, derivative_tanh, tanh_derivative_from_output))
+register_activation(Activation("relu", relu, derivative_relu, relu_derivative_from_output))
+register_activation(SoftmaxActivation())
+
+ActivationLike = Union[str, Activation, Callable[[float], float]]
+
+
+# What Network, Layer and MatrixNetwork accept as an activation: a registry
+# name, an Activation, or the original pair of functions. A pair made of
+# registered functions (e.g. sigmoid and derivatie_sigmoid) becomes the
+# registered Activation; any other pair is wrapped, and its derivative is
+# given the weighted sums as before
+def resolve_activation(
+    activation_function: ActivationLike,
+    derivative_activation_function: Optional[Callable[[float], float]] = None,
+) -> Activation:
+    if isinstance(activation_function, Activation):
+        return activation_function
+    if isinstance(activation_function, str):
+        return get_activation(activation_function)
+    for activation in _ACTIVATIONS.values():
+        if activation.function is activation_function and (
+            derivative_activation_function is None
+            or activation.derivative is derivative_activation_function
+        ):
+            return activation
+    if derivative_activation_function is None:
+        raise ValueError("A derivative is needed for an unregistered activation")
+    return Activation(None, activation_function, derivative_activation_function)
+
+
 # assume all rows are of the same length
 # and feature scale each column to be in the range 0 to 1
+# a column with the same value in every row has no range to scale by, so
+# it becomes all 0s instead of dividing by zero
 def normalize_by_feature_scaling(dataset: List[List[float]]) -> None:
     for col_num in range(len(dataset[0])):
         column: List[float] = [row[col_num] for row in dataset]
         maximum = max(column)
         minimum = min(column)
+        spread: float = maximum - minimum
         for row_num in range(len(dataset)):
-            dataset[row_num][col_num] = (dataset[row_num][col_num] - minimum) / (
-                maximum - minimum
+            dataset[row_num][col_num] = (
+                (dataset[row_num][col_num] - minimum) / spread if spread > 0 else 0.0
             )
@@ -0,0 +1,78 @@
+import unittest
+from array import array
+from math import fsum, tanh
+from random import Random, seed
+from typing import List
+
+# import our scripts
+from network import Network
+from util import (
+    Activation,
+    derivatie_sigmoid,
+    derivative_tanh,
+    get_activation,
+    relu,
+    resolve_activation,
+    sigmoid,
+    softmax,
+)
+
+
+class SigmoidTestCase(unittest.TestCase):
+    def test_no_overflow(self):
+        self.assertEqual(sigmoid(-1000), 0.0)
+        self.assertEqual(sigmoid(1000), 1.0)
+        self.assertEqual(sigmoid(0), 0.5)
+        self.assertAlmostEqual(sigmoid(2) + sigmoid(-2), 1.0, places=15)
+
+
+class SoftmaxTestCase(unittest.TestCase):
+    def test_sums_to_one(self):
+        generator: Random = Random(0)
+        for scale in (1, 100, 1000):
+            xs: List[float] = [generator.uniform(-scale, scale) for _ in range(10)]
+            ys: List[float] = softmax(xs)
+            self.assertAlmostEqual(fsum(ys), 1.0, places=12)
+            self.assertTrue(all(0.0 <= y <= 1.0 for y in ys))
+        # would overflow exp() without subtracting the largest value
+        self.assertEqual(softmax([1000.0, 1000.0]), [0.5, 0.5])
+
+    def test_predict_batch_matches_outputs(self):
+        seed(4)
+        network: Network = Network([3, 5, 4], 0.3, "relu", output_activation="softmax")
+        generator: Random = Random(1)
+        rows: List[List[float]] = [
+            [generator.uniform(-3, 3) for _ in range(3)] for _ in range(20)
+        ]
+        batch: array = network.predict_batch(array("d", [x for row in rows for x in row]))
+        for i, row in enumerate(rows):
+            outputs: List[float] = network.outputs(row)
+            self.assertAlmostEqual(fsum(outputs), 1.0, places=12)
+            for a, b in zip(batch[4 * i : 4 * i + 4], outputs):
+                self.assertAlmostEqual(a, b, places=12)
+
+
+class ActivationTestCase(unittest.TestCase):
+    def test_unknown_name(self):
+        with self.assertRaisesRegex(ValueError, "Unknown activation nope"):
+            get_activation("nope")
+        with self.assertRaisesRegex(ValueError, "Unknown activation nope"):
+            Network([2, 2, 1], 0.3, "nope")
+
+    def test_resolve(self):
+        self.assertIs(resolve_activation("tanh"), get_activation("tanh"))
+        self.assertIs(resolve_activation(get_activation("relu")), get_activation("relu"))
+        self.assertIs(
+            resolve_activation(sigmoid, derivatie_sigmoid), get_activation("sigmoid")
+        )
+        self.assertIs(resolve_activation(relu), get_activation("relu"))
+        custom: Activation = resolve_activation(tanh, derivatie_sigmoid)
+        self.assertIsNone(custom.name)
+        self.assertIs(custom.derivative, derivatie_sigmoid)
+        with self.assertRaisesRegex(ValueError, "derivative"):
+            resolve_activation(abs)
+        self.assertIsNot(resolve_activation(abs, derivative_tanh), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
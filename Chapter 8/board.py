@@ -1,10 +1,20 @@
 from __future__ import annotations
 from typing import NewType, List
 from abc import ABC, abstractmethod
+from random import Random
 
 Move = NewType("Move", int)
 
 
+# Random 64-bit numbers for Zobrist hashing, one per (square, piece) plus
+# extras such as the side to move. A position's key is the XOR of the
+# numbers of everything in it, so a move updates it with one or two XORs.
+# The numbers come from a fixed seed, so keys are the same in every process
+def zobrist_numbers(count: int, seed: int) -> List[int]:
+    generator: Random = Random(seed)
+    return [generator.getrandbits(64) for _ in range(count)]
+
+
 class Piece:
     @property
     def opposite(self) -> Piece:
@@ -12,6 +22,10 @@ class Piece:
 
 
 class Board(ABC):
+    # no attributes of its own, so subclasses that declare __slots__ (like
+    # BitboardC4Board) really have no per-instance __dict__
+    __slots__ = ()
+
     @property
     @abstractmethod
     def turn(self) -> Piece:
@@ -38,3 +52,9 @@ class Board(ABC):
     @abstractmethod
     def evaluate(self, player: Piece) -> float:
         ...
+
+    # a 64-bit hash of the position and side to move, for transposition
+    # tables; boards that want one keep it up to date in move()
+    @property
+    def zobrist_key(self) -> int:
+        raise NotImplementedError("Should be implemented by subclass")
@@ -0,0 +1,242 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Tuple
+from dataclasses import dataclass, asdict
+from random import Random
+from time import perf_counter
+import argparse
+import json
+import platform
+import sys
+from board import Piece, Board, Move
+from minimax import minimax, alphabeta
+from tictactoe import TTTBoard
+from connectfour import C4Board
+from connectfour_bitboard import BitboardC4Board
+
+# Perft ("performance test") counts the positions exactly depth moves from a
+# start position. The counts are known, so it checks move generation, and
+# timing it measures move generation and making moves with nothing else in
+# the way. Games that are won on the way stop there, so their positions
+# aren't counted at deeper depths
+KNOWN_PERFT: Dict[str, List[int]] = {
+    "tictactoe": [1, 9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872],
+    "connectfour": [1, 7, 49, 343, 2401, 16807, 117649, 823536],
+}
+
+BOARDS: Dict[str, Tuple[str, Callable[[], Board]]] = {
+    "TTTBoard": ("tictactoe", TTTBoard),
+    "C4Board": ("connectfour", C4Board),
+    "BitboardC4Board": ("connectfour", BitboardC4Board),
+}
+
+
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    if board.is_win or board.is_draw:
+        return 0
+    return sum(perft(board.move(move), depth - 1) for move in board.legal_moves)
+
+
+# One measurement: how many positions one run visits, and how long all the
+# runs took. Fast benchmarks are run repeatedly so the time is long enough to
+# measure reliably
+@dataclass
+class BenchmarkResult:
+    name: str
+    nodes: int
+    seconds: float
+    runs: int = 1
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes * self.runs / self.seconds if self.seconds > 0 else 0.0
+
+
+# run measure (which returns nodes and seconds) until min_seconds have passed
+def _repeat(
+    name: str, measure: Callable[[], Tuple[int, float]], min_seconds: float
+) -> BenchmarkResult:
+    nodes, seconds = measure()
+    runs: int = 1
+    while seconds < min_seconds:
+        more_nodes, more_seconds = measure()
+        if more_nodes != nodes:
+            raise AssertionError(f"{name}: runs visited {nodes} and {more_nodes} nodes")
+        seconds += more_seconds
+        runs += 1
+    return BenchmarkResult(name, nodes, seconds, runs)
+
+
+# A Board that counts the positions a search makes, for nodes per second of
+# minimax() and alphabeta(), which don't count them themselves. It adds a
+# little overhead of its own, the same for every search
+class _CountingBoard(Board):
+    def __init__(self, board: Board, counter: List[int]) -> None:
+        self._board: Board = board
+        self._counter: List[int] = counter
+
+    @property
+    def turn(self) -> Piece:
+        return self._board.turn
+
+    def move(self, location: Move) -> Board:
+        self._counter[0] += 1
+        return _CountingBoard(self._board.move(location), self._counter)
+
+    @property
+    def legal_moves(self) -> List[Move]:
+        return self._board.legal_moves
+
+    @property
+    def is_win(self) -> bool:
+        return self._board.is_win
+
+    @property
+    def is_draw(self) -> bool:
+        return self._board.is_draw
+
+    def evaluate(self, player: Piece) -> float:
+        return self._board.evaluate(player)
+
+
+def _time_perft(board: Board, depth: int, game: str) -> Tuple[int, float]:
+    start: float = perf_counter()
+    nodes: int = perft(board, depth)
+    seconds: float = perf_counter() - start
+    known: List[int] = KNOWN_PERFT[game]
+    if depth < len(known) and nodes != known[depth]:
+        raise AssertionError(f"perft({depth}) of {game} is {nodes}, expected {known[depth]}")
+    return nodes, seconds
+
+
+def _time_search(
+    board: Board, search: Callable[[Board, bool, Piece, int], float], depth: int
+) -> Tuple[int, float]:
+    counter: List[int] = [0]
+    start: float = perf_counter()
+    search(_CountingBoard(board, counter), True, board.turn, depth)
+    return counter[0], perf_counter() - start
+
+
+# 100 positions a few random (but seeded) moves into a game
+def _sample_positions(factory: Callable[[], Board]) -> List[Board]:
+    generator: Random = Random(0)
+    positions: List[Board] = []
+    while len(positions) < 100:
+        board: Board = factory()
+        for _ in range(generator.randrange(1, 12)):
+            if board.is_win or board.is_draw:
+                break
+            board = board.move(generator.choice(board.legal_moves))
+        positions.append(board)
+    return positions
+
+
+def _time_evaluate(positions: List[Board]) -> Tuple[int, float]:
+    start: float = perf_counter()
+    for position in positions:
+        position.evaluate(position.turn)
+    return len(positions), perf_counter() - start
+
+
+# Every benchmark, on every board, each run for at least min_seconds. quick
+# uses smaller depths, for a check that takes seconds rather than minutes
+def run_benchmarks(quick: bool = False, min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    depths: Dict[str, Tuple[int, int]] = {  # perft depth, search depth
+        "tictactoe": (6 if quick else 8, 5 if quick else 8),
+        "connectfour": (4 if quick else 5, 3 if quick else 4),
+    }
+    results: List[BenchmarkResult] = []
+    for board_name, (game, factory) in BOARDS.items():
+        perft_depth, search_depth = depths[game]
+        results.append(
+            _repeat(
+                f"{board_name}.perft{perft_depth}",
+                lambda: _time_perft(factory(), perft_depth, game),
+                min_seconds,
+            )
+        )
+        for search_name, search in (("minimax", minimax), ("alphabeta", alphabeta)):
+            results.append(
+                _repeat(
+                    f"{board_name}.{search_name}{search_depth}",
+                    lambda: _time_search(factory(), search, search_depth),
+                    min_seconds,
+                )
+            )
+        positions: List[Board] = _sample_positions(factory)
+        results.append(
+            _repeat(f"{board_name}.evaluate", lambda: _time_evaluate(positions), min_seconds)
+        )
+    return results
+
+
+# results as JSON, with enough about the machine to know whether two result
+# files are comparable
+def to_json(results: List[BenchmarkResult]) -> Dict[str, object]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": {
+            result.name: dict(asdict(result), nodes_per_second=result.nodes_per_second)
+            for result in results
+        },
+    }
+
+
+# Benchmarks more than tolerance (a fraction) slower than in the baseline, or
+# whose node counts changed (the search or move generation is different), as
+# one message each
+def regressions(
+    current: Dict[str, object], baseline: Dict[str, object], tolerance: float = 0.2
+) -> List[str]:
+    messages: List[str] = []
+    now: Dict[str, Dict[str, float]] = current["results"]  # type: ignore
+    before: Dict[str, Dict[str, float]] = baseline["results"]  # type: ignore
+    for name, old in before.items():
+        if name not in now:
+            continue  # e.g. a quick run against a full baseline
+        new: Dict[str, float] = now[name]
+        if new["nodes"] != old["nodes"]:
+            messages.append(f"{name}: {new['nodes']} nodes, baseline {old['nodes']}")
+        elif new["nodes_per_second"] < old["nodes_per_second"] * (1 - tolerance):
+            messages.append(
+                f"{name}: {new['nodes_per_second']:,.0f} nodes/s, "
+                f"baseline {old['nodes_per_second']:,.0f}"
+            )
+    return messages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Board and search benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller depths")
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.2, help="shortest time per benchmark"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with this earlier --output")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed slowdown, default 0.2"
+    )
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = run_benchmarks(args.quick, args.min_seconds)
+    for result in results:
+        print(
+            f"{result.name:<32}{result.nodes:>12,} nodes x{result.runs:<6}"
+            f"{result.seconds:>8.3f}s {result.nodes_per_second:>14,.0f}/s"
+        )
+    report: Dict[str, object] = to_json(results)
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline: Dict[str, object] = json.load(baseline_file)
+        found: List[str] = regressions(report, baseline, args.tolerance)
+        for message in found:
+            print(f"REGRESSION {message}")
+        sys.exit(1 if len(found) > 0 else 0)
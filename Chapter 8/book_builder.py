@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import List, Set
+import argparse
+from board import Board
+from tictactoe import TTTBoard
+from connectfour_bitboard import BitboardC4Board
+from iterative_deepening import IterativeDeepening, SearchResult
+from opening_book import (
+    OpeningBook,
+    Symmetries,
+    TTTSymmetries,
+    C4Symmetries,
+    SOLVED,
+)
+from transposition_table import TranspositionTable
+
+
+# Every position at most plies moves into a game that isn't over, one of
+# each set of mirror images, in the order they're first reached
+def book_positions(start: Board, symmetries: Symmetries, plies: int) -> List[Board]:
+    positions: List[Board] = []
+    seen: Set[int] = set()
+    layer: List[Board] = [start]
+    for _ in range(plies + 1):
+        next_layer: List[Board] = []
+        for board in layer:
+            if board.is_win or board.is_draw:
+                continue
+            key: int = min(
+                variant.zobrist_key for variant, _ in symmetries.variants(board)
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append(board)
+            next_layer += [board.move(move) for move in board.legal_moves]
+        layer = next_layer
+    return positions
+
+
+# A book of the best move in each of positions, searched max_depth moves
+# deep. One search (and table) is shared by all of them, as the positions'
+# subtrees overlap a lot
+def build_book(
+    positions: List[Board], symmetries: Symmetries, max_depth: int, depth: int
+) -> OpeningBook:
+    book: OpeningBook = OpeningBook(symmetries)
+    search: IterativeDeepening = IterativeDeepening(TranspositionTable())
+    for board in positions:
+        result: SearchResult = search.search(board, float("inf"), max_depth)
+        book.add(board, result.move, result.score, depth)
+    return book
+
+
+# Tic-tac-toe is solved outright: every position that can come up, searched
+# to the end of the game
+def solve_tictactoe() -> OpeningBook:
+    symmetries: Symmetries = TTTSymmetries()
+    return build_book(book_positions(TTTBoard(), symmetries, 9), symmetries, 9, SOLVED)
+
+
+# Connect Four positions up to plies moves in, each searched max_depth deep
+def connectfour_book(plies: int = 4, max_depth: int = 8) -> OpeningBook:
+    symmetries: Symmetries = C4Symmetries()
+    positions: List[Board] = book_positions(BitboardC4Board(), symmetries, plies - 1)
+    return build_book(positions, symmetries, max_depth, max_depth)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an opening book")
+    parser.add_argument("game", choices=["tictactoe", "connectfour"])
+    parser.add_argument("output", help="the book file to write")
+    parser.add_argument(
+        "--plies", type=int, default=4, help="Connect Four: moves into the game, default 4"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=8, help="Connect Four: search depth, default 8"
+    )
+    args = parser.parse_args()
+
+    book: OpeningBook = (
+        solve_tictactoe()
+        if args.game == "tictactoe"
+        else connectfour_book(args.plies, args.depth)
+    )
+    book.save(args.output)
+    print(f"{len(book)} positions written to {args.output}")
@@ -3,7 +3,7 @@ from typing import List, Optional, Tuple
 from enum import Enum
 
 # from board.py
-from board import Piece, Board, Move
+from board import Piece, Board, Move, zobrist_numbers
 
 
 class C4Piece(Piece, Enum):
@@ -51,8 +51,8 @@ def generate_segments(
             segments.append(segment)
 
     # generate the bottom left to top right diagonal segments
-    for c in range(num_rows - segment_length + 1):
-        for r in range(num_columns - segment_length + 1):
+    for c in range(num_columns - segment_length + 1):
+        for r in range(num_rows - segment_length + 1):
             segment = []
             for t in range(segment_length):
                 segment.append((c + t, r + t))
@@ -78,6 +78,15 @@ class C4Board(Board):
         NUM_COLUMNS, NUM_ROWS, SEGMENT_LENGTH
     )
 
+    # Zobrist numbers: one for each (column, row, colour), then red to move
+    ZOBRIST: List[int] = zobrist_numbers(NUM_COLUMNS * NUM_ROWS * 2 + 1, seed=4)
+
+    @staticmethod
+    def _square_key(column: int, row: int, piece: C4Piece) -> int:
+        return C4Board.ZOBRIST[
+            (column * C4Board.NUM_ROWS + row) * 2 + (1 if piece == C4Piece.R else 0)
+        ]
+
     class Column:
         def __init__(self) -> None:
             self._container: List[C4Piece] = []
@@ -113,6 +122,7 @@ class C4Board(Board):
         self,
         position: Optional[List[C4Board.Column]] = None,
         turn: C4Piece = C4Piece.B,
+        zobrist_key: Optional[int] = None,
     ) -> None:
         # Create NUM_COLUMNS of C4Board.Columns in a list to initialise
         if position is None:
@@ -122,19 +132,38 @@ class C4Board(Board):
         else:
             self.position = position
         self._turn: C4Piece = turn
+        # move() passes the key along, only a new board works it out
+        if zobrist_key is None:
+            zobrist_key = C4Board.ZOBRIST[-1] if turn == C4Piece.R else 0
+            for c, column in enumerate(self.position):
+                for r, piece in enumerate(column._container):
+                    zobrist_key ^= C4Board._square_key(c, r, piece)
+        self._zobrist_key: int = zobrist_key
 
     @property
     def turn(self) -> Piece:
         return self._turn
 
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
     def move(self, location: Move) -> Board:
         # copy the current C4Board
         temp_position: List[C4Board.Column] = self.position.copy()
         for c in range(C4Board.NUM_COLUMNS):
             temp_position[c] = self.position[c].copy()
         # "push" the new turn Piece to the selected location
+        row: int = len(temp_position[location]._container)
         temp_position[location].push(self._turn)
-        return C4Board(temp_position, self._turn.opposite)
+        # add the piece and switch the side to move
+        return C4Board(
+            temp_position,
+            self._turn.opposite,
+            self._zobrist_key
+            ^ C4Board._square_key(location, row, self._turn)
+            ^ C4Board.ZOBRIST[-1],
+        )
 
     @property
     def legal_moves(self) -> List[Move]:
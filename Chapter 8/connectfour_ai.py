@@ -1,8 +1,27 @@
-from minimax import find_best_move
-from connectfour import C4Board
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+import os
+from iterative_deepening import IterativeDeepening, SearchResult
+from parallel_search import find_best_move_parallel_timed
+from connectfour_bitboard import BitboardC4Board
 from board import Move, Board
+from transposition_table import TranspositionTable
+from opening_book import OpeningBook
 
-board: Board = C4Board()
+# shared by every search of the game, so later moves reuse earlier work
+table: TranspositionTable = TranspositionTable()
+# the first few moves, searched in advance by book_builder.py
+BOOK_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "connectfour.book")
+book: Optional[OpeningBook] = (
+    OpeningBook.load(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+)
+# iterative deepening keeps every move within this many seconds
+TIME_PER_MOVE: float = 1.0
+search: IterativeDeepening = IterativeDeepening(table, book)
+# with enough cores, search the seven columns side by side instead
+pool: Optional[ProcessPoolExecutor] = None
+
+board: Board = BitboardC4Board()
 
 
 def get_player_move() -> Move:
@@ -17,6 +36,8 @@ def get_player_move() -> Move:
 
 
 if __name__ == "__main__":
+    if (os.cpu_count() or 1) >= len(board.legal_moves):
+        pool = ProcessPoolExecutor(len(board.legal_moves))
     # main game loop
     while True:
         # human player plays first
@@ -30,8 +51,18 @@ if __name__ == "__main__":
             print("Draw")
             break
         # run the best move function
-        computer_move: Move = find_best_move(board, 3)
-        print(f"Computer move is {computer_move}")
+        result: SearchResult
+        if pool is None:
+            result = search.search(board, TIME_PER_MOVE)
+        else:
+            result = find_best_move_parallel_timed(
+                board, TIME_PER_MOVE, executor=pool, book=book
+            )
+        computer_move: Move = result.move
+        print(
+            f"Computer move is {computer_move} "
+            f"(depth {result.depth}, {result.nodes} positions in {result.seconds:.2f}s)"
+        )
         board = board.move(computer_move)
         print(board)
         if board.is_win:
@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import Callable, List, Optional, Tuple
+from board import Piece, Board, Move
+from connectfour import C4Piece, C4Board
+
+# Bit layout: column c, row r (0 at the bottom) is bit c * HEIGHT + r. Each
+# column has one spare bit on top, so shifting a row of four out of the
+# board can't wrap into the next column
+HEIGHT: int = C4Board.NUM_ROWS + 1
+BOTTOM_BITS: List[int] = [1 << (c * HEIGHT) for c in range(C4Board.NUM_COLUMNS)]
+TOP_BITS: List[int] = [
+    1 << (c * HEIGHT + C4Board.NUM_ROWS - 1) for c in range(C4Board.NUM_COLUMNS)
+]
+COLUMN_MASKS: List[int] = [
+    ((1 << C4Board.NUM_ROWS) - 1) << (c * HEIGHT) for c in range(C4Board.NUM_COLUMNS)
+]
+FULL: int = sum(COLUMN_MASKS)
+# vertical, horizontal, and the two diagonals
+DIRECTIONS: Tuple[int, ...] = (1, HEIGHT, HEIGHT + 1, HEIGHT - 1)
+
+# int.bit_count() is new in Python 3.10
+_popcount: Callable[[int], int] = getattr(
+    int, "bit_count", lambda x: bin(x).count("1")
+)
+
+
+def _bit(column: int, row: int) -> int:
+    return 1 << (column * HEIGHT + row)
+
+
+# C4Board.SEGEMENTS as bit masks, and for every cell the masks of the
+# segments through it
+SEGMENT_MASKS: List[int] = [
+    sum(_bit(c, r) for c, r in segment) for segment in C4Board.SEGEMENTS
+]
+CELL_SEGMENTS: List[List[int]] = [
+    [mask for mask in SEGMENT_MASKS if mask & (1 << index)]
+    for index in range(C4Board.NUM_COLUMNS * HEIGHT)
+]
+
+
+# The score of a segment holding black_count black and red_count red pieces,
+# from black's point of view; the numbers of C4Board._evaluate_segment()
+def _segment_score(black_count: int, red_count: int) -> int:
+    if red_count > 0 and black_count > 0:
+        return 0  # mixed segments are neutral
+    count: int = max(red_count, black_count)
+    score: int = {2: 1, 3: 100, 4: 1000000}.get(count, 0)
+    return score if black_count >= red_count else -score
+
+
+SEGMENT_SCORES: List[List[int]] = [
+    [_segment_score(b, r) for r in range(C4Board.SEGMENT_LENGTH + 1)]
+    for b in range(C4Board.SEGMENT_LENGTH + 1)
+]
+
+
+# True if the pieces in bits include four in a row in any direction
+def has_four(bits: int) -> bool:
+    for shift in DIRECTIONS:
+        pairs: int = bits & (bits >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+# black's score for the whole position, like C4Board.evaluate(C4Piece.B)
+def _full_score(black: int, red: int) -> int:
+    return sum(
+        SEGMENT_SCORES[_popcount(black & mask)][_popcount(red & mask)]
+        for mask in SEGMENT_MASKS
+    )
+
+
+# The same game as C4Board, scored the same way, but the position is two
+# ints with one bit per cell, one for each colour. A move is a few integer
+# operations instead of copying seven Columns, a win is found with shifts
+# and ANDs instead of scanning all 69 segments, and the evaluation and
+# Zobrist key are updated by each move from only what changed, so
+# evaluate() and is_win are simple lookups. Zobrist keys are the same as
+# C4Board's for the same position, so transposition tables work with both
+class BitboardC4Board(Board):
+    __slots__ = ("_black", "_red", "_turn", "_score", "_win", "_zobrist_key")
+
+    def __init__(
+        self,
+        black: int = 0,
+        red: int = 0,
+        turn: C4Piece = C4Piece.B,
+        _state: Optional[Tuple[int, bool, int]] = None,
+    ) -> None:
+        self._black: int = black
+        self._red: int = red
+        self._turn: C4Piece = turn
+        # move() hands over the score, win and key it has worked out;
+        # anything else starts from scratch
+        if _state is None:
+            key: int = C4Board.ZOBRIST[-1] if turn == C4Piece.R else 0
+            for index in range(C4Board.NUM_COLUMNS * HEIGHT):
+                column, row = divmod(index, HEIGHT)
+                if black & (1 << index):
+                    key ^= C4Board._square_key(column, row, C4Piece.B)
+                elif red & (1 << index):
+                    key ^= C4Board._square_key(column, row, C4Piece.R)
+            _state = (_full_score(black, red), has_four(black) or has_four(red), key)
+        self._score: int
+        self._win: bool
+        self._zobrist_key: int
+        self._score, self._win, self._zobrist_key = _state
+
+    # the same position as a C4Board
+    @classmethod
+    def from_board(cls, board: C4Board) -> BitboardC4Board:
+        black: int = 0
+        red: int = 0
+        for c, column in enumerate(board.position):
+            for r in range(C4Board.NUM_ROWS):
+                if column[r] == C4Piece.B:
+                    black |= _bit(c, r)
+                elif column[r] == C4Piece.R:
+                    red |= _bit(c, r)
+        return cls(black, red, board._turn)
+
+    def to_board(self) -> C4Board:
+        board: C4Board = C4Board(turn=self._turn)
+        for c, column in enumerate(board.position):
+            for r in range(C4Board.NUM_ROWS):
+                if self._black & _bit(c, r):
+                    column.push(C4Piece.B)
+                elif self._red & _bit(c, r):
+                    column.push(C4Piece.R)
+        return board
+
+    @property
+    def turn(self) -> Piece:
+        return self._turn
+
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
+    def move(self, location: Move) -> Board:
+        occupied: int = self._black | self._red
+        if occupied & TOP_BITS[location]:
+            raise OverflowError("Trying to push piece to full column")
+        # adding the column's bottom bit carries up to its first empty cell
+        piece: int = (occupied + BOTTOM_BITS[location]) & COLUMN_MASKS[location]
+        black: int = self._black
+        red: int = self._red
+        # only the segments through the new piece change score
+        score: int = self._score
+        if self._turn == C4Piece.B:
+            for mask in CELL_SEGMENTS[piece.bit_length() - 1]:
+                b: int = _popcount(black & mask)
+                r: int = _popcount(red & mask)
+                score += SEGMENT_SCORES[b + 1][r] - SEGMENT_SCORES[b][r]
+            black |= piece
+            win: bool = self._win or has_four(black)
+        else:
+            for mask in CELL_SEGMENTS[piece.bit_length() - 1]:
+                b = _popcount(black & mask)
+                r = _popcount(red & mask)
+                score += SEGMENT_SCORES[b][r + 1] - SEGMENT_SCORES[b][r]
+            red |= piece
+            win = self._win or has_four(red)
+        row: int = piece.bit_length() - 1 - location * HEIGHT
+        key: int = (
+            self._zobrist_key
+            ^ C4Board._square_key(location, row, self._turn)
+            ^ C4Board.ZOBRIST[-1]
+        )
+        return BitboardC4Board(black, red, self._turn.opposite, (score, win, key))
+
+    @property
+    def legal_moves(self) -> List[Move]:
+        # you can add to a column as long as its top cell is empty
+        occupied: int = self._black | self._red
+        return [
+            Move(c) for c in range(C4Board.NUM_COLUMNS) if not occupied & TOP_BITS[c]
+        ]
+
+    @property
+    def is_win(self) -> bool:
+        return self._win
+
+    @property
+    def is_draw(self) -> bool:
+        return not self._win and (self._black | self._red) == FULL
+
+    def evaluate(self, player: Piece) -> float:
+        return self._score if player == C4Piece.B else -self._score
+
+    def __repr__(self) -> str:
+        display: str = ""
+        for r in reversed(range(C4Board.NUM_ROWS)):
+            display += "|"
+            for c in range(C4Board.NUM_COLUMNS):
+                if self._black & _bit(c, r):
+                    display += f"{C4Piece.B}|"
+                elif self._red & _bit(c, r):
+                    display += f"{C4Piece.R}|"
+                else:
+                    display += f"{C4Piece.E}|"
+            display += "\n"
+        return display
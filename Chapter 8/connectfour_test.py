@@ -0,0 +1,79 @@
+import unittest
+from random import Random
+
+# import our scripts
+from minimax import find_best_move
+from connectfour import C4Piece, C4Board
+from connectfour_bitboard import BitboardC4Board
+from board import Move, Board
+from iterative_deepening import find_best_move_timed, SearchResult
+from parallel_search import find_best_move_parallel
+from concurrent.futures import ProcessPoolExecutor
+from board_benchmark import perft, KNOWN_PERFT
+
+
+class C4BitboardTestCase(unittest.TestCase):
+    def test_random_games_match(self):
+        # both boards must agree on everything along many random games
+        generator: Random = Random(42)
+        for _ in range(50):
+            board: Board = C4Board()
+            bitboard: Board = BitboardC4Board()
+            while True:
+                self.assertEqual(board.legal_moves, bitboard.legal_moves)
+                self.assertEqual(board.is_win, bitboard.is_win)
+                self.assertEqual(board.is_draw, bitboard.is_draw)
+                self.assertEqual(board.zobrist_key, bitboard.zobrist_key)
+                for piece in (C4Piece.B, C4Piece.R):
+                    self.assertEqual(board.evaluate(piece), bitboard.evaluate(piece))
+                if board.is_win or board.is_draw:
+                    break
+                move: Move = generator.choice(board.legal_moves)
+                board = board.move(move)
+                bitboard = bitboard.move(move)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(BitboardC4Board(), "__dict__"))
+
+    def test_diagonal_win(self):
+        # black's rising diagonal from column 3 to column 6
+        board: Board = C4Board()
+        for move in [3, 4, 4, 5, 5, 6, 5, 6, 6, 0, 6]:
+            board = board.move(Move(move))
+        self.assertTrue(board.is_win)
+        self.assertTrue(BitboardC4Board.from_board(board).is_win)
+
+    def test_same_best_move(self):
+        board: Board = C4Board()
+        for move in [3, 3, 2, 4]:
+            board = board.move(Move(move))
+        bitboard: Board = BitboardC4Board.from_board(board)
+        self.assertEqual(find_best_move(board, 3), find_best_move(bitboard, 3))
+
+    def test_time_limit(self):
+        board: Board = BitboardC4Board()
+        result: SearchResult = find_best_move_timed(board, 0.2)
+        self.assertIn(result.move, board.legal_moves)
+        self.assertGreaterEqual(result.depth, 1)
+        # the clock is checked every few hundred positions
+        self.assertLess(result.seconds, 0.5)
+
+    def test_parallel_same_move(self):
+        # root splitting picks exactly what the sequential search picks
+        board: Board = BitboardC4Board()
+        for move in [3, 3, 2, 4, 4]:
+            board = board.move(Move(move))
+        with ProcessPoolExecutor(2) as executor:
+            self.assertEqual(
+                find_best_move_parallel(board, 3, executor), find_best_move(board, 3)
+            )
+
+    def test_perft(self):
+        for depth in range(6):
+            self.assertEqual(perft(BitboardC4Board(), depth), KNOWN_PERFT["connectfour"][depth])
+        for depth in range(4):
+            self.assertEqual(perft(C4Board(), depth), KNOWN_PERFT["connectfour"][depth])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,283 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from time import perf_counter
+from board import Piece, Board, Move
+from transposition_table import (
+    TranspositionTable,
+    TableEntry,
+    Bound,
+    table_score,
+    store_score,
+)
+
+# only for annotations: opening_book imports every game, which the
+# searches themselves don't need
+if TYPE_CHECKING:
+    from opening_book import OpeningBook, BookEntry
+
+# won, lost and drawn positions are scored the same however deep anyone
+# searches, so the table keeps them as if searched infinitely deep
+_TERMINAL_DEPTH: int = 1 << 30
+
+
+# What a timed search found: the move to play, its score for the player to
+# move, the deepest search that finished (in moves from the position),
+# positions visited over all iterations, and time taken
+@dataclass
+class SearchResult:
+    move: Move
+    score: float
+    depth: int
+    nodes: int
+    seconds: float
+    # the moves both sides are expected to play, starting with move
+    principal_variation: List[Move] = field(default_factory=list)
+    # the score found by each finished depth, scores[0] for depth 1
+    scores: List[float] = field(default_factory=list)
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+# board's book move as a search result, if the book has board
+def book_result(
+    book: Optional[OpeningBook], board: Board, start: float
+) -> Optional[SearchResult]:
+    if book is None:
+        return None
+    entry: Optional[BookEntry] = book.lookup(board)
+    if entry is None:
+        return None
+    return SearchResult(
+        entry.move, entry.value, entry.depth, 0, perf_counter() - start, [entry.move]
+    )
+
+
+# Iterative deepening: search 1 move deep, then 2, then 3 and so on until the
+# time runs out, and play the best move of the deepest search that finished.
+# Each search is alpha-beta (like alphabeta() in minimax.py) and is faster
+# than it would be alone because the earlier ones tell it which moves to try
+# first, and alpha-beta prunes most when the best move comes first:
+# - the principal variation, the line the previous search expects
+# - the transposition table's best move for the position
+# - killer moves, which caused a cutoff at the same depth in another line
+# - the history heuristic, how often and how deep a move caused cutoffs
+# An unfinished search is thrown away, so the time limit is kept to within
+# the time of a few hundred positions. Positions in the book aren't searched
+class IterativeDeepening:
+    def __init__(
+        self,
+        table: Optional[TranspositionTable] = None,
+        book: Optional[OpeningBook] = None,
+    ) -> None:
+        # without a table of its own, the search keeps a small one. Not
+        # "table or ...": a table with len() 0, like a new one, is falsy
+        self.table: TranspositionTable = (
+            table if table is not None else TranspositionTable(1 << 16)
+        )
+        self.book: Optional[OpeningBook] = book
+        self.nodes: int = 0
+        self._deadline: Optional[float] = None
+        self._previous_pv: List[Move] = []
+        self._pv: List[List[Move]] = []  # best line found from each ply
+        self._killers: List[List[Move]] = []  # up to two per ply
+        self._history: Dict[Tuple[Piece, Move], int] = {}
+
+    # the order to try board's moves in, at ply moves from the root
+    def _ordered_moves(
+        self, board: Board, ply: int, on_pv: bool, table_move: Optional[Move]
+    ) -> List[Move]:
+        legal: List[Move] = board.legal_moves
+        first: List[Move] = []
+        if on_pv and ply < len(self._previous_pv):
+            first.append(self._previous_pv[ply])
+        if table_move is not None:
+            first.append(table_move)
+        first += self._killers[ply]
+        ordered: List[Move] = []
+        for move in first:
+            if move in legal and move not in ordered:
+                ordered.append(move)
+        turn: Piece = board.turn
+        # sorted() is stable, so moves without history stay in legal order
+        ordered += sorted(
+            (move for move in legal if move not in ordered),
+            key=lambda move: -self._history.get((turn, move), 0),
+        )
+        return ordered
+
+    # remember a move that made the opponent's previous move a mistake
+    def _record_cutoff(self, board: Board, move: Move, ply: int, depth: int) -> None:
+        killers: List[Move] = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        key: Tuple[Piece, Move] = (board.turn, move)
+        self._history[key] = self._history.get(key, 0) + depth * depth
+
+    # alphabeta() with node counting, the time limit and move ordering
+    def _search(
+        self,
+        board: Board,
+        maximizing: bool,
+        original_player: Piece,
+        depth: int,
+        ply: int,
+        alpha: float,
+        beta: float,
+        on_pv: bool,
+    ) -> float:
+        self.nodes += 1
+        # checking the clock every 256 positions is often enough
+        if (
+            self._deadline is not None
+            and self.nodes & 255 == 0
+            and perf_counter() > self._deadline
+        ):
+            raise _OutOfTime
+        self._pv[ply] = []
+        original_alpha: float = alpha
+        original_beta: float = beta
+        table_move: Optional[Move] = None
+        entry: Optional[TableEntry] = self.table.lookup(board.zobrist_key)
+        if entry is not None:
+            if entry.depth >= depth:
+                score, bound = table_score(entry, maximizing)
+                if bound == Bound.EXACT:
+                    return score
+                if bound == Bound.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+            table_move = entry.best_move
+
+        if board.is_win or board.is_draw:
+            evaluation: float = board.evaluate(original_player)
+            store_score(
+                self.table, board, maximizing, _TERMINAL_DEPTH, evaluation, Bound.EXACT
+            )
+            return evaluation
+        if depth == 0:
+            evaluation = board.evaluate(original_player)
+            store_score(self.table, board, maximizing, 0, evaluation, Bound.EXACT)
+            return evaluation
+
+        moves: List[Move] = self._ordered_moves(board, ply, on_pv, table_move)
+        best_move: Move = moves[0]
+        for move in moves:
+            result: float = self._search(
+                board.move(move),
+                not maximizing,
+                original_player,
+                depth - 1,
+                ply + 1,
+                alpha,
+                beta,
+                on_pv and ply < len(self._previous_pv) and move == self._previous_pv[ply],
+            )
+            improved: bool = result > alpha if maximizing else result < beta
+            if improved:
+                if maximizing:
+                    alpha = result
+                else:
+                    beta = result
+                best_move = move
+                self._pv[ply] = [move] + self._pv[ply + 1]
+            if beta <= alpha:
+                self._record_cutoff(board, move, ply, depth)
+                break
+        value: float = alpha if maximizing else beta
+
+        bound = Bound.EXACT
+        if value <= original_alpha:
+            bound = Bound.UPPER
+        elif value >= original_beta:
+            bound = Bound.LOWER
+        store_score(self.table, board, maximizing, depth, value, bound, best_move)
+        return value
+
+    # one complete search depth moves deep; the root is like find_best_move()
+    def _search_root(self, board: Board, depth: int) -> Tuple[Move, float, List[Move]]:
+        self._pv = [[] for _ in range(depth + 2)]
+        self._killers += [[] for _ in range(depth + 2 - len(self._killers))]
+        moves: List[Move] = self._ordered_moves(board, 0, True, None)
+        best_eval: float = float("-inf")
+        best_move: Move = moves[0]
+        principal_variation: List[Move] = [best_move]
+        for move in moves:
+            result: float = self._search(
+                board.move(move),
+                False,
+                board.turn,
+                depth - 1,
+                1,
+                best_eval,
+                float("inf"),
+                len(self._previous_pv) > 0 and move == self._previous_pv[0],
+            )
+            if result > best_eval:
+                best_eval = result
+                best_move = move
+                principal_variation = [move] + self._pv[1]
+        return best_move, best_eval, principal_variation
+
+    # Search deeper and deeper until time_limit seconds have passed or
+    # max_depth is reached. A search 1 move deep always finishes, so there is
+    # always a move. A new depth isn't started once half the time is gone,
+    # as it would take longer than all the ones before it
+    def search(
+        self, board: Board, time_limit: float, max_depth: int = 64
+    ) -> SearchResult:
+        if len(board.legal_moves) == 0:
+            raise ValueError("No legal moves, the game is over")
+        start: float = perf_counter()
+        self.nodes = 0
+        from_book: Optional[SearchResult] = book_result(self.book, board, start)
+        if from_book is not None:
+            return from_book
+        self.table.new_search()
+        self._previous_pv = []
+        self._killers = []
+        # older history is less relevant, but still better than nothing
+        self._history = {key: count // 2 for key, count in self._history.items()}
+        self._deadline = None  # depth 1 runs to the end
+        result: Optional[SearchResult] = None
+        scores: List[float] = []
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score, principal_variation = self._search_root(board, depth)
+            except _OutOfTime:
+                break
+            scores.append(score)
+            result = SearchResult(
+                move,
+                score,
+                depth,
+                self.nodes,
+                perf_counter() - start,
+                principal_variation,
+                list(scores),
+            )
+            self._previous_pv = principal_variation
+            self._deadline = start + time_limit
+            if perf_counter() - start > time_limit / 2:
+                break
+        assert result is not None
+        result.nodes = self.nodes
+        result.seconds = perf_counter() - start
+        return result
+
+
+# Find the best move that can be found in time_limit seconds
+def find_best_move_timed(
+    board: Board,
+    time_limit: float,
+    max_depth: int = 64,
+    table: Optional[TranspositionTable] = None,
+    book: Optional[OpeningBook] = None,
+) -> SearchResult:
+    return IterativeDeepening(table, book).search(board, time_limit, max_depth)
@@ -1,13 +1,47 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional
 from board import Piece, Board, Move
+from transposition_table import (
+    TranspositionTable,
+    TableEntry,
+    Bound,
+    table_score,
+    store_score,
+)
+
+# only for annotations: opening_book imports every game, which the
+# searches themselves don't need
+if TYPE_CHECKING:
+    from opening_book import OpeningBook, BookEntry
+
 
 # find the best possible outcome for original player
+# With a table, positions reached again through a different order of moves
+# are looked up instead of searched again
 def minimax(
-    board: Board, maximizing: bool, original_player: Piece, max_depth: int = 8
+    board: Board,
+    maximizing: bool,
+    original_player: Piece,
+    max_depth: int = 8,
+    table: Optional[TranspositionTable] = None,
 ) -> float:
+    if table is not None:
+        entry: Optional[TableEntry] = table.lookup(board.zobrist_key)
+        # only exact scores will do: a table shared with alphabeta() also
+        # holds bounds. A deeper search is as good
+        if (
+            entry is not None
+            and entry.depth >= max_depth
+            and entry.bound == Bound.EXACT
+        ):
+            return table_score(entry, maximizing)[0]
+
     # Base case - terminal position or maximum depth reached
     if board.is_win or board.is_draw or max_depth == 0:
-        return board.evaluate(original_player)
+        evaluation: float = board.evaluate(original_player)
+        if table is not None:
+            store_score(table, board, maximizing, max_depth, evaluation, Bound.EXACT)
+        return evaluation
 
     # recursive case - maximise your gains or minimise the opponet's gains
     if maximizing:
@@ -18,25 +52,45 @@ def minimax(
         # maximising changed to False because of switching turn
         for move in board.legal_moves:
             result: float = minimax(
-                board.move(move), False, original_player, max_depth - 1
+                board.move(move), False, original_player, max_depth - 1, table
             )
             # compare if the result is better than the current
             # value of best_eval, if so update best_eval
             best_eval = max(result, best_eval)
+        if table is not None:
+            store_score(table, board, maximizing, max_depth, best_eval, Bound.EXACT)
         return best_eval
     else:  # minimising
         worst_eval: float = float("inf")  # arbitarily high starting point, infinity
         for move in board.legal_moves:
-            result = minimax(board.move(move), True, original_player, max_depth - 1)
+            result = minimax(
+                board.move(move), True, original_player, max_depth - 1, table
+            )
             # compare if the result is lower than the current
             # value of worst_eval, if so update worst_eval
             worst_eval = min(result, worst_eval)
+        if table is not None:
+            store_score(table, board, maximizing, max_depth, worst_eval, Bound.EXACT)
         return worst_eval
 
 
 # Find the best possible move in the current position
 # Looking up to max_depth ahead
-def find_best_move(board: Board, max_depth: int = 8) -> Move:
+# Pass the same table to every call of a game to reuse earlier searches
+# A position in the book, searched at least as deep, is played without a search
+def find_best_move(
+    board: Board,
+    max_depth: int = 8,
+    table: Optional[TranspositionTable] = None,
+    book: Optional[OpeningBook] = None,
+) -> Move:
+    if book is not None:
+        book_entry: Optional[BookEntry] = book.lookup(board)
+        # the root move and max_depth below it
+        if book_entry is not None and book_entry.depth > max_depth:
+            return book_entry.move
+    if table is not None:
+        table.new_search()
     # initialise values to negative numbers
     best_eval: float = float("-inf")
     best_move: Move = Move(-1)
@@ -44,7 +98,10 @@ def find_best_move(board: Board, max_depth: int = 8) -> Move:
     # but also the best_move
     for move in board.legal_moves:
         # result: float = minimax(board.move(move), False, board.turn, max_depth)
-        result: float = alphabeta(board.move(move), False, board.turn, max_depth)
+        # only moves better than best_eval matter, so alpha starts there
+        result: float = alphabeta(
+            board.move(move), False, board.turn, max_depth, best_eval, table=table
+        )
         if result > best_eval:
             best_eval = result
             best_move = move
@@ -58,30 +115,72 @@ def alphabeta(
     max_depth: int = 8,
     alpha: float = float("-inf"),
     beta: float = float("inf"),
+    table: Optional[TranspositionTable] = None,
 ) -> float:
+    # the window the result will be judged against when it is stored
+    original_alpha: float = alpha
+    original_beta: float = beta
+    moves: List[Move] = []
+    if table is not None:
+        entry: Optional[TableEntry] = table.lookup(board.zobrist_key)
+        if entry is not None:
+            if entry.depth >= max_depth:
+                score, bound = table_score(entry, maximizing)
+                if bound == Bound.EXACT:
+                    return score
+                # a bound narrows the window, maybe closing it
+                if bound == Bound.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+            # a too-shallow entry still knows the move to try first
+            if entry.best_move is not None:
+                moves.append(entry.best_move)
+
     # Base case - terminal position or maximum depth reached
     if board.is_win or board.is_draw or max_depth == 0:
-        return board.evaluate(original_player)
+        evaluation: float = board.evaluate(original_player)
+        if table is not None:
+            store_score(table, board, maximizing, max_depth, evaluation, Bound.EXACT)
+        return evaluation
 
+    moves += [move for move in board.legal_moves if move not in moves]
+    best_move: Move = moves[0]
     # Recursive case - maximising your gains or minimising the opponent's gains
     if maximizing:
-        for move in board.legal_moves:
+        for move in moves:
             result: float = alphabeta(
-                board.move(move), False, original_player, max_depth - 1, alpha, beta
+                board.move(move), False, original_player, max_depth - 1, alpha, beta, table
             )
             # update alpha if result is larger
-            alpha = max(result, alpha)
+            if result > alpha:
+                alpha = result
+                best_move = move
             # break out of recursion of beta is found to be smaller or equal
             # to alpha - ie. kill this branch
             if beta <= alpha:
                 break
-        return alpha
+        value: float = alpha
     else:  # minimising
-        for move in board.legal_moves:
+        for move in moves:
             result = alphabeta(
-                board.move(move), True, original_player, max_depth - 1, beta
+                board.move(move), True, original_player, max_depth - 1, alpha, beta, table
             )
-            beta = min(result, beta)
+            if result < beta:
+                beta = result
+                best_move = move
             if beta <= alpha:
                 break
-        return beta
+        value = beta
+
+    if table is not None:
+        # the result is only a bound if it fell outside the original window
+        bound: Bound = Bound.EXACT
+        if value <= original_alpha:
+            bound = Bound.UPPER
+        elif value >= original_beta:
+            bound = Bound.LOWER
+        store_score(table, board, maximizing, max_depth, value, bound, best_move)
+    return value
@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from array import array
+import os
+import struct
+import sys
+from board import Board, Move
+from tictactoe import TTTBoard, TTTPiece
+from connectfour import C4Board
+from connectfour_bitboard import BitboardC4Board, HEIGHT
+
+# book depth of a position searched to the end of every game
+SOLVED: int = 255
+
+
+# The ways a game's board can be turned or flipped without changing the
+# game. Positions that are the same up to symmetry share one book entry
+class Symmetries(ABC):
+    name: str
+
+    # every transformed version of board (including board itself), each
+    # with where every move of board ends up on it: moves[m] is the square
+    # (or column) that move m becomes
+    @abstractmethod
+    def variants(self, board: Board) -> List[Tuple[Board, List[Move]]]:
+        ...
+
+
+# the 8 symmetries of a square: 4 rotations, each also mirrored
+def _square_symmetries() -> List[List[Move]]:
+    permutations: List[List[Move]] = []
+    for mirrored in (False, True):
+        for rotations in range(4):
+            permutation: List[Move] = []
+            for square in range(9):
+                row, column = divmod(square, 3)
+                if mirrored:
+                    column = 2 - column
+                for _ in range(rotations):  # a quarter turn clockwise
+                    row, column = column, 2 - row
+                permutation.append(Move(row * 3 + column))
+            permutations.append(permutation)
+    return permutations
+
+
+class TTTSymmetries(Symmetries):
+    name: str = "tictactoe"
+    PERMUTATIONS: List[List[Move]] = _square_symmetries()
+
+    def variants(self, board: Board) -> List[Tuple[Board, List[Move]]]:
+        assert isinstance(board, TTTBoard)
+        result: List[Tuple[Board, List[Move]]] = []
+        for permutation in TTTSymmetries.PERMUTATIONS:
+            position: List[TTTPiece] = [TTTPiece.E] * 9
+            for square, piece in enumerate(board.position):
+                position[permutation[square]] = piece
+            result.append((TTTBoard(position, board._turn), permutation))
+        return result
+
+
+# Connect Four only has its left-right mirror image
+class C4Symmetries(Symmetries):
+    name: str = "connectfour"
+
+    def variants(self, board: Board) -> List[Tuple[Board, List[Move]]]:
+        identity: List[Move] = [Move(c) for c in range(C4Board.NUM_COLUMNS)]
+        mirror: List[Move] = identity[::-1]
+        mirrored: Board
+        if isinstance(board, BitboardC4Board):
+            column_bits: int = (1 << HEIGHT) - 1
+            flipped: List[int] = [0, 0]
+            for colour, bits in enumerate((board._black, board._red)):
+                for c in range(C4Board.NUM_COLUMNS):
+                    column: int = (bits >> (c * HEIGHT)) & column_bits
+                    flipped[colour] |= column << ((C4Board.NUM_COLUMNS - 1 - c) * HEIGHT)
+            mirrored = BitboardC4Board(flipped[0], flipped[1], board._turn)
+        else:
+            assert isinstance(board, C4Board)
+            mirrored = C4Board(
+                [column.copy() for column in reversed(board.position)], board._turn
+            )
+        return [(board, identity), (mirrored, mirror)]
+
+
+SYMMETRIES: Dict[str, Symmetries] = {
+    symmetries.name: symmetries for symmetries in (TTTSymmetries(), C4Symmetries())
+}
+
+
+# What the book knows about a position: the move to play, its score for the
+# player to move, and how many moves deep it was searched (SOLVED if to the
+# end of the game)
+@dataclass
+class BookEntry:
+    move: Move
+    value: float
+    depth: int
+
+
+# Best moves for positions worked out in advance (see book_builder.py), so
+# a game can skip searching them. Entries are keyed by the Zobrist key of a
+# canonical version of the position, the variant with the smallest key, so
+# a position and its mirror images take up one entry; moves are stored as
+# they are on the canonical board and turned back on lookup.
+# File format, little-endian: magic b"BOOK", version (uint16), entry count
+# (uint32), the game's name (uint8 length and ASCII), then the keys (uint64
+# each, sorted), the values (float64 each), the moves (uint8 each) and the
+# depths (uint8 each), so a file loads with four frombytes() calls
+class OpeningBook:
+    MAGIC: bytes = b"BOOK"
+    VERSION: int = 1
+    _HEADER = struct.Struct("<4sHIB")
+
+    def __init__(self, symmetries: Symmetries) -> None:
+        self.symmetries: Symmetries = symmetries
+        self._entries: Dict[int, BookEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _canonical(self, board: Board) -> Tuple[Board, List[Move]]:
+        return min(
+            self.symmetries.variants(board), key=lambda variant: variant[0].zobrist_key
+        )
+
+    def __contains__(self, board: Board) -> bool:
+        return self._canonical(board)[0].zobrist_key in self._entries
+
+    # move is a move on board, whichever way round board is
+    def add(self, board: Board, move: Move, value: float, depth: int) -> None:
+        canonical, moves = self._canonical(board)
+        self._entries[canonical.zobrist_key] = BookEntry(moves[move], value, depth)
+
+    # the entry for board, with its move turned to match board
+    def lookup(self, board: Board) -> Optional[BookEntry]:
+        canonical, moves = self._canonical(board)
+        entry: Optional[BookEntry] = self._entries.get(canonical.zobrist_key)
+        if entry is None:
+            return None
+        return BookEntry(Move(moves.index(entry.move)), entry.value, entry.depth)
+
+    def save(self, path: str) -> None:
+        keys: array = array("Q", sorted(self._entries))
+        values: array = array("d", [self._entries[key].value for key in keys])
+        moves: bytes = bytes(self._entries[key].move for key in keys)
+        depths: bytes = bytes(self._entries[key].depth for key in keys)
+        if sys.byteorder == "big":
+            keys.byteswap()
+            values.byteswap()
+        name: bytes = self.symmetries.name.encode("ascii")
+        # write to a temporary file first so a crash never leaves half a book
+        temporary: str = path + ".tmp"
+        with open(temporary, "wb") as book_file:
+            book_file.write(
+                OpeningBook._HEADER.pack(
+                    OpeningBook.MAGIC, OpeningBook.VERSION, len(keys), len(name)
+                )
+                + name
+            )
+            for block in (keys.tobytes(), values.tobytes(), moves, depths):
+                book_file.write(block)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> OpeningBook:
+        with open(path, "rb") as book_file:
+            data: bytes = book_file.read()
+        if len(data) < cls._HEADER.size:
+            raise ValueError(f"{path} is too short to be an opening book")
+        magic, version, count, name_length = cls._HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        if version != cls.VERSION:
+            raise ValueError(f"{path} has unsupported book version {version}")
+        offset: int = cls._HEADER.size
+        name: str = data[offset : offset + name_length].decode("ascii")
+        if name not in SYMMETRIES:
+            raise ValueError(f"{path} is a book for unknown game {name}")
+        offset += name_length
+        if len(data) != offset + 18 * count:
+            raise ValueError(f"{path} is truncated")
+        keys: array = array("Q")
+        keys.frombytes(data[offset : offset + 8 * count])
+        offset += 8 * count
+        values: array = array("d")
+        values.frombytes(data[offset : offset + 8 * count])
+        offset += 8 * count
+        moves: bytes = data[offset : offset + count]
+        depths: bytes = data[offset + count : offset + 2 * count]
+        if sys.byteorder == "big":
+            keys.byteswap()
+            values.byteswap()
+        book: OpeningBook = cls(SYMMETRIES[name])
+        book._entries = {
+            key: BookEntry(Move(move), value, depth)
+            for key, value, move, depth in zip(keys, values, moves, depths)
+        }
+        return book
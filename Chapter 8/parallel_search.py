@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from time import perf_counter
+from board import Board, Move
+from minimax import alphabeta
+from iterative_deepening import IterativeDeepening, SearchResult, book_result
+
+# only for annotations: opening_book imports every game, which the
+# searches themselves don't need
+if TYPE_CHECKING:
+    from opening_book import OpeningBook
+
+# Root splitting: every move from the root position is searched in its own
+# process, and the scores are compared at the end. The searches can't share
+# alpha with each other, so each one gets the full window and prunes less
+# than the sequential find_best_move() does, but they run side by side.
+# Full-window scores are exact, so the chosen move doesn't depend on which
+# search finishes first: it is the first legal move with the highest score,
+# the same move find_best_move() picks.
+# Lazy SMP (threads searching the same position around one shared table)
+# doesn't fit here: threads can't run Python in parallel, and processes
+# can't share a TranspositionTable, so each process keeps its own
+
+
+# score of one root move for the player to move, like a find_best_move()
+# iteration; runs in a worker process
+def _score_move(board: Board, move: Move, max_depth: int) -> float:
+    return alphabeta(board.move(move), False, board.turn, max_depth)
+
+
+# the highest scoring move, the first one in legal move order if several tie
+def _best(moves: List[Move], scores: List[float]) -> Tuple[Move, float]:
+    best: int = max(range(len(moves)), key=lambda i: (scores[i], -i))
+    return moves[best], scores[best]
+
+
+def _executor_or_pool(executor: Optional[Executor], workers: int) -> Executor:
+    return executor if executor is not None else ProcessPoolExecutor(workers)
+
+
+# The score of every legal move, searched max_depth moves deeper like
+# find_best_move(). Without an executor a ProcessPoolExecutor with one
+# process per move is used for the call
+def root_scores(
+    board: Board, max_depth: int = 8, executor: Optional[Executor] = None
+) -> List[Tuple[Move, float]]:
+    moves: List[Move] = board.legal_moves
+    if len(moves) == 0:
+        raise ValueError("No legal moves, the game is over")
+    pool: Executor = _executor_or_pool(executor, len(moves))
+    try:
+        scores: List[float] = list(
+            pool.map(_score_move, [board] * len(moves), moves, [max_depth] * len(moves))
+        )
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return list(zip(moves, scores))
+
+
+# find_best_move() with the root moves searched in parallel
+def find_best_move_parallel(
+    board: Board, max_depth: int = 8, executor: Optional[Executor] = None
+) -> Move:
+    moves_and_scores: List[Tuple[Move, float]] = root_scores(board, max_depth, executor)
+    return _best(
+        [move for move, _ in moves_and_scores], [score for _, score in moves_and_scores]
+    )[0]
+
+
+# Iterative deepening below one root move, for time_limit seconds; runs in
+# a worker process. Returns the score of each finished depth for the player
+# who made the move (the search scores for the other side), the positions
+# visited and the expected reply line. A move that ends the game has the
+# same score at any depth, which an empty list of scores stands for
+def _deepen_move(
+    board: Board, move: Move, time_limit: float, max_depth: int
+) -> Tuple[List[float], float, int, List[Move]]:
+    child: Board = board.move(move)
+    if child.is_win or child.is_draw:
+        return [], child.evaluate(board.turn), 1, []
+    result: SearchResult = IterativeDeepening().search(child, time_limit, max_depth)
+    return [-score for score in result.scores], 0.0, result.nodes, result.principal_variation
+
+
+# Iterative deepening with the root moves searched in parallel for
+# time_limit seconds. Each root move deepens on its own, so they reach
+# different depths; the moves are compared at the deepest depth all of them
+# finished, which is the depth reported. Deterministic for a given depth,
+# though how deep the time allows depends on the machine. Positions in the
+# book aren't searched
+def find_best_move_parallel_timed(
+    board: Board,
+    time_limit: float,
+    max_depth: int = 64,
+    executor: Optional[Executor] = None,
+    book: Optional[OpeningBook] = None,
+) -> SearchResult:
+    start: float = perf_counter()
+    moves: List[Move] = board.legal_moves
+    if len(moves) == 0:
+        raise ValueError("No legal moves, the game is over")
+    from_book: Optional[SearchResult] = book_result(book, board, start)
+    if from_book is not None:
+        return from_book
+    pool: Executor = _executor_or_pool(executor, len(moves))
+    try:
+        # starting the processes comes out of the time too
+        remaining: float = max(0.0, time_limit - (perf_counter() - start))
+        results: List[Tuple[List[float], float, int, List[Move]]] = list(
+            pool.map(
+                _deepen_move,
+                [board] * len(moves),
+                moves,
+                [remaining] * len(moves),
+                [max(1, max_depth - 1)] * len(moves),
+            )
+        )
+    finally:
+        if executor is None:
+            pool.shutdown()
+    # depth below the root moves that every unfinished game reached
+    common: int = min(
+        (len(scores) for scores, _, _, _ in results if len(scores) > 0), default=0
+    )
+    final_scores: List[float] = [
+        scores[common - 1] if len(scores) > 0 else terminal
+        for scores, terminal, _, _ in results
+    ]
+    best_move, best_score = _best(moves, final_scores)
+    replies: List[Move] = results[moves.index(best_move)][3]
+    return SearchResult(
+        best_move,
+        best_score,
+        common + 1,
+        sum(nodes for _, _, nodes, _ in results),
+        perf_counter() - start,
+        [best_move] + replies,
+    )
@@ -1,9 +1,9 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 from enum import Enum
 
 # defined in board.py
-from board import Piece, Board, Move
+from board import Piece, Board, Move, zobrist_numbers
 
 # a subclass of Piece but also an enum
 class TTTPiece(Piece, Enum):
@@ -24,21 +24,49 @@ class TTTPiece(Piece, Enum):
         return self.value
 
 
+# Zobrist numbers: X on squares 0-8, O on squares 0-8, then O to move
+_ZOBRIST: List[int] = zobrist_numbers(2 * 9 + 1, seed=9)
+_O_TO_MOVE: int = _ZOBRIST[-1]
+
+
+def _square_key(square: int, piece: TTTPiece) -> int:
+    return _ZOBRIST[square + (9 if piece == TTTPiece.O else 0)]
+
+
 class TTTBoard(Board):
     def __init__(
-        self, position: List[TTTPiece] = [TTTPiece.E] * 9, turn: TTTPiece = TTTPiece.X
+        self,
+        position: List[TTTPiece] = [TTTPiece.E] * 9,
+        turn: TTTPiece = TTTPiece.X,
+        zobrist_key: Optional[int] = None,
     ) -> None:
         self.position: List[TTTPiece] = position
         self._turn: TTTPiece = turn
+        # move() passes the key along, only a new board works it out
+        if zobrist_key is None:
+            zobrist_key = _O_TO_MOVE if turn == TTTPiece.O else 0
+            for square, piece in enumerate(position):
+                if piece != TTTPiece.E:
+                    zobrist_key ^= _square_key(square, piece)
+        self._zobrist_key: int = zobrist_key
 
     @property
     def turn(self) -> Piece:
         return self._turn
 
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
     def move(self, location: Move) -> Board:
         temp_position: List[TTTPiece] = self.position.copy()
         temp_position[location] = self._turn
-        return TTTBoard(temp_position, self._turn.opposite)
+        # add the piece and switch the side to move
+        return TTTBoard(
+            temp_position,
+            self._turn.opposite,
+            self._zobrist_key ^ _square_key(location, self._turn) ^ _O_TO_MOVE,
+        )
 
     @property
     def legal_moves(self) -> List[Move]:
@@ -1,6 +1,18 @@
+from typing import Optional
+import os
 from minimax import find_best_move
 from tictactoe import TTTBoard
 from board import Move, Board
+from transposition_table import TranspositionTable
+from opening_book import OpeningBook
+
+# shared by every search of the game, so later moves reuse earlier work
+table: TranspositionTable = TranspositionTable()
+# every position solved in advance by book_builder.py, so nothing is searched
+BOOK_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.book")
+book: Optional[OpeningBook] = (
+    OpeningBook.load(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+)
 
 board: Board = TTTBoard()
 
@@ -30,7 +42,7 @@ if __name__ == "__main__":
             print("Draw!")
             break
         # run the find_best_move function
-        computer_move: Move = find_best_move(board)
+        computer_move: Move = find_best_move(board, table=table, book=book)
         print(f"Computer move is {computer_move}")
         board = board.move(computer_move)
         print(board)
@@ -1,10 +1,18 @@
 import unittest
+import os
+import tempfile
 from typing import List
 
 # import our scripts
 from minimax import find_best_move
 from tictactoe import TTTPiece, TTTBoard
 from board import Move
+from transposition_table import TranspositionTable
+from iterative_deepening import IterativeDeepening, find_best_move_timed, SearchResult
+from board_benchmark import perft, KNOWN_PERFT
+from book_builder import solve_tictactoe
+from opening_book import OpeningBook, BookEntry
+from minimax import minimax, alphabeta
 
 
 class TTTMinimaxTestCase(unittest.TestCase):
@@ -64,6 +72,93 @@ class TTTMinimaxTestCase(unittest.TestCase):
         answer3: Move = find_best_move(test_board3)
         self.assertEqual(answer3, 1)
 
+    def test_transposition_table(self):
+        # a table shared by a whole game must not change any answer
+        table: TranspositionTable = TranspositionTable(1024)
+        board: TTTBoard = TTTBoard()
+        while not (board.is_win or board.is_draw):
+            move: Move = find_best_move(board, table=table)
+            self.assertEqual(move, find_best_move(board))
+            board = board.move(move)
+        # perfect play on both sides is a draw
+        self.assertTrue(board.is_draw)
+        self.assertGreater(table.hits, 0)
+
+    def test_minimax_ignores_bounds(self):
+        # alphabeta() with a narrow window leaves bounds in the table, which
+        # minimax() must not take for exact scores
+        table: TranspositionTable = TranspositionTable(1024)
+        board: TTTBoard = TTTBoard().move(Move(4))
+        alphabeta(board, True, board.turn, 8, -0.5, -0.25, table=table)
+        self.assertEqual(minimax(board, True, board.turn, 8, table), 0)
+
+    def test_zobrist_key(self):
+        # the same position reached by different move orders
+        board1: TTTBoard = TTTBoard().move(Move(0)).move(Move(4)).move(Move(8))
+        board2: TTTBoard = TTTBoard().move(Move(8)).move(Move(4)).move(Move(0))
+        self.assertEqual(board1.zobrist_key, board2.zobrist_key)
+        self.assertEqual(
+            board1.zobrist_key, TTTBoard(board1.position, TTTPiece.O).zobrist_key
+        )
+        self.assertNotEqual(
+            board1.zobrist_key, TTTBoard(board1.position, TTTPiece.X).zobrist_key
+        )
+
+    def test_iterative_deepening(self):
+        # the hard position again, with a time limit instead of a depth
+        to_win_hard_position: List[TTTPiece] = [
+            TTTPiece.X,
+            TTTPiece.E,
+            TTTPiece.E,
+            TTTPiece.E,
+            TTTPiece.E,
+            TTTPiece.O,
+            TTTPiece.O,
+            TTTPiece.X,
+            TTTPiece.E,
+        ]
+        test_board: TTTBoard = TTTBoard(to_win_hard_position, TTTPiece.X)
+        result: SearchResult = find_best_move_timed(test_board, 5.0, max_depth=5)
+        self.assertEqual(result.move, 1)
+        self.assertEqual(result.score, 1)
+        self.assertEqual(result.depth, 5)
+        self.assertEqual(result.principal_variation[0], 1)
+
+    def test_iterative_deepening_uses_given_table(self):
+        table: TranspositionTable = TranspositionTable(1 << 10)
+        search: IterativeDeepening = IterativeDeepening(table)
+        self.assertIs(search.table, table)
+        search.search(TTTBoard(), 5.0, 4)
+        self.assertGreater(len(table), 0)
+        probes: int = table.probes
+        find_best_move_timed(TTTBoard(), 5.0, 2, table)
+        self.assertGreater(table.probes, probes)
+
+    def test_perft(self):
+        # every game of tic-tac-toe, so move generation and wins are right
+        for depth in range(len(KNOWN_PERFT["tictactoe"])):
+            self.assertEqual(perft(TTTBoard(), depth), KNOWN_PERFT["tictactoe"][depth])
+
+    def test_opening_book(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tictactoe.book")
+            solve_tictactoe().save(path)
+            book: OpeningBook = OpeningBook.load(path)
+        # one entry per position that isn't over, up to symmetry
+        self.assertEqual(len(book), 627)
+        # the hard position and its mirror image get mirrored moves
+        position: List[TTTPiece] = [TTTPiece.E] * 9
+        position[0] = position[7] = TTTPiece.X
+        position[5] = position[6] = TTTPiece.O
+        mirrored: List[TTTPiece] = [position[(s // 3) * 3 + 2 - s % 3] for s in range(9)]
+        entry: BookEntry = book.lookup(TTTBoard(position, TTTPiece.X))
+        self.assertEqual((entry.move, entry.value), (1, 1))
+        self.assertEqual(book.lookup(TTTBoard(mirrored, TTTPiece.X)).move, 1)
+        # from the start every move draws, and the book's move keeps the draw
+        board: TTTBoard = TTTBoard()
+        move: Move = find_best_move(board, book=book)
+        self.assertEqual(minimax(board.move(move), False, board.turn, 9), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
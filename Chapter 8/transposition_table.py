@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from enum import Enum
+from dataclasses import dataclass
+from board import Board, Move
+
+
+# What a stored score means. A search whose window cut it short only knows
+# a bound on the real score
+class Bound(Enum):
+    EXACT = "exact"
+    LOWER = "lower"  # the real score is at least this (a beta cutoff)
+    UPPER = "upper"  # the real score is at most this (every move failed low)
+
+    # the same bound seen from the other player's side, where scores are
+    # negated
+    @property
+    def opposite(self) -> Bound:
+        if self == Bound.LOWER:
+            return Bound.UPPER
+        elif self == Bound.UPPER:
+            return Bound.LOWER
+        else:
+            return Bound.EXACT
+
+
+# One searched position. score is from the point of view of the side to
+# move, so the entry is useful whichever player started the search
+@dataclass
+class TableEntry:
+    key: int  # the full Zobrist key, to spot two positions sharing a slot
+    depth: int  # how many moves deep the search below this position went
+    score: float
+    bound: Bound
+    best_move: Optional[Move]  # None for positions that weren't expanded
+    generation: int  # the search that stored it, see new_search()
+
+
+# A fixed number of slots indexed by Zobrist key. When two positions want
+# the same slot, the deeper search is kept, unless the entry there is left
+# over from an earlier search (new_search()), in which case it is replaced
+# anyway so old results don't fill the table forever
+class TranspositionTable:
+    def __init__(self, size: int = 1 << 20) -> None:
+        if size < 1:
+            raise ValueError("A TranspositionTable needs at least one slot")
+        self._slots: List[Optional[TableEntry]] = [None] * size
+        self._generation: int = 0
+        self.probes: int = 0
+        self.hits: int = 0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._slots if entry is not None)
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    # the stored entry for a position, if there is one
+    def lookup(self, key: int) -> Optional[TableEntry]:
+        self.probes += 1
+        entry: Optional[TableEntry] = self._slots[key % len(self._slots)]
+        if entry is None or entry.key != key:
+            return None
+        self.hits += 1
+        return entry
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        bound: Bound,
+        best_move: Optional[Move] = None,
+    ) -> None:
+        index: int = key % len(self._slots)
+        old: Optional[TableEntry] = self._slots[index]
+        if (
+            old is None
+            or old.key == key
+            or old.generation != self._generation
+            or depth >= old.depth
+        ):
+            self._slots[index] = TableEntry(
+                key, depth, score, bound, best_move, self._generation
+            )
+
+    # call between searches (e.g. moves of a game) so entries from earlier
+    # searches give way to new ones; they can still be used until then
+    def new_search(self) -> None:
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._slots = [None] * len(self._slots)
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"TranspositionTable({len(self)}/{self.size} entries, "
+            f"hit rate {self.hit_rate:.1%})"
+        )
+
+
+# A transposition table holds scores from the side to move's point of view,
+# so one entry serves both players. The side to move is original_player when
+# maximizing; otherwise scores are negated and lower and upper bounds swap.
+# These two convert between that and original_player's point of view
+def table_score(entry: TableEntry, maximizing: bool) -> Tuple[float, Bound]:
+    if maximizing:
+        return entry.score, entry.bound
+    return -entry.score, entry.bound.opposite
+
+
+def store_score(
+    table: TranspositionTable,
+    board: Board,
+    maximizing: bool,
+    max_depth: int,
+    score: float,
+    bound: Bound,
+    best_move: Optional[Move] = None,
+) -> None:
+    if not maximizing:
+        score, bound = -score, bound.opposite
+    table.store(board.zobrist_key, max_depth, score, bound, best_move)
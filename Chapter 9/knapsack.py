@@ -0,0 +1,192 @@
+from __future__ import annotations
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from array import array
+from functools import reduce
+from math import gcd
+from operator import add
+
+
+class Item(NamedTuple):
+    name: str
+    weight: int
+    value: float
+
+
+# Above this many table cells (items times capacity) knapsack() switches to
+# branch and bound, whose time depends on the items rather than the capacity,
+# as long as there are no more than BRANCH_AND_BOUND_ITEMS items: its time
+# can grow exponentially with them, while the DP's memory only grows with
+# the capacity
+DP_CELL_LIMIT: int = 20_000_000
+BRANCH_AND_BOUND_ITEMS: int = 64
+
+
+# Items that could be in a solution, with weights and capacity divided by
+# everything they have in common: any set of items weighs a multiple of the
+# weights' GCD, so the capacity can be rounded down to one too. Returns the
+# indices of the items kept and the scaled weights and capacity
+def _prepare(items: Sequence[Item], capacity: int) -> Tuple[List[int], List[int], int]:
+    if capacity < 0:
+        raise ValueError("The capacity can't be negative")
+    if any(item.weight < 0 for item in items):
+        raise ValueError("Item weights can't be negative")
+    # too heavy or worthless items are never worth taking
+    kept: List[int] = [
+        i for i, item in enumerate(items) if item.weight <= capacity and item.value > 0
+    ]
+    weights: List[int] = [items[i].weight for i in kept]
+    divisor: int = reduce(gcd, weights, 0)
+    if divisor > 1:
+        weights = [weight // divisor for weight in weights]
+        capacity //= divisor
+    # more capacity than everything weighs is no use
+    return kept, weights, min(capacity, sum(weights))
+
+
+# The best value for every capacity from 0 to capacity, using only the given
+# items: the last row of the notebook's table. Only one array('d') row is
+# kept, and each item updates it in one comprehension over the whole row
+# instead of a loop over capacities with a max() call each, which is more
+# than twice as fast
+def _best_values(weights: Sequence[int], values: Sequence[float], capacity: int) -> array:
+    row: array = array("d", [0.0]) * (capacity + 1)
+    for weight, value in zip(weights, map(float, values)):
+        if weight == 0:
+            row = array("d", map(value.__add__, row))
+        elif weight <= capacity:
+            # row[:-weight] is copied before row[weight:] is replaced, so
+            # every capacity sees the values from before this item
+            row[weight:] = array(
+                "d",
+                [
+                    without if without >= with_item else with_item
+                    for without, with_item in zip(
+                        row[weight:], map(value.__add__, row[: capacity + 1 - weight])
+                    )
+                ],
+            )
+    return row
+
+
+# Hirschberg's divide and conquer: the best values of the first half of the
+# items for every capacity, and of the second half, show how much capacity
+# the best solution gives each half, and then each half is solved on its own
+# with that capacity. Only a couple of rows are alive at a time, instead of a
+# whole table to trace the solution back through
+def _chosen(
+    indices: List[int], weights: List[int], values: List[float], capacity: int
+) -> List[int]:
+    if len(indices) == 1:
+        return indices if weights[0] <= capacity else []
+    middle: int = len(indices) // 2
+    first: array = _best_values(weights[:middle], values[:middle], capacity)
+    second: array = _best_values(weights[middle:], values[middle:], capacity)
+    totals: List[float] = list(map(add, first, reversed(second)))
+    split: int = totals.index(max(totals))
+    del first, second, totals
+    return _chosen(
+        indices[:middle], weights[:middle], values[:middle], split
+    ) + _chosen(indices[middle:], weights[middle:], values[middle:], capacity - split)
+
+
+# The most valuable items that fit in max_capacity, by dynamic programming in
+# O(capacity) memory. Weights must be whole numbers
+def knapsack_dp(items: Sequence[Item], max_capacity: int) -> List[Item]:
+    kept, weights, capacity = _prepare(items, max_capacity)
+    if len(kept) == 0:
+        return []
+    values: List[float] = [items[i].value for i in kept]
+    return [items[i] for i in _chosen(kept, weights, values, capacity)]
+
+
+# the items taken on the way to a search node, as a linked list from the
+# last one back, so sibling nodes share their common part
+_Taken = Tuple[int, Optional["_Taken"]]
+
+
+# Branch and bound: take or leave each item in turn, most valuable per unit
+# of weight first, and give up on a branch once even filling what's left
+# with fractions of the remaining items (an upper bound on what it could
+# still reach) can't beat the best found so far. Its time doesn't depend on
+# the capacity, so it suits a few items and a huge capacity
+def knapsack_branch_and_bound(items: Sequence[Item], max_capacity: int) -> List[Item]:
+    kept, weights, capacity = _prepare(items, max_capacity)
+    order: List[int] = sorted(
+        range(len(kept)),
+        key=lambda i: -items[kept[i]].value / weights[i] if weights[i] > 0 else float("-inf"),
+    )
+    sorted_weights: List[int] = [weights[i] for i in order]
+    sorted_values: List[float] = [items[kept[i]].value for i in order]
+    count: int = len(order)
+
+    # the best value reachable from item start on with room left, if items
+    # could be split
+    def bound(start: int, room: int) -> float:
+        total: float = 0.0
+        for i in range(start, count):
+            if sorted_weights[i] <= room:
+                room -= sorted_weights[i]
+                total += sorted_values[i]
+            else:
+                return total + sorted_values[i] * room / sorted_weights[i]
+        return total
+
+    best_value: float = 0.0
+    best_taken: Optional[_Taken] = None
+    # depth first with a stack of its own instead of recursion, which would
+    # go one call deeper per item: (next item, room left, value, items taken)
+    stack: List[Tuple[int, int, float, Optional[_Taken]]] = [(0, capacity, 0.0, None)]
+    while stack:
+        start, room, value, taken = stack.pop()
+        if value > best_value:
+            best_value, best_taken = value, taken
+        if start == count or value + bound(start, room) <= best_value:
+            continue
+        stack.append((start + 1, room, value, taken))
+        # taking the item is pushed last so it is tried first, which finds
+        # good solutions, and so tight bounds, early
+        if sorted_weights[start] <= room:
+            stack.append(
+                (
+                    start + 1,
+                    room - sorted_weights[start],
+                    value + sorted_values[start],
+                    (start, taken),
+                )
+            )
+
+    chosen: List[int] = []
+    while best_taken is not None:
+        index, best_taken = best_taken
+        chosen.append(kept[order[index]])
+    return [items[i] for i in sorted(chosen)]
+
+
+# The most valuable items that fit in max_capacity: by branch and bound for
+# a few items and a capacity too large for the DP's table (items times
+# capacity, after scaling), otherwise by dynamic programming
+def knapsack(items: Sequence[Item], max_capacity: int) -> List[Item]:
+    kept, _, capacity = _prepare(items, max_capacity)
+    if (
+        len(kept) <= BRANCH_AND_BOUND_ITEMS
+        and len(kept) * (capacity + 1) > DP_CELL_LIMIT
+    ):
+        return knapsack_branch_and_bound(items, max_capacity)
+    return knapsack_dp(items, max_capacity)
+
+
+if __name__ == "__main__":
+    items: List[Item] = [
+        Item("television", 50, 500),
+        Item("candlesticks", 2, 300),
+        Item("stereo", 35, 400),
+        Item("laptop", 3, 1000),
+        Item("food", 15, 50),
+        Item("clothing", 20, 800),
+        Item("jewelry", 1, 4000),
+        Item("books", 100, 300),
+        Item("printer", 18, 30),
+        Item("refrigerator", 200, 700),
+        Item("painting", 10, 1000),
+    ]
+    print(knapsack(items, 75))
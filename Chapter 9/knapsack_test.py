@@ -0,0 +1,70 @@
+import unittest
+from itertools import combinations
+from random import Random
+from typing import List, Sequence
+
+# import our scripts
+from knapsack import Item, knapsack, knapsack_dp, knapsack_branch_and_bound
+
+
+# the best value of any set of items that fits, by trying every set
+def best_value(items: Sequence[Item], capacity: int) -> float:
+    best: float = 0.0
+    for count in range(len(items) + 1):
+        for chosen in combinations(items, count):
+            if sum(item.weight for item in chosen) <= capacity:
+                best = max(best, sum(item.value for item in chosen))
+    return best
+
+
+class KnapsackTestCase(unittest.TestCase):
+    def test_notebook_items(self):
+        items: List[Item] = [
+            Item("television", 50, 500),
+            Item("candlesticks", 2, 300),
+            Item("stereo", 35, 400),
+            Item("laptop", 3, 1000),
+            Item("food", 15, 50),
+            Item("clothing", 20, 800),
+            Item("jewelry", 1, 4000),
+            Item("books", 100, 300),
+            Item("printer", 18, 30),
+            Item("refrigerator", 200, 700),
+            Item("painting", 10, 1000),
+        ]
+        self.assertEqual(sum(item.value for item in knapsack(items, 75)), 7500)
+
+    def test_against_brute_force(self):
+        # small random instances, some with a common factor in the weights,
+        # zero weights and worthless items
+        generator: Random = Random(3)
+        for _ in range(200):
+            factor: int = generator.choice([1, 1, 3, 10])
+            items: List[Item] = [
+                Item(
+                    str(i),
+                    factor * generator.randint(0, 12),
+                    generator.choice([0, generator.randint(1, 50), generator.random() * 50]),
+                )
+                for i in range(generator.randint(0, 8))
+            ]
+            capacity: int = generator.randint(0, 60)
+            best: float = best_value(items, capacity)
+            for solve in (knapsack, knapsack_dp, knapsack_branch_and_bound):
+                chosen: List[Item] = solve(items, capacity)
+                self.assertLessEqual(sum(item.weight for item in chosen), capacity)
+                self.assertAlmostEqual(sum(item.value for item in chosen), best)
+
+    def test_many_items_large_capacity(self):
+        # deeper than the recursion limit would allow a recursive search
+        generator: Random = Random(4)
+        items: List[Item] = [
+            Item(str(i), generator.randint(1, 10 ** 6), generator.randint(1, 10 ** 6))
+            for i in range(3000)
+        ]
+        chosen: List[Item] = knapsack_branch_and_bound(items, 10 ** 8)
+        self.assertLessEqual(sum(item.weight for item in chosen), 10 ** 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from itertools import islice
+
+phone_mapping: Dict[str, Tuple[str, ...]] = {
+    "1": ("1",),
+    "2": ("a", "b", "c"),
+    "3": ("d", "e", "f"),
+    "4": ("g", "h", "i"),
+    "5": ("j", "k", "l"),
+    "6": ("m", "n", "o"),
+    "7": ("p", "q", "r", "s"),
+    "8": ("t", "u", "v"),
+    "9": ("w", "x", "y", "z"),
+    "0": ("0",),
+}
+
+# the other way round: the key each letter is on
+letter_digits: Dict[str, str] = {
+    letter: digit
+    for digit, letters in phone_mapping.items()
+    for letter in letters
+    if letter.isalpha()
+}
+
+
+# the keys pressed to type word, or None if it has anything but letters
+def word_digits(word: str) -> Optional[str]:
+    digits: List[str] = []
+    for letter in word.lower():
+        if letter not in letter_digits:
+            return None
+        digits.append(letter_digits[letter])
+    return "".join(digits)
+
+
+# just the digits of a phone number, with letters (as in 1-800-FLOWERS)
+# turned into their digits and spaces, dashes and brackets dropped
+def phone_digits(phone_number: str) -> str:
+    digits: List[str] = []
+    for character in phone_number.lower():
+        if character.isdigit():
+            digits.append(character)
+        elif character in letter_digits:
+            digits.append(letter_digits[character])
+    return "".join(digits)
+
+
+# one node of the trie, for a sequence of digits
+class _Node:
+    __slots__ = ("children", "words")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        self.words: List[str] = []  # the words those digits spell
+
+
+# A dictionary of words arranged by the digits that spell them, in a trie
+# keyed by digit. Walking it along a phone number finds every word that
+# starts at a position, and stops as soon as no word continues with the
+# next digit, so mnemonics are built from words instead of generating every
+# combination of letters (4 million for 10 digits of 7s and 9s) and
+# filtering them. Build it once and use it for any number of phone numbers
+class MnemonicDictionary:
+    def __init__(self, words: Iterable[str], min_length: int = 1) -> None:
+        self._root: _Node = _Node()
+        self.size: int = 0
+        for word in words:
+            word = word.strip().lower()
+            if len(word) < min_length:
+                continue
+            digits: Optional[str] = word_digits(word)
+            if digits is None:
+                continue
+            node: _Node = self._root
+            for digit in digits:
+                child: Optional[_Node] = node.children.get(digit)
+                if child is None:
+                    child = node.children[digit] = _Node()
+                node = child
+            if word not in node.words:
+                node.words.append(word)
+                self.size += 1
+
+    # one word per line, like /usr/share/dict/words
+    @classmethod
+    def from_file(cls, path: str, min_length: int = 1) -> MnemonicDictionary:
+        with open(path) as word_file:
+            return cls(word_file, min_length)
+
+    def __len__(self) -> int:
+        return self.size
+
+    # where words starting at start can end, and the words ending there
+    def _words_from(self, digits: str, start: int) -> Iterator[Tuple[int, List[str]]]:
+        node: Optional[_Node] = self._root
+        for end in range(start, len(digits)):
+            node = node.children.get(digits[end])
+            if node is None:
+                return
+            if node.words:
+                yield end + 1, node.words
+
+    # Every word spelled by part of the phone number, as (start, word) with
+    # start the index into its digits, in order of start. The notebook's
+    # search for mnemonics containing "leg" is the ones with word "leg"
+    def words_in(self, phone_number: str) -> Iterator[Tuple[int, str]]:
+        digits: str = phone_digits(phone_number)
+        for start in range(len(digits)):
+            for _, words in self._words_from(digits, start):
+                for word in words:
+                    yield start, word
+
+    # Every way to spell the whole phone number with dictionary words, one
+    # list of words per way, as they are found. Digits without letters (0 and
+    # 1) stand for themselves. Which positions the rest of the number can be
+    # spelled from is worked out first, from the end backwards, so the
+    # search never goes down a path that can't be finished, and its time
+    # depends on how many ways there are rather than on the letter
+    # combinations
+    def segmentations(self, phone_number: str) -> Iterator[List[str]]:
+        digits: str = phone_digits(phone_number)
+        # steps[i]: the ways on from position i that lead to the end
+        steps: List[List[Tuple[int, List[str]]]] = [[] for _ in range(len(digits) + 1)]
+        finishes: List[bool] = [False] * len(digits) + [True]
+        for start in range(len(digits) - 1, -1, -1):
+            if digits[start] in "01":
+                if finishes[start + 1]:
+                    steps[start].append((start + 1, [digits[start]]))
+            else:
+                steps[start] = [
+                    (end, words)
+                    for end, words in self._words_from(digits, start)
+                    if finishes[end]
+                ]
+            finishes[start] = len(steps[start]) > 0
+        if not finishes[0]:
+            return
+
+        spelled: List[str] = []
+
+        def spell(start: int) -> Iterator[List[str]]:
+            if start == len(digits):
+                yield list(spelled)
+                return
+            for end, words in steps[start]:
+                for word in words:
+                    spelled.append(word)
+                    yield from spell(end)
+                    spelled.pop()
+
+        yield from spell(0)
+
+    # Many phone numbers against the same dictionary: up to limit ways to
+    # spell each (all of them if limit is None)
+    def segment_all(
+        self, phone_numbers: Iterable[str], limit: Optional[int] = None
+    ) -> Dict[str, List[List[str]]]:
+        return {
+            phone_number: list(islice(self.segmentations(phone_number), limit))
+            for phone_number in phone_numbers
+        }
+
+
+if __name__ == "__main__":
+    dictionary: MnemonicDictionary = MnemonicDictionary(
+        ["leg", "legs", "jet", "key", "fly", "ley", "sty", "ski", "let", "keg", "twenty"]
+    )
+    phone_number: str = "1800 534 798"
+    print(f"Words in {phone_number}: {list(dictionary.words_in(phone_number))}")
+    for words in dictionary.segmentations("534 789"):
+        print(" ".join(words))
@@ -0,0 +1,61 @@
+import unittest
+from itertools import product
+from typing import List, Set, Tuple
+
+# import our scripts
+from mnemonics import MnemonicDictionary, phone_digits, phone_mapping, word_digits
+
+WORDS: List[str] = ["leg", "legs", "jet", "key", "fly", "ley", "sty", "ski", "let", "keg", "twenty"]
+
+
+# every way to split digits into dictionary words, by trying every set of
+# split points and every letter for each digit
+def brute_force(words: List[str], digits: str) -> Set[Tuple[str, ...]]:
+    found: Set[Tuple[str, ...]] = set()
+    vocabulary: Set[str] = set(words)
+    for letters in product(*(phone_mapping[digit] for digit in digits)):
+        spelled: str = "".join(letters)
+        for cuts in product((False, True), repeat=len(digits) - 1):
+            pieces: List[str] = []
+            start: int = 0
+            for i, cut in enumerate(cuts, 1):
+                if cut:
+                    pieces.append(spelled[start:i])
+                    start = i
+            pieces.append(spelled[start:])
+            if all(p in vocabulary or p in "01" for p in pieces):
+                found.add(tuple(pieces))
+    return found
+
+
+class MnemonicsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dictionary: MnemonicDictionary = MnemonicDictionary(WORDS)
+
+    def test_digits(self):
+        self.assertEqual(word_digits("Leg"), "534")
+        self.assertIsNone(word_digits("it's"))
+        self.assertEqual(phone_digits("1-800-FLOWERS"), "18003569377")
+
+    def test_segmentations_match_brute_force(self):
+        for number in ("534789", "534534", "5347", "1534", "539"):
+            self.assertEqual(
+                {tuple(words) for words in self.dictionary.segmentations(number)},
+                brute_force(WORDS, phone_digits(number)),
+                number,
+            )
+
+    def test_words_in(self):
+        self.assertIn((4, "leg"), list(self.dictionary.words_in("1800 534 798")))
+
+    def test_segment_all_limit(self):
+        result = self.dictionary.segment_all(["534 789", "222"], limit=1)
+        self.assertEqual(len(result["534 789"]), 1)
+        self.assertEqual(result["222"], [])
+
+    def test_min_length(self):
+        self.assertEqual(len(MnemonicDictionary(["a", "an", "and"], min_length=2)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+from array import array
+from itertools import permutations
+from math import inf, sqrt
+from operator import add, sub
+
+# a tour visits every city once, as indices into a DistanceMatrix, and
+# returns from the last city to the first
+Tour = List[int]
+
+# gains smaller than this are rounding, not improvements
+_EPSILON: float = 1e-9
+
+# Above this many cities shortest_tour() uses heuristics: Held-Karp's time
+# and memory double with every city
+HELD_KARP_LIMIT: int = 18
+
+
+# The distance between every pair of cities, one float64 array('d') row per
+# city, so looking one up is two subscripts instead of two dict lookups on
+# names. Distances are assumed symmetric
+class DistanceMatrix:
+    def __init__(self, names: Sequence[str], rows: List[array]) -> None:
+        if len(rows) != len(names) or any(len(row) != len(names) for row in rows):
+            raise ValueError("A distance matrix needs one row and column per city")
+        self.names: List[str] = list(names)
+        self.rows: List[array] = rows
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # from nested dicts like vt_distances in the notebook
+    @classmethod
+    def from_dict(cls, distances: Dict[str, Dict[str, float]]) -> DistanceMatrix:
+        names: List[str] = list(distances)
+        rows: List[array] = [
+            array("d", [0.0 if a == b else distances[a][b] for b in names]) for a in names
+        ]
+        return cls(names, rows)
+
+    # straight-line distances between points, named by their position
+    # (worked out here because math.dist() is Python 3.8+)
+    @classmethod
+    def from_points(cls, points: Sequence[Sequence[float]]) -> DistanceMatrix:
+        rows: List[array] = [
+            array("d", [sqrt(sum(d * d for d in map(sub, a, b))) for b in points])
+            for a in points
+        ]
+        return cls([str(i) for i in range(len(points))], rows)
+
+    def tour_length(self, tour: Tour) -> float:
+        rows: List[array] = self.rows
+        return sum(rows[a][b] for a, b in zip(tour, tour[1:])) + rows[tour[-1]][tour[0]]
+
+    # the names along tour, ending back at the start like the notebook's paths
+    def path(self, tour: Tour) -> List[str]:
+        return [self.names[city] for city in tour] + [self.names[tour[0]]]
+
+
+# The naive approach, kept as a reference to check the others against. Every
+# tour starting at city 0 is measured as it is generated, so memory stays
+# constant however many there are; each tour is also its own reversal, so
+# only the half whose second city is lower than its last are measured
+def brute_force(matrix: DistanceMatrix) -> Tour:
+    if len(matrix) < 3:
+        return list(range(len(matrix)))
+    rows: List[array] = matrix.rows
+    first: array = rows[0]
+    best: Tuple[int, ...] = ()
+    min_distance: float = inf
+    for order in permutations(range(1, len(matrix))):
+        if order[0] > order[-1]:
+            continue
+        distance: float = first[order[0]] + rows[order[-1]][0]
+        for a, b in zip(order, order[1:]):
+            distance += rows[a][b]
+        if distance < min_distance:
+            min_distance = distance
+            best = order
+    return [0] + list(best)
+
+
+# Held-Karp dynamic programming, exact in O(n²·2ⁿ) time instead of O(n!).
+# cost[subset][k] is the shortest path that starts at city 0, visits every
+# city in subset and ends at city k (in subset). Subsets (of cities 1 to
+# n - 1, as bits) are filled in increasing order, so a subset's costs are
+# ready before any bigger subset needs them. Each row is one stretch of a
+# single flat array('d'), with inf for cities not in the subset, so the best
+# city before k is one min() over map(add, ...) with k's column of the
+# matrix. Parents aren't stored: the tour is traced back by finding the
+# minimum again, which halves the memory
+def held_karp(matrix: DistanceMatrix) -> Tour:
+    n: int = len(matrix)
+    if n < 3:
+        return list(range(n))
+    m: int = n - 1  # cities other than city 0
+    rows: List[array] = matrix.rows
+    # into_city[k][j]: from city j + 1 to city k + 1
+    into_city: List[array] = [
+        array("d", [rows[j + 1][k + 1] for j in range(m)]) for k in range(m)
+    ]
+    cost: array = array("d", [inf]) * ((1 << m) * m)
+    view: memoryview = memoryview(cost)
+    for k in range(m):
+        cost[(1 << k) * m + k] = rows[0][k + 1]
+    for subset in range(1, 1 << m):
+        if subset & (subset - 1) == 0:
+            continue  # single cities are set above
+        base: int = subset * m
+        remaining: int = subset
+        while remaining:
+            bit: int = remaining & -remaining
+            remaining ^= bit
+            k: int = bit.bit_length() - 1
+            previous: int = (subset ^ bit) * m
+            cost[base + k] = min(map(add, view[previous : previous + m], into_city[k]))
+
+    # back from the full subset: which city comes before the return to 0
+    full: int = (1 << m) - 1
+    last: int = min(range(m), key=lambda k: cost[full * m + k] + rows[k + 1][0])
+    reversed_tour: Tour = []
+    subset = full
+    while True:
+        reversed_tour.append(last + 1)
+        rest: int = subset ^ (1 << last)
+        if rest == 0:
+            break
+        before: int = min(
+            (j for j in range(m) if rest & (1 << j)),
+            key=lambda j: cost[rest * m + j] + into_city[last][j],
+        )
+        subset, last = rest, before
+    return [0] + reversed_tour[::-1]
+
+
+# Start at start and always go to the closest city not visited yet. Fast,
+# and usually within 25% of the shortest tour
+def nearest_neighbour(matrix: DistanceMatrix, start: int = 0) -> Tour:
+    rows: List[array] = matrix.rows
+    unvisited: List[int] = [city for city in range(len(matrix)) if city != start]
+    tour: Tour = [start]
+    while unvisited:
+        row: array = rows[tour[-1]]
+        closest: int = min(unvisited, key=row.__getitem__)
+        unvisited.remove(closest)
+        tour.append(closest)
+    return tour
+
+
+# 2-opt: replace two edges a-b and c-d with a-c and b-d, which reverses the
+# stretch from b to c, while that makes the tour shorter. Returns whether
+# anything changed; tour is changed in place
+def two_opt(matrix: DistanceMatrix, tour: Tour) -> bool:
+    rows: List[array] = matrix.rows
+    n: int = len(tour)
+    changed: bool = False
+    improved: bool = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            a: int = tour[i]
+            b: int = tour[i + 1]
+            row_a: array = rows[a]
+            row_b: array = rows[b]
+            a_b: float = row_a[b]
+            # j = n - 1 with i = 0 would pick the same two edges
+            for j in range(i + 2, n if i > 0 else n - 1):
+                c: int = tour[j]
+                d: int = tour[(j + 1) % n]
+                if row_a[c] + row_b[d] < a_b + rows[c][d] - _EPSILON:
+                    tour[i + 1 : j + 1] = tour[i + 1 : j + 1][::-1]
+                    b = tour[i + 1]
+                    row_b = rows[b]
+                    a_b = row_a[b]
+                    improved = changed = True
+    return changed
+
+
+# Or-opt: move a stretch of 1 to 3 consecutive cities, either way round, to
+# the place between two other cities where it makes the tour shortest, while
+# that makes the tour shorter. Returns whether anything changed; tour is
+# changed in place
+def or_opt(matrix: DistanceMatrix, tour: Tour) -> bool:
+    rows: List[array] = matrix.rows
+    n: int = len(tour)
+    changed: bool = False
+    improved: bool = True
+    while improved:
+        improved = False
+        for length in (1, 2, 3):
+            if length > n - 3:
+                break
+            for i in range(n - length + 1):
+                first: int = tour[i]
+                last: int = tour[i + length - 1]
+                before: int = tour[i - 1]
+                after: int = tour[(i + length) % n]
+                saved: float = (
+                    rows[before][first] + rows[last][after] - rows[before][after]
+                )
+                rest: Tour = tour[:i] + tour[i + length :]
+                best: Optional[Tuple[int, bool]] = None
+                best_cost: float = saved - _EPSILON
+                for j in range(len(rest)):
+                    p: int = rest[j]
+                    q: int = rest[(j + 1) % len(rest)]
+                    p_q: float = rows[p][q]
+                    forward: float = rows[p][first] + rows[last][q] - p_q
+                    backward: float = rows[p][last] + rows[first][q] - p_q
+                    if forward < best_cost:
+                        best, best_cost = (j, False), forward
+                    if backward < best_cost:
+                        best, best_cost = (j, True), backward
+                if best is not None:
+                    j, reverse = best
+                    segment: Tour = tour[i : i + length]
+                    if reverse:
+                        segment.reverse()
+                    tour[:] = rest[: j + 1] + segment + rest[j + 1 :]
+                    improved = changed = True
+    return changed
+
+
+# Nearest neighbour, then 2-opt and Or-opt in turn until neither finds
+# anything: a local optimum, usually within a few percent of the shortest
+# tour, for hundreds of cities
+def local_search(matrix: DistanceMatrix, tour: Optional[Tour] = None) -> Tour:
+    tour = nearest_neighbour(matrix) if tour is None else list(tour)
+    if len(tour) < 4:
+        return tour
+    two_opt(matrix, tour)
+    while or_opt(matrix, tour) and two_opt(matrix, tour):
+        pass
+    return tour
+
+
+# The shortest tour if Held-Karp can find it in reasonable time, otherwise
+# a good one
+def shortest_tour(matrix: DistanceMatrix) -> Tour:
+    if len(matrix) <= HELD_KARP_LIMIT:
+        return held_karp(matrix)
+    return local_search(matrix)
+
+
+if __name__ == "__main__":
+    vt_distances: Dict[str, Dict[str, float]] = {
+        "Rutland": {
+            "Burlington": 67,
+            "White River Junction": 46,
+            "Bennington": 55,
+            "Brattleboro": 75,
+        },
+        "Burlington": {
+            "Rutland": 67,
+            "White River Junction": 91,
+            "Bennington": 122,
+            "Brattleboro": 153,
+        },
+        "White River Junction": {
+            "Rutland": 46,
+            "Burlington": 91,
+            "Bennington": 98,
+            "Brattleboro": 65,
+        },
+        "Bennington": {
+            "Rutland": 55,
+            "Burlington": 122,
+            "White River Junction": 98,
+            "Brattleboro": 40,
+        },
+        "Brattleboro": {
+            "Rutland": 75,
+            "Burlington": 153,
+            "White River Junction": 65,
+            "Bennington": 40,
+        },
+    }
+    vt_matrix: DistanceMatrix = DistanceMatrix.from_dict(vt_distances)
+    best_tour: Tour = held_karp(vt_matrix)
+    print(
+        f"The shortest path is {vt_matrix.path(best_tour)} "
+        f"in {vt_matrix.tour_length(best_tour):.0f} miles."
+    )
@@ -0,0 +1,62 @@
+import unittest
+from random import Random
+from typing import List, Tuple
+
+# import our scripts
+from tsp import DistanceMatrix, Tour, brute_force, held_karp, local_search, shortest_tour
+
+
+def random_points(generator: Random, n: int) -> List[Tuple[float, float]]:
+    return [(generator.uniform(0, 100), generator.uniform(0, 100)) for _ in range(n)]
+
+
+class TSPTestCase(unittest.TestCase):
+    def assertIsTour(self, tour: Tour, n: int):
+        self.assertEqual(sorted(tour), list(range(n)))
+
+    def test_held_karp_matches_brute_force(self):
+        generator: Random = Random(0)
+        for n in range(1, 10):
+            for _ in range(5):
+                matrix: DistanceMatrix = DistanceMatrix.from_points(random_points(generator, n))
+                exact: Tour = held_karp(matrix)
+                self.assertIsTour(exact, n)
+                self.assertAlmostEqual(
+                    matrix.tour_length(exact), matrix.tour_length(brute_force(matrix))
+                )
+
+    def test_ties(self):
+        # points on a 3 by 3 grid: many tours of the same length
+        generator: Random = Random(1)
+        for _ in range(20):
+            points: List[Tuple[float, float]] = [
+                (generator.randrange(3), generator.randrange(3)) for _ in range(8)
+            ]
+            matrix: DistanceMatrix = DistanceMatrix.from_points(points)
+            self.assertAlmostEqual(
+                matrix.tour_length(held_karp(matrix)),
+                matrix.tour_length(brute_force(matrix)),
+            )
+
+    def test_local_search_is_a_tour(self):
+        generator: Random = Random(2)
+        matrix: DistanceMatrix = DistanceMatrix.from_points(random_points(generator, 60))
+        tour: Tour = local_search(matrix)
+        self.assertIsTour(tour, 60)
+        self.assertLess(matrix.tour_length(tour), matrix.tour_length(list(range(60))))
+
+    def test_vermont(self):
+        vt_matrix: DistanceMatrix = DistanceMatrix.from_dict(
+            {
+                "Rutland": {"Burlington": 67, "White River Junction": 46, "Bennington": 55, "Brattleboro": 75},
+                "Burlington": {"Rutland": 67, "White River Junction": 91, "Bennington": 122, "Brattleboro": 153},
+                "White River Junction": {"Rutland": 46, "Burlington": 91, "Bennington": 98, "Brattleboro": 65},
+                "Bennington": {"Rutland": 55, "Burlington": 122, "White River Junction": 98, "Brattleboro": 40},
+                "Brattleboro": {"Rutland": 75, "Burlington": 153, "White River Junction": 65, "Bennington": 40},
+            }
+        )
+        self.assertEqual(vt_matrix.tour_length(shortest_tour(vt_matrix)), 318)
+
+
+if __name__ == "__main__":
+    unittest.main()